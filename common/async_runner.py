@@ -0,0 +1,99 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Async Query Runner
+
+Runs independent read-only queries concurrently with asyncio, so a viewer that
+issues several queries waits roughly one round-trip instead of one per query.
+Results come back in the order the queries were given, so callers can still
+print their sections in the original order.
+
+aiomysql is used when it is installed. Otherwise each query runs in a worker
+thread on its own connection from the shared pool in common/db.py. Either
+way, a failed query raises one of QUERY_ERRORS.
+
+Usage:
+    from common.async_runner import run_queries_concurrently
+
+    studios, genres = run_queries_concurrently([STUDIO_QUERY, GENRE_QUERY])
+"""
+
+import asyncio
+
+import mysql.connector
+
+from common.db import get_pool, load_config
+
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+# aiomysql raises PyMySQL's errors, the thread fallback mysql.connector's
+QUERY_ERRORS = (mysql.connector.Error,) + ((aiomysql.MySQLError,) if aiomysql is not None else ())
+
+def _normalize(queries):
+    """
+    Accepts plain SQL strings or (sql, params) pairs and returns (sql, params) pairs.
+    """
+    return [(query, None) if isinstance(query, str) else tuple(query) for query in queries]
+
+async def _fetch_with_aiomysql(queries):
+    secrets = load_config()
+    pool = await aiomysql.create_pool(host=secrets["HOST"], user=secrets["USER"],
+                                      password=secrets["PASSWORD"], db=secrets["DATABASE"],
+                                      minsize=1, maxsize=len(queries))
+
+    async def fetch(sql, params):
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                return list(await cursor.fetchall())
+
+    try:
+        return await asyncio.gather(*(fetch(sql, params) for sql, params in queries))
+    finally:
+        pool.close()
+        await pool.wait_closed()
+
+async def _fetch_with_threads(queries, options):
+    pool = get_pool(size=len(queries), **options)
+
+    def fetch(sql, params):
+        conn = pool.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        finally:
+            conn.close()
+
+    return await asyncio.gather(*(asyncio.to_thread(fetch, sql, params)
+                                  for sql, params in queries))
+
+async def fetch_all_async(queries, **options):
+    """
+    Runs the queries concurrently and returns their rows in query order.
+
+    Args:
+        queries (list): SQL strings or (sql, params) pairs.
+        **options: Connector options for the thread fallback (for example
+            raise_on_warnings=True).
+
+    Returns:
+        list: One list of rows per query.
+    """
+    queries = _normalize(queries)
+    if not queries:
+        return []
+    if aiomysql is not None:
+        return await _fetch_with_aiomysql(queries)
+    return await _fetch_with_threads(queries, options)
+
+def run_queries_concurrently(queries, **options):
+    """
+    Synchronous wrapper around fetch_all_async() for scripts without an event loop.
+    """
+    return asyncio.run(fetch_all_async(queries, **options))
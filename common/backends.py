@@ -0,0 +1,244 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Database Backends
+
+Lets the report creator, the Bacchus data viewer and the movie queries run
+against a local SQLite or DuckDB file instead of the MySQL server. Backends are
+named by a short spec:
+
+    mysql                  the server in .env, through the pool in common/db.py
+    sqlite:bacchus.db      a SQLite file (sqlite::memory: for an in-memory database)
+    duckdb:bacchus.duckdb  a DuckDB file, a columnar copy for heavy analytics
+
+Embedded connections accept the same MySQL-style queries the scripts already
+use:
+- %s and %(name)s parameters are rewritten to each engine's own style.
+- CURDATE() and MySQL's two-argument DATEDIFF(later, earlier) are defined on
+  both engines, and DATE '...' literals become plain strings on SQLite.
+- Dates and decimals are bound as values SQLite can store and compare.
+
+Use common/snapshot.py to copy a MySQL database into one of these files.
+The benchmark uses the same connections as its in-memory stand-in.
+DuckDB is optional and only needed for duckdb: specs.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+import re
+import sqlite3
+
+from common import instrument
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+PARAM_PATTERN = re.compile(r"%\((\w+)\)s|%s|%%")
+# SQLite has no DATE '...' literal; dates are compared as ISO strings there
+DATE_LITERAL = re.compile(r"\bDATE\s+('[0-9-]+')")
+# DuckDB's own datediff() takes a date part first, so MySQL's is renamed
+DATEDIFF_CALL = re.compile(r"\bDATEDIFF\s*\(", re.IGNORECASE)
+
+# Errors raised by the embedded engines, for scripts that already catch
+# mysql.connector.Error
+EMBEDDED_ERRORS = (sqlite3.Error,) + ((duckdb.Error,) if duckdb is not None else ())
+
+def parse_backend(spec):
+    """
+    Splits a backend spec into (kind, path). "mysql" and None have no path.
+
+    Raises:
+        ValueError: If the kind is unknown or an embedded backend has no path.
+    """
+    if not spec or spec == "mysql":
+        return "mysql", None
+    kind, _, path = spec.partition(":")
+    if kind not in ("sqlite", "duckdb") or not path:
+        raise ValueError(f"Unknown backend {spec!r}; use mysql, sqlite:PATH or duckdb:PATH")
+    return kind, path
+
+def adapt_query(sql, kind):
+    """
+    Rewrites MySQL pyformat parameters for an embedded engine: %(name)s becomes
+    :name (SQLite) or $name (DuckDB), %s becomes ? and %% becomes %. DATE
+    literals (SQLite) and DATEDIFF calls (DuckDB) are rewritten as well.
+    """
+    def replace(match):
+        if match.group(1):
+            return f":{match.group(1)}" if kind == "sqlite" else f"${match.group(1)}"
+        return "?" if match.group(0) == "%s" else "%"
+    if kind == "sqlite":
+        sql = DATE_LITERAL.sub(r"\1", sql)
+    else:
+        sql = DATEDIFF_CALL.sub("mysql_datediff(", sql)
+    return PARAM_PATTERN.sub(replace, sql)
+
+def sqlite_datediff(later, earlier):
+    """
+    MySQL's DATEDIFF() for SQLite: whole days from earlier to later, NULL when
+    either is NULL.
+    """
+    if later is None or earlier is None:
+        return None
+    return (date.fromisoformat(str(later)[:10]) - date.fromisoformat(str(earlier)[:10])).days
+
+def sqlite_value(value):
+    """
+    Stores dates and timestamps as ISO strings, the form SQLite compares
+    correctly, and decimals as floats.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+class EmbeddedCursor:
+    """
+    A cursor on an embedded connection that takes MySQL-style queries.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        # A DuckDB cursor() is a separate connection that would not see the
+        # connection's temporary CURDATE() macro, so DuckDB runs on the
+        # connection itself
+        self._cursor = connection.raw if connection.kind == "duckdb" else connection.raw.cursor()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _params(self, params):
+        if params is None or self.connection.kind != "sqlite":
+            return params
+        if isinstance(params, dict):
+            return {key: sqlite_value(value) for key, value in params.items()}
+        return tuple(sqlite_value(value) for value in params)
+
+    def execute(self, sql, params=None):
+        sql = adapt_query(sql, self.connection.kind)
+        params = self._params(params)
+        if params is None:
+            self._cursor.execute(sql)
+        else:
+            self._cursor.execute(sql, params)
+        return self
+
+    def executemany(self, sql, seq_params):
+        self._cursor.executemany(adapt_query(sql, self.connection.kind),
+                                 [self._params(params) for params in seq_params])
+        return self
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size) if size else self._cursor.fetchmany()
+
+    @property
+    def cache_namespace(self):
+        # Keeps QueryCache entries from different backends apart
+        return self.connection.spec
+
+    def close(self):
+        if self._cursor is not self.connection.raw:
+            self._cursor.close()
+
+class EmbeddedConnection:
+    """
+    A SQLite or DuckDB connection with the connection methods the scripts use.
+    """
+
+    def __init__(self, spec, kind, raw):
+        self.spec = spec
+        self.kind = kind
+        self.raw = raw
+        self._open = True
+
+    def cursor(self, buffered=None, dictionary=False, prepared=False):
+        if dictionary or prepared:
+            raise ValueError(f"{self.kind} connections do not support dictionary or "
+                             f"prepared cursors")
+        return instrument.wrap_cursor(EmbeddedCursor(self))
+
+    def executescript(self, sql):
+        if self.kind == "sqlite":
+            self.raw.executescript(sql)
+        else:
+            self.raw.execute(sql)
+
+    # DuckDB cursors commit each statement on their own
+    def commit(self):
+        if self.kind == "sqlite":
+            self.raw.commit()
+
+    def rollback(self):
+        if self.kind == "sqlite":
+            self.raw.rollback()
+
+    def is_connected(self):
+        return self._open
+
+    def close(self):
+        if self._open:
+            self.raw.close()
+            self._open = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def missing_tables(conn, tables):
+    """
+    Returns the names in tables that are neither a table nor a view on the
+    connection, which may be MySQL or embedded.
+    """
+    kind = getattr(conn, "kind", "mysql")
+    if kind == "sqlite":
+        query = "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"
+    elif kind == "duckdb":
+        query = "SELECT table_name FROM information_schema.tables"
+    else:
+        query = "SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()"
+    cursor = conn.cursor()
+    cursor.execute(query)
+    existing = {row[0].lower() for row in cursor.fetchall()}
+    cursor.close()
+    return [table for table in tables if table.lower() not in existing]
+
+def connect(spec=None, **options):
+    """
+    Opens a connection for a backend spec.
+
+    Args:
+        spec (str): "mysql" (the default), "sqlite:PATH" or "duckdb:PATH".
+        **options: Connector options for MySQL, such as raise_on_warnings=True.
+            Ignored by the embedded engines.
+
+    Returns:
+        A pooled MySQL connection or an EmbeddedConnection.
+    """
+    kind, path = parse_backend(spec)
+    if kind == "mysql":
+        from common.db import get_connection
+
+        return get_connection(**options)
+    if kind == "sqlite":
+        raw = sqlite3.connect(path, check_same_thread=False)
+        raw.create_function("CURDATE", 0, lambda: date.today().isoformat())
+        raw.create_function("NOW", 0, lambda: datetime.now().isoformat(" ", "seconds"))
+        raw.create_function("DATEDIFF", 2, sqlite_datediff)
+        return EmbeddedConnection(spec, kind, raw)
+    if duckdb is None:
+        raise RuntimeError("The duckdb package is needed for duckdb: backends")
+    raw = duckdb.connect(path)
+    raw.execute("CREATE OR REPLACE TEMP MACRO CURDATE() AS current_date")
+    raw.execute("CREATE OR REPLACE TEMP MACRO mysql_datediff(later, earlier) AS "
+                "date_diff('day', CAST(earlier AS DATE), CAST(later AS DATE))")
+    return EmbeddedConnection(spec, kind, raw)
@@ -0,0 +1,233 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Query Result Cache
+
+Caches the rows of read-only queries so scripts that re-run the same SELECT
+(the movie listings, the Bacchus joined views) skip the round-trip when nothing
+has changed.
+
+- Entries are keyed by the whitespace-normalized SQL plus its parameters.
+- Each entry expires after a TTL, and the least recently used entries are evicted
+  past max_entries.
+- Each entry remembers the tables its query reads. Writes sent through
+  QueryCache.execute() drop every entry that depends on a table they touch, so
+  only the data a write changed is fetched again.
+- With a path, entries are stored in a small SQLite file and survive between runs.
+  Writes made by other programs are not seen, so the TTL bounds how stale an
+  entry can get.
+
+Optional .env keys for get_default_cache(): QUERY_CACHE_TTL (seconds, default 60),
+QUERY_CACHE_SIZE (default 256) and QUERY_CACHE_PATH.
+
+Usage:
+    cache = get_default_cache()
+    rows = cache.fetchall(cursor, STUDIO_QUERY)
+    cache.execute(cursor, "DELETE FROM film WHERE film_name = %s", ("Gladiator",))
+"""
+
+from collections import OrderedDict
+import pickle
+import re
+import sqlite3
+import threading
+import time
+
+from common.db import load_config
+
+DEFAULT_TTL = 60.0
+DEFAULT_MAX_ENTRIES = 256
+
+TABLE_PATTERN = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+`?(\w+)`?", re.IGNORECASE)
+WRITE_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "REPLACE", "ALTER", "DROP", "TRUNCATE",
+                  "CREATE", "RENAME", "LOAD"}
+
+def normalize_sql(sql):
+    """
+    Collapses whitespace and drops a trailing semicolon so formatting
+    differences do not create separate cache entries.
+    """
+    return " ".join(sql.split()).rstrip(";").strip()
+
+def tables_in(sql):
+    """
+    Returns the lower-cased names of the tables a statement reads or writes.
+    """
+    return {name.lower() for name in TABLE_PATTERN.findall(sql)}
+
+def is_write(sql):
+    words = normalize_sql(sql).split(" ", 1)
+    return bool(words[0]) and words[0].upper() in WRITE_KEYWORDS
+
+class MemoryStore:
+    """
+    In-process LRU storage for cache entries.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, tables, expires, rows):
+        self.entries[key] = (tables, expires, rows)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def delete(self, key):
+        self.entries.pop(key, None)
+
+    def invalidate(self, tables):
+        stale = [key for key, (deps, _, _) in self.entries.items() if deps & tables]
+        for key in stale:
+            del self.entries[key]
+        return len(stale)
+
+    def clear(self):
+        self.entries.clear()
+
+class DiskStore:
+    """
+    SQLite-file storage for cache entries, evicted by least recent access.
+    """
+
+    def __init__(self, path, max_entries):
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache_entry (
+                key TEXT PRIMARY KEY, tables TEXT, expires REAL, accessed REAL, rows BLOB);
+            CREATE TABLE IF NOT EXISTS cache_dependency (
+                key TEXT, table_name TEXT, PRIMARY KEY (key, table_name));
+        """)
+
+    def get(self, key):
+        row = self.conn.execute("SELECT tables, expires, rows FROM cache_entry WHERE key = ?",
+                                (key,)).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE cache_entry SET accessed = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return set(row[0].split(",")) - {""}, row[1], pickle.loads(row[2])
+
+    def put(self, key, tables, expires, rows):
+        with self.conn:
+            self.conn.execute("REPLACE INTO cache_entry VALUES (?, ?, ?, ?, ?)",
+                              (key, ",".join(sorted(tables)), expires, time.time(),
+                               pickle.dumps(rows)))
+            self.conn.execute("DELETE FROM cache_dependency WHERE key = ?", (key,))
+            self.conn.executemany("INSERT INTO cache_dependency VALUES (?, ?)",
+                                  [(key, table) for table in tables])
+            self.conn.execute("""
+                DELETE FROM cache_entry WHERE key IN (
+                    SELECT key FROM cache_entry ORDER BY accessed DESC LIMIT -1 OFFSET ?)
+            """, (self.max_entries,))
+            self.conn.execute("""
+                DELETE FROM cache_dependency WHERE key NOT IN (SELECT key FROM cache_entry)
+            """)
+
+    def delete(self, key):
+        with self.conn:
+            self.conn.execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+            self.conn.execute("DELETE FROM cache_dependency WHERE key = ?", (key,))
+
+    def invalidate(self, tables):
+        placeholders = ", ".join("?" * len(tables))
+        with self.conn:
+            keys = [row[0] for row in self.conn.execute(
+                f"SELECT DISTINCT key FROM cache_dependency WHERE table_name IN ({placeholders})",
+                list(tables))]
+            for key in keys:
+                self.conn.execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+                self.conn.execute("DELETE FROM cache_dependency WHERE key = ?", (key,))
+        return len(keys)
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM cache_entry")
+            self.conn.execute("DELETE FROM cache_dependency")
+
+class QueryCache:
+    """
+    A TTL + LRU cache of query results with table-based invalidation.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        self.ttl = ttl
+        self.store = DiskStore(path, max_entries) if path else MemoryStore(max_entries)
+        self.stats = {"hits": 0, "misses": 0, "invalidated": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(sql, params=None, namespace=None):
+        key = f"{normalize_sql(sql)}|{params!r}"
+        return f"{namespace}|{key}" if namespace else key
+
+    def fetchall(self, cursor, sql, params=None):
+        """
+        Returns the rows for a read-only query, from the cache when a fresh entry
+        exists, otherwise by executing it on cursor.
+        """
+        # Embedded backends (common/backends.py) keep their entries apart from MySQL's
+        key = self.make_key(sql, params, getattr(cursor, "cache_namespace", None))
+        with self._lock:
+            entry = self.store.get(key)
+            if entry is not None and entry[1] > time.time():
+                self.stats["hits"] += 1
+                return list(entry[2])
+            if entry is not None:
+                self.store.delete(key)
+            self.stats["misses"] += 1
+
+        cursor.execute(sql, params) if params is not None else cursor.execute(sql)
+        rows = cursor.fetchall()
+        with self._lock:
+            self.store.put(key, tables_in(sql), time.time() + self.ttl, rows)
+        return list(rows)
+
+    def execute(self, cursor, sql, params=None):
+        """
+        Executes a statement and, if it writes, drops cached results that depend
+        on any table it touches.
+        """
+        cursor.execute(sql, params) if params is not None else cursor.execute(sql)
+        if is_write(sql):
+            self.invalidate(*tables_in(sql))
+        return cursor
+
+    def invalidate(self, *tables):
+        """
+        Drops every cached result that reads from one of the given tables.
+        """
+        tables = {table.lower() for table in tables}
+        if not tables:
+            return 0
+        with self._lock:
+            dropped = self.store.invalidate(tables)
+            self.stats["invalidated"] += dropped
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self.store.clear()
+
+_default_cache = None
+
+def get_default_cache():
+    """
+    Returns the process-wide cache configured from the optional .env keys.
+    """
+    global _default_cache
+    if _default_cache is None:
+        secrets = load_config()
+        _default_cache = QueryCache(ttl=float(secrets.get("QUERY_CACHE_TTL") or DEFAULT_TTL),
+                                    max_entries=int(secrets.get("QUERY_CACHE_SIZE")
+                                                    or DEFAULT_MAX_ENTRIES),
+                                    path=secrets.get("QUERY_CACHE_PATH") or None)
+    return _default_cache
@@ -0,0 +1,325 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Database Access
+
+One place to read database credentials and hand out connections, replacing the
+reconnect_to_db() and db_config copies in the Module 6, 7, 8, 10 and 11 scripts.
+
+- The .env file is parsed once per process. It is looked for in the current
+  directory first (where the movie scripts expect it), then in the repository root.
+- Connections come from a bounded pool. close() returns a connection to the pool
+  instead of closing it, so repeated queries in one run skip the TCP and auth
+  handshake. Idle connections are pinged before reuse and reconnected (or
+  replaced) if dead, and new connections are retried with a short backoff.
+- PooledConnection.prepared(sql) returns a server-side prepared cursor cached per
+  connection, so repeated statements are parsed once. The cache is cleared when
+  the connection reconnects, since the server drops its statements then.
+- pool_stats() reports connections opened, reuses and time spent waiting for a
+  free connection. Set POOL_STATS=1 in .env to print them when the script exits.
+- With profiling on (see common/instrument.py), cursors record per-statement
+  timings and the pool records connection-acquire time. The records are flushed
+  when the script exits.
+
+Optional .env keys: POOL_SIZE (default 5), POOL_STATS, and the PROFILE keys
+described in common/instrument.py.
+
+Usage:
+    from common.db import get_connection
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    ...
+    conn.close()   # back to the pool
+"""
+
+from pathlib import Path
+import atexit
+import threading
+import time
+
+import mysql.connector
+from dotenv import dotenv_values
+
+from common import instrument
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+REQUIRED_KEYS = ["USER", "PASSWORD", "HOST", "DATABASE"]
+DEFAULT_POOL_SIZE = 5
+CONNECT_ATTEMPTS = 3
+CONNECT_RETRY_DELAY = 0.5
+# Idle connections older than this are pinged before being handed out again
+HEALTH_CHECK_AFTER = 30.0
+
+_config = None
+_pools = {}
+_lock = threading.Lock()
+
+def load_config():
+    """
+    Loads and validates the database credentials from .env, once per process.
+
+    Returns:
+        dict: The parsed .env values.
+
+    Raises:
+        FileNotFoundError: If no .env file is found.
+        KeyError: If a required key is missing.
+    """
+    global _config
+    if _config is None:
+        for env_path in (Path.cwd() / ".env", BASE_DIR / ".env"):
+            if env_path.exists():
+                break
+        else:
+            raise FileNotFoundError("No .env file found.")
+        secrets = dotenv_values(env_path)
+        missing = [key for key in REQUIRED_KEYS if key not in secrets]
+        if missing:
+            raise KeyError(f"Missing {', '.join(missing)} in {env_path}")
+        _config = secrets
+        if secrets.get("PROFILE") == "1" and not instrument.is_enabled():
+            instrument.enable(log_path=secrets.get("PROFILE_LOG") or instrument.DEFAULT_LOG,
+                              prom_path=secrets.get("PROFILE_PROM"),
+                              explain_top=int(secrets.get("PROFILE_EXPLAIN") or 0))
+    return _config
+
+def connection_settings(**options):
+    """
+    Returns keyword arguments for mysql.connector.connect() built from .env plus
+    any extra connector options (for example raise_on_warnings=True).
+    """
+    secrets = load_config()
+    return {"user": secrets["USER"],
+            "password": secrets["PASSWORD"],
+            "host": secrets["HOST"],
+            "database": secrets["DATABASE"],
+            **options}
+
+class PooledConnection:
+    """
+    Wraps a mysql.connector connection handed out by a ConnectionPool. Every
+    connection method is available; close() returns it to the pool.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self.raw = raw
+        self.last_used = time.monotonic()
+        self._prepared = {}
+        # Set by close() so a second close() does not release the connection twice
+        self.released = False
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def cursor(self, *args, **kwargs):
+        return instrument.wrap_cursor(self.raw.cursor(*args, **kwargs))
+
+    def prepared(self, sql):
+        """
+        Returns a prepared cursor for sql, reusing it on later calls so the
+        statement is only prepared once per connection.
+        """
+        cursor = self._prepared.get(sql)
+        if cursor is None:
+            cursor = self.raw.cursor(prepared=True)
+            self._prepared[sql] = cursor
+        return instrument.wrap_cursor(cursor)
+
+    def close(self):
+        if not self.released:
+            self.released = True
+            self._pool.release(self)
+
+    def discard(self):
+        """
+        Closes the underlying connection for good.
+        """
+        self._prepared.clear()
+        try:
+            self.raw.close()
+        except mysql.connector.Error:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of database connections. get_connection() blocks
+    while every connection is in use.
+    """
+
+    def __init__(self, settings, size=DEFAULT_POOL_SIZE):
+        self.settings = settings
+        self.size = size
+        self._idle = []
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self.stats = {"acquired": 0, "reused": 0, "opened": 0, "reconnected": 0,
+                      "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    def resize(self, size):
+        """
+        Raises the pool limit (it never shrinks below connections already open).
+        """
+        with self._condition:
+            self.size = max(self.size, size)
+            self._condition.notify_all()
+
+    def _count(self, name):
+        with self._condition:
+            self.stats[name] += 1
+
+    def _open(self):
+        for attempt in range(1, CONNECT_ATTEMPTS + 1):
+            try:
+                raw = mysql.connector.connect(**self.settings)
+                self._count("opened")
+                return PooledConnection(self, raw)
+            except mysql.connector.Error:
+                if attempt == CONNECT_ATTEMPTS:
+                    raise
+                time.sleep(CONNECT_RETRY_DELAY * attempt)
+
+    def _healthy(self, conn):
+        """
+        Pings a connection that has been idle for a while. A dead one is
+        reconnected; its prepared statements died with the old session, so the
+        cached cursors are dropped.
+        """
+        if time.monotonic() - conn.last_used < HEALTH_CHECK_AFTER:
+            return True
+        try:
+            conn.raw.ping()
+            return True
+        except mysql.connector.Error:
+            pass
+        conn._prepared.clear()
+        try:
+            conn.raw.reconnect(attempts=CONNECT_ATTEMPTS, delay=CONNECT_RETRY_DELAY)
+        except mysql.connector.Error:
+            return False
+        self._count("reconnected")
+        return True
+
+    def get_connection(self):
+        with instrument.timed("acquire"):
+            return self._acquire()
+
+    def _acquire(self):
+        started = time.perf_counter()
+        with self._condition:
+            while not self._idle and self._in_use >= self.size:
+                self._condition.wait()
+            waited = time.perf_counter() - started
+            self.stats["acquired"] += 1
+            self.stats["wait_seconds"] += waited
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+            conn = self._idle.pop() if self._idle else None
+            self._in_use += 1
+
+        try:
+            if conn is not None and self._healthy(conn):
+                self._count("reused")
+                conn.released = False
+                return conn
+            if conn is not None:
+                conn.discard()
+            return self._open()
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, conn):
+        """
+        Returns a connection to the pool, rolling back anything left uncommitted.
+        """
+        try:
+            if conn.raw.in_transaction:
+                conn.raw.rollback()
+            keep = True
+        except mysql.connector.Error:
+            conn.discard()
+            keep = False
+        with self._condition:
+            self._in_use -= 1
+            if keep:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+            self._condition.notify()
+
+    def close_all(self):
+        with self._condition:
+            for conn in self._idle:
+                conn.discard()
+            self._idle.clear()
+
+def get_pool(size=None, **options):
+    """
+    Returns the process-wide pool for the given connector options, creating it on
+    first use. Passing a larger size grows an existing pool.
+    """
+    key = tuple(sorted(options.items()))
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            default_size = int(load_config().get("POOL_SIZE") or DEFAULT_POOL_SIZE)
+            pool = ConnectionPool(connection_settings(**options), max(size or 0, default_size))
+            _pools[key] = pool
+        elif size:
+            pool.resize(size)
+    return pool
+
+def get_connection(**options):
+    """
+    Returns a pooled connection. Extra keyword arguments are connector options such
+    as raise_on_warnings or allow_local_infile; each combination has its own pool.
+    """
+    return get_pool(**options).get_connection()
+
+def reconnect_to_db():
+    """
+    Returns a pooled connection with raise_on_warnings enabled, the settings the
+    Bacchus scripts have always used.
+    """
+    return get_connection(raise_on_warnings=True)
+
+def pool_stats():
+    """
+    Returns the combined statistics of every pool in this process.
+    """
+    totals = {"acquired": 0, "reused": 0, "opened": 0, "reconnected": 0,
+              "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+    for pool in list(_pools.values()):
+        for name, value in pool.stats.items():
+            totals[name] = max(totals[name], value) if name == "max_wait_seconds" else totals[name] + value
+    return totals
+
+def _shutdown():
+    if instrument.is_enabled():
+        if instrument.settings["explain_top"] and _pools:
+            try:
+                conn = get_connection()
+                try:
+                    instrument.explain_slowest(conn, instrument.settings["explain_top"])
+                finally:
+                    conn.close()
+            except mysql.connector.Error as err:
+                print(f"Profile: EXPLAIN skipped: {err}")
+        instrument.flush()
+    if _config is not None and _config.get("POOL_STATS") == "1" and _pools:
+        stats = pool_stats()
+        print(f"Connection pool: {stats['acquired']} acquired, {stats['reused']} reused, "
+              f"{stats['opened']} opened, {stats['wait_seconds'] * 1000:.1f} ms waiting "
+              f"(max {stats['max_wait_seconds'] * 1000:.1f} ms)")
+    for pool in list(_pools.values()):
+        pool.close_all()
+
+atexit.register(_shutdown)
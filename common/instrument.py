@@ -0,0 +1,276 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Query Instrumentation
+
+Records where a database script spends its time: waiting for a connection,
+executing statements, fetching rows and writing report files.
+
+- When profiling is enabled, every cursor handed out by common/db.py is wrapped.
+  Each statement records its execute time, fetch time, rows returned and an
+  estimate of the bytes fetched. Connection-acquire time is recorded by the pool.
+- report_engine.py records the time spent writing each report file.
+- flush() appends the records to a JSON Lines log and, optionally, writes a
+  Prometheus text file for the node exporter's textfile collector.
+- explain_slowest() reruns the N slowest SELECT statements with EXPLAIN ANALYZE
+  and reads their digest statistics from performance_schema. It executes each
+  query again, so it is opt-in.
+
+Profiling is off by default. Turn it on with enable(), or for every script with
+these .env keys: PROFILE=1, PROFILE_LOG (default profile.jsonl),
+PROFILE_PROM and PROFILE_EXPLAIN (number of statements to explain).
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+DEFAULT_LOG = "profile.jsonl"
+# Longest SQL text kept in a record
+SQL_PREVIEW = 500
+
+settings = {"enabled": False, "log_path": None, "prom_path": None, "explain_top": 0}
+_records = []
+_lock = threading.Lock()
+
+def enable(log_path=DEFAULT_LOG, prom_path=None, explain_top=0):
+    """
+    Turns profiling on for the rest of the process.
+
+    Args:
+        log_path (str): JSON Lines file that flush() appends records to.
+        prom_path (str): Optional Prometheus text file that flush() replaces.
+        explain_top (int): How many of the slowest statements to explain at exit.
+    """
+    settings.update(enabled=True, log_path=log_path, prom_path=prom_path,
+                    explain_top=explain_top)
+
+def is_enabled():
+    return settings["enabled"]
+
+def record(kind, **fields):
+    """
+    Adds one measurement and returns it, so callers can fill in fields later.
+    """
+    entry = {"kind": kind, "time": time.time(), **fields}
+    with _lock:
+        _records.append(entry)
+    return entry
+
+def records():
+    with _lock:
+        return list(_records)
+
+@contextmanager
+def timed(kind, **fields):
+    """
+    Records the wall time of the with block. The yielded record can be updated
+    inside the block, for example with a row count.
+    """
+    if not settings["enabled"]:
+        yield {}
+        return
+    started = time.perf_counter()
+    entry = record(kind, **fields)
+    try:
+        yield entry
+    finally:
+        entry["seconds"] = time.perf_counter() - started
+
+def row_bytes(row):
+    """
+    Estimates the size of a fetched row: the length of text and binary values,
+    eight bytes for anything else.
+    """
+    values = row.values() if isinstance(row, dict) else row
+    return sum(len(value) if isinstance(value, (str, bytes, bytearray)) else 8
+               for value in values)
+
+class InstrumentedCursor:
+    """
+    Wraps a database cursor and records each statement it runs. Every other
+    cursor attribute is passed through.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._current = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _run(self, method, sql, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(sql, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            statement = getattr(self._cursor, "statement", None)
+            if isinstance(statement, (bytes, bytearray)):
+                statement = statement.decode("utf-8", "replace")
+            self._current = record("query", sql=" ".join(str(sql).split())[:SQL_PREVIEW],
+                                   statement=statement,
+                                   execute_seconds=elapsed, fetch_seconds=0.0,
+                                   rows=0, bytes=0)
+
+    def execute(self, sql, *args, **kwargs):
+        return self._run(self._cursor.execute, sql, *args, **kwargs)
+
+    def executemany(self, sql, *args, **kwargs):
+        return self._run(self._cursor.executemany, sql, *args, **kwargs)
+
+    def _fetched(self, started, rows):
+        if self._current is not None:
+            self._current["fetch_seconds"] += time.perf_counter() - started
+            self._current["rows"] += len(rows)
+            self._current["bytes"] += sum(row_bytes(row) for row in rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        return self._fetched(started, self._cursor.fetchall())
+
+    def fetchmany(self, *args, **kwargs):
+        started = time.perf_counter()
+        return self._fetched(started, self._cursor.fetchmany(*args, **kwargs))
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(started, [row] if row is not None else [])
+        return row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+def wrap_cursor(cursor):
+    """
+    Returns the cursor wrapped for profiling, or unchanged when profiling is off.
+    """
+    return InstrumentedCursor(cursor) if settings["enabled"] else cursor
+
+def query_seconds(entry):
+    return entry.get("execute_seconds", 0.0) + entry.get("fetch_seconds", 0.0)
+
+def slowest(top):
+    """
+    Returns the `top` query records with the longest execute plus fetch time.
+    """
+    queries = [entry for entry in records() if entry["kind"] == "query"]
+    return sorted(queries, key=query_seconds, reverse=True)[:top]
+
+def explain_slowest(conn, top):
+    """
+    Runs EXPLAIN ANALYZE on the slowest distinct SELECT statements recorded so far
+    and looks up their server-side digest statistics. The results are recorded
+    and printed.
+
+    Args:
+        conn: An open MySQL connection (MySQL 8.0.18 or later for EXPLAIN ANALYZE).
+        top (int): How many statements to explain.
+    """
+    import mysql.connector
+
+    seen = set()
+    candidates = []
+    for entry in slowest(len(_records)):
+        statement = entry.get("statement") or entry["sql"]
+        if statement.lstrip().upper().startswith("SELECT") and statement not in seen:
+            seen.add(statement)
+            candidates.append((entry, statement))
+        if len(candidates) == top:
+            break
+
+    # A plain cursor, so explaining does not add records of its own
+    cursor = getattr(conn, "raw", conn).cursor()
+    for entry, statement in candidates:
+        result = {"sql": entry["sql"], "seconds": query_seconds(entry)}
+        try:
+            cursor.execute("EXPLAIN ANALYZE " + statement.strip().rstrip(";"))
+            result["plan"] = "\n".join(row[0] for row in cursor.fetchall())
+            cursor.execute("""
+                SELECT COUNT_STAR, SUM_TIMER_WAIT / 1e12, SUM_ROWS_EXAMINED, SUM_ROWS_SENT,
+                       SUM_NO_INDEX_USED
+                FROM performance_schema.events_statements_summary_by_digest
+                WHERE SCHEMA_NAME = DATABASE() AND DIGEST = STATEMENT_DIGEST(%s);
+            """, (statement,))
+            digest = cursor.fetchone()
+            if digest:
+                result["server"] = dict(zip(["executions", "total_seconds", "rows_examined",
+                                             "rows_sent", "no_index_used"],
+                                            [float(value or 0) for value in digest]))
+        except mysql.connector.Error as err:
+            result["error"] = str(err)
+        record("explain", **result)
+        print(f"-- {result['seconds'] * 1000:.1f} ms: {result['sql'][:120]}")
+        print(result.get("plan") or f"   explain failed: {result.get('error')}")
+        if "server" in result:
+            print(f"   server: {result['server']}")
+    cursor.close()
+
+def summary():
+    """
+    Returns totals per record kind: count, seconds, rows and bytes.
+    """
+    totals = {}
+    for entry in records():
+        kind = totals.setdefault(entry["kind"], {"count": 0, "seconds": 0.0, "rows": 0,
+                                                 "bytes": 0, "max_seconds": 0.0})
+        seconds = query_seconds(entry) if entry["kind"] == "query" else entry.get("seconds", 0.0)
+        kind["count"] += 1
+        kind["seconds"] += seconds
+        kind["max_seconds"] = max(kind["max_seconds"], seconds)
+        kind["rows"] += entry.get("rows", 0)
+        kind["bytes"] += entry.get("bytes", 0)
+    return totals
+
+def write_prometheus(path):
+    """
+    Writes the summary as a Prometheus text file. The file is replaced
+    atomically so the node exporter never reads a partial file.
+    """
+    lines = []
+    for kind, totals in sorted(summary().items()):
+        for name, value in totals.items():
+            metric = f"bacchus_db_{name}" if name != "count" else "bacchus_db_events"
+            lines.append(f'{metric}_total{{kind="{kind}"}} {value}'
+                         if name != "max_seconds" else f'{metric}{{kind="{kind}"}} {value}')
+    for entry in records():
+        if entry["kind"] == "write" and "seconds" in entry:
+            lines.append(f'bacchus_report_write_seconds{{report="{entry["report"]}"}} '
+                         f'{entry["seconds"]}')
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text("\n".join(lines) + "\n")
+    os.replace(temp_path, path)
+
+def flush():
+    """
+    Appends the records to the JSON Lines log, writes the Prometheus file if one
+    is configured and clears the records.
+    """
+    if not settings["enabled"]:
+        return
+    entries = records()
+    if settings["log_path"] and entries:
+        with open(settings["log_path"], "a") as log:
+            for entry in entries:
+                log.write(json.dumps(entry, default=str) + "\n")
+    if settings["prom_path"]:
+        write_prometheus(settings["prom_path"])
+    totals = summary().get("query")
+    if totals:
+        print(f"Profile: {totals['count']} queries, {totals['seconds'] * 1000:.1f} ms, "
+              f"{totals['rows']} rows, ~{totals['bytes']} bytes"
+              + (f" (log: {settings['log_path']})" if settings["log_path"] else ""))
+    with _lock:
+        _records.clear()
@@ -0,0 +1,218 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Keyset Pager
+
+Pages through a joined view one screen at a time instead of printing every row.
+
+Each page is a range read on the view's primary key:
+
+    WHERE key > <last key shown> ORDER BY key LIMIT <page size>
+
+so it is served from the key's index and costs the same anywhere in the table.
+OFFSET is never used. Previous pages read backwards from the first key shown.
+
+Jumping to a page number needs the key that page starts at. The pager keeps the
+start of every page it has shown, so going back to one is a single range read.
+Any other page needs every page start: one pass over the key column, numbered
+with ROW_NUMBER(). That pass reads every key matching the filters, so the first
+jump to an unseen page costs O(rows) rather than one page. The list is kept for
+the life of the pager (and in the query cache when one is given, which keeps it
+across runs for the TTL when the cache has a path), so after it every jump is a
+single range read.
+
+A view is a dict with:
+- title, key (the key column expression), select (the listed columns) and
+  from (the FROM clause with its joins).
+- filters: {name: column expression}. Only these columns can be filtered, so
+  user input never reaches the SQL text.
+
+Usage:
+    pager = KeysetPager(cursor, view, page_size=50, filters={"status": "Pending"})
+    for number, rows in pager.pages():
+        ...
+    rows = pager.page(5000)
+"""
+
+DEFAULT_PAGE_SIZE = 50
+
+def parse_filters(items):
+    """
+    Parses NAME=VALUE command line filters into a dict.
+
+    Raises:
+        ValueError: If an item has no "=".
+    """
+    filters = {}
+    for item in items or []:
+        name, sep, value = item.partition("=")
+        if not sep or not name:
+            raise ValueError(f"Filter {item!r} is not NAME=VALUE")
+        filters[name.strip()] = value
+    return filters
+
+class KeysetPager:
+    """
+    Reads one view a page at a time by keyset pagination on its key column.
+    """
+
+    def __init__(self, cursor, view, page_size=DEFAULT_PAGE_SIZE, filters=None, cache=None):
+        """
+        Args:
+            cursor: An open cursor on the database holding the view's tables.
+            view (dict): The view definition described in the module docstring.
+            page_size (int): Rows per page.
+            filters (dict): {filter name: value}. A value containing * matches
+                as a LIKE pattern, anything else must be equal.
+            cache: Optional QueryCache for the pages and the page-start keys.
+
+        Raises:
+            ValueError: If the page size is not positive or a filter is unknown.
+        """
+        if page_size < 1:
+            raise ValueError("The page size must be at least 1")
+        self.cursor = cursor
+        self.view = view
+        self.page_size = page_size
+        self.cache = cache
+        self.params = {"page_size": page_size}
+        self.conditions = []
+        columns = {name.lower(): column for name, column in view["filters"].items()}
+        for index, (name, value) in enumerate((filters or {}).items()):
+            column = columns.get(name.lower())
+            if column is None:
+                raise ValueError(f"Unknown filter {name!r}; choose from: "
+                                 f"{', '.join(view['filters'])}")
+            param = f"filter_{index}"
+            if "*" in value:
+                self.conditions.append(f"{column} LIKE %({param})s")
+                self.params[param] = value.replace("*", "%")
+            else:
+                self.conditions.append(f"{column} = %({param})s")
+                self.params[param] = value
+        self._starts = None
+        self._shown = {}
+
+    def _where(self, *extra):
+        conditions = self.conditions + list(extra)
+        return f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    def _fetch(self, sql, params):
+        if self.cache is not None:
+            return self.cache.fetchall(self.cursor, sql, params)
+        self.cursor.execute(sql, params)
+        return self.cursor.fetchall()
+
+    def _read(self, condition=None, key=None, descending=False):
+        """
+        Returns up to one page of (key, row) pairs in key order, starting after
+        (or, descending, before) the given condition.
+        """
+        view = self.view
+        params = dict(self.params, key=key) if condition else self.params
+        sql = (f"SELECT {view['key']} AS PageKey, {view['select']} FROM {view['from']}"
+               f"{self._where(*([condition] if condition else []))} "
+               f"ORDER BY {view['key']}{' DESC' if descending else ''} "
+               f"LIMIT %(page_size)s")
+        rows = self._fetch(sql, params)
+        if descending:
+            rows = rows[::-1]
+        return [(row[0], tuple(row[1:])) for row in rows]
+
+    def page_starts(self):
+        """
+        Returns the key each page starts at. Computed once per pager by a scan
+        of every matching key; only the key column is selected, so the scan
+        never reads the listed columns.
+        """
+        if self._starts is None:
+            view = self.view
+            sql = (f"SELECT PageStart FROM ("
+                   f"SELECT {view['key']} AS PageStart, "
+                   f"ROW_NUMBER() OVER (ORDER BY {view['key']}) AS RowNum "
+                   f"FROM {view['from']}{self._where()}) numbered "
+                   f"WHERE (RowNum - 1) %% %(page_size)s = 0 ORDER BY PageStart")
+            self._starts = [row[0] for row in self._fetch(sql, self.params)]
+        return self._starts
+
+    def page_count(self):
+        return len(self.page_starts())
+
+    def _remember(self, number, batch):
+        if batch:
+            self._shown[number] = batch[0][0]
+        return batch
+
+    def _starting_at(self, number):
+        if number == 1:
+            return self._remember(1, self._read())
+        if number in self._shown:
+            return self._read(f"{self.view['key']} >= %(key)s", self._shown[number])
+        starts = self.page_starts()
+        if not 1 <= number <= len(starts):
+            return []
+        return self._remember(number, self._read(f"{self.view['key']} >= %(key)s",
+                                                 starts[number - 1]))
+
+    def page(self, number):
+        """
+        Returns the rows of a 1-based page number, or [] past the last page.
+        """
+        return [row for _, row in self._starting_at(number)]
+
+    def pages(self, start=1):
+        """
+        Yields (page number, rows) from page start to the last page, each page
+        read after the last key of the one before.
+        """
+        number, batch = start, self._starting_at(start)
+        while batch:
+            yield number, [row for _, row in batch]
+            if len(batch) < self.page_size:
+                return
+            number += 1
+            batch = self._remember(number, self._read(f"{self.view['key']} > %(key)s",
+                                                      batch[-1][0]))
+
+    def browse(self, show, start=1):
+        """
+        Interactive paging: shows a page, then reads a command from stdin.
+        [Enter]/n next page, p previous page, g N (or just N) go to page N, q quit.
+
+        Args:
+            show: Called with (page number, rows) to display a page.
+            start (int): The first page shown.
+        """
+        number, batch = start, self._starting_at(start)
+        if not batch:
+            print("(no rows)")
+            return
+        show(number, [row for _, row in batch])
+        while True:
+            try:
+                command = input("[n]ext  [p]rev  [g]o N  [q]uit > ").strip().lower()
+            except EOFError:
+                return
+            target, moved = None, []
+            if command in ("q", "quit"):
+                return
+            if command in ("", "n"):
+                target = number + 1
+                if len(batch) == self.page_size:
+                    moved = self._read(f"{self.view['key']} > %(key)s", batch[-1][0])
+            elif command == "p":
+                target = number - 1
+                if number > 1:
+                    moved = self._read(f"{self.view['key']} < %(key)s", batch[0][0],
+                                       descending=True)
+            elif command.lstrip("g ").isdigit():
+                target = int(command.lstrip("g "))
+                moved = self._starting_at(target)
+            else:
+                print("Unknown command")
+                continue
+            if moved:
+                number, batch = target, self._remember(target, moved)
+                show(number, [row for _, row in batch])
+            else:
+                print(f"No page {target}")
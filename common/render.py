@@ -0,0 +1,134 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Terminal Rendering
+
+Formats query rows for the terminal in batches. The movie scripts used to call
+print() once per field, each line with its own colour codes. A Renderer builds
+the text for up to batch_rows rows and writes it with a single write(), so
+large listings cost one write per batch instead of several per row.
+
+Styles:
+- records  "Label: value" lines with a colour per field (the original look)
+- plain    the same lines without colour codes
+- table    columns aligned within each batch, under a header row
+- tsv      tab-separated values with one header row, for other programs
+
+With no style given, records is used on a terminal and plain when stdout is
+redirected to a file or a pipe. Colour codes are only written to a terminal.
+
+Usage:
+    renderer = Renderer("table")
+    renderer.header("-- DISPLAYING STUDIO RECORDS --")
+    renderer.rows(("Studio ID", "Studio Name"), cursor.fetchall())
+"""
+
+from decimal import Decimal
+from itertools import islice
+import sys
+
+from colorama import Fore, Style
+
+STYLES = ("records", "plain", "table", "tsv")
+# Rows formatted per write()
+RENDER_BATCH_ROWS = 1000
+# Field colours in records style, in column order
+FIELD_COLORS = (Fore.GREEN, Fore.YELLOW, Fore.BLUE, Fore.MAGENTA)
+
+def tsv_value(value):
+    """
+    Formats a value for a TSV cell: NULL is empty, tabs and newlines become spaces.
+    """
+    if value is None:
+        return ""
+    return str(value).replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+class Renderer:
+    """
+    Writes section headers and rows to a stream in one of the STYLES.
+    """
+
+    def __init__(self, style=None, stream=None, batch_rows=RENDER_BATCH_ROWS):
+        """
+        Args:
+            style (str): One of STYLES; chosen from the stream when omitted.
+            stream: A text stream; sys.stdout when omitted.
+            batch_rows (int): Rows formatted per write().
+
+        Raises:
+            ValueError: If the style is unknown.
+        """
+        self.stream = stream or sys.stdout
+        is_tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.style = style or ("records" if is_tty else "plain")
+        if self.style not in STYLES:
+            raise ValueError(f"Unknown style {self.style!r}; choose from: {', '.join(STYLES)}")
+        self.color = is_tty and self.style in ("records", "table")
+        self.batch_rows = batch_rows
+
+    def _paint(self, color, text):
+        return f"{color}{text}{Style.RESET_ALL}" if self.color else text
+
+    def header(self, title, blank_line=True):
+        """
+        Writes a section title, followed by an empty line when blank_line is set.
+        """
+        if self.style == "tsv":
+            self.stream.write(f"# {title.strip()}\n")
+        else:
+            self.stream.write(f"\n{self._paint(Fore.CYAN, title)}\n"
+                              + ("\n" if blank_line else ""))
+
+    def rows(self, labels, rows, colors=FIELD_COLORS):
+        """
+        Writes rows, batch_rows at a time with one write() per batch.
+
+        Args:
+            labels (tuple): A label per column.
+            rows (iterable): Row tuples; may be a generator.
+            colors (tuple): Colour per column in records style.
+
+        Returns:
+            int: The number of rows written.
+        """
+        rows = iter(rows)
+        written = 0
+        while True:
+            batch = list(islice(rows, self.batch_rows))
+            if not batch:
+                return written
+            self.stream.write(self.format(labels, batch, colors, first=written == 0))
+            written += len(batch)
+
+    def format(self, labels, batch, colors=FIELD_COLORS, first=True):
+        """
+        Returns the text for one batch of rows. first adds the TSV header row.
+        """
+        if self.style == "tsv":
+            lines = ["\t".join(map(tsv_value, row)) for row in batch]
+            if first:
+                lines.insert(0, "\t".join(labels))
+            return "\n".join(lines) + "\n"
+        if self.style == "table":
+            return self._table(labels, batch)
+        # records and plain: one template, filled once per row
+        template = "".join(f"{label}: {self._paint(colors[index % len(colors)], '{}')}\n"
+                           for index, label in enumerate(labels)) + "\n"
+        return "".join(template.format(*row) for row in batch)
+
+    def _table(self, labels, batch):
+        cells = [["" if value is None else str(value) for value in row] for row in batch]
+        widths = [max([len(label)] + [len(row[index]) for row in cells])
+                  for index, label in enumerate(labels)]
+        numeric = [all(isinstance(row[index], (int, float, Decimal)) or row[index] is None
+                       for row in batch)
+                   for index in range(len(labels))]
+        header = "  ".join(label.rjust(width) if is_number else label.ljust(width)
+                           for label, width, is_number in zip(labels, widths, numeric)).rstrip()
+        lines = [self._paint(Fore.CYAN, header),
+                 "  ".join("-" * width for width in widths)]
+        for row in cells:
+            lines.append("  ".join(value.rjust(width) if is_number else value.ljust(width)
+                                   for value, width, is_number in zip(row, widths, numeric))
+                         .rstrip())
+        return "\n".join(lines) + "\n\n"
@@ -0,0 +1,183 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Database Snapshots
+
+Copies the tables of the MySQL database named in .env into a SQLite or DuckDB
+file, so reports and viewers can run offline with --backend. Run it from the
+folder whose .env names the database to copy: the Bacchus scripts use the
+repository root, the movie scripts their own module folder.
+
+Each table is recreated with the nearest column types and its primary key,
+then filled from an unbuffered cursor in batches. Views (such as the
+WineOrdersAll and SupplyShipmentAll archive views) are copied as tables holding
+their rows, so queries that read them, like the reports with
+--include-archive, run unchanged against the snapshot. Into DuckDB the batches are
+loaded as Arrow tables when pyarrow is installed. The snapshot is built in a
+temporary file and renamed into place when complete, so a failed run never
+leaves a half-copied file behind.
+
+Usage:
+    python common/snapshot.py sqlite:bacchus.db
+    python common/snapshot.py duckdb:bacchus.duckdb --tables WineOrders Wine Distributor
+    cd module-7 && python ../common/snapshot.py sqlite:movies.db
+"""
+
+from pathlib import Path
+import argparse
+import os
+import sys
+import time
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.backends import EMBEDDED_ERRORS, connect, parse_backend
+from common.db import get_connection
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+SNAPSHOT_BATCH_SIZE = 10000
+
+def column_type(data_type, precision, scale):
+    """
+    Maps an information_schema DATA_TYPE to a type both SQLite and DuckDB accept.
+    """
+    if data_type in ("tinyint", "smallint", "mediumint", "int", "integer"):
+        return "INTEGER"
+    if data_type == "bigint":
+        return "BIGINT"
+    if data_type == "decimal":
+        return f"DECIMAL({precision}, {scale})"
+    if data_type in ("float", "double"):
+        return "DOUBLE"
+    if data_type == "date":
+        return "DATE"
+    if data_type in ("datetime", "timestamp"):
+        return "TIMESTAMP"
+    if data_type in ("blob", "binary", "varbinary", "longblob", "mediumblob"):
+        return "BLOB"
+    return "VARCHAR"
+
+def source_tables(cursor, names=None):
+    """
+    Returns {table: [(column, type, is primary key), ...]} for the base tables
+    and views of the current MySQL database, limited to names when given. Views
+    have no primary key.
+    """
+    cursor.execute("""
+        SELECT c.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE, c.NUMERIC_PRECISION,
+               c.NUMERIC_SCALE, c.COLUMN_KEY, t.TABLE_TYPE
+        FROM information_schema.COLUMNS c
+        JOIN information_schema.TABLES t
+          ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+        WHERE c.TABLE_SCHEMA = DATABASE() AND t.TABLE_TYPE IN ('BASE TABLE', 'VIEW')
+        ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION;
+    """)
+    tables = {}
+    for table, column, data_type, precision, scale, key, table_type in cursor.fetchall():
+        if names and table not in names:
+            continue
+        tables.setdefault(table, []).append(
+            (column, column_type(data_type, precision, scale),
+             key == "PRI" and table_type == "BASE TABLE"))
+    missing = set(names or []) - set(tables)
+    if missing:
+        raise ValueError(f"No such table(s): {', '.join(sorted(missing))}")
+    return tables
+
+def create_statement(table, columns):
+    definitions = [f"{column} {column_type}" for column, column_type, _ in columns]
+    primary = [column for column, _, is_primary in columns if is_primary]
+    if primary:
+        definitions.append(f"PRIMARY KEY ({', '.join(primary)})")
+    return f"CREATE TABLE {table} ({', '.join(definitions)})"
+
+def copy_table(source, target, table, columns, batch_size):
+    """
+    Streams one table from MySQL into the embedded target.
+
+    Returns:
+        int: The number of rows copied.
+    """
+    names = [column for column, _, _ in columns]
+    read = source.cursor(buffered=False)
+    read.execute(f"SELECT {', '.join(names)} FROM {table}")
+    write = target.cursor()
+    insert = f"INSERT INTO {table} VALUES ({', '.join(['%s'] * len(names))})"
+    copied = 0
+    while True:
+        batch = read.fetchmany(batch_size)
+        if not batch:
+            break
+        if target.kind == "duckdb" and pa is not None:
+            arrow_batch = pa.table(dict(zip(names, map(list, zip(*batch)))))
+            target.raw.register("snapshot_batch", arrow_batch)
+            target.raw.execute(f"INSERT INTO {table} SELECT * FROM snapshot_batch")
+            target.raw.unregister("snapshot_batch")
+        else:
+            write.executemany(insert, batch)
+        copied += len(batch)
+    read.close()
+    write.close()
+    target.commit()
+    return copied
+
+def snapshot(spec, tables=None, batch_size=SNAPSHOT_BATCH_SIZE):
+    """
+    Copies the MySQL database into the embedded database file named by spec.
+
+    Args:
+        spec (str): "sqlite:PATH" or "duckdb:PATH".
+        tables (list): Optional table or view names; all of them when omitted.
+        batch_size (int): Rows fetched and inserted per batch.
+    """
+    kind, path = parse_backend(spec)
+    if kind == "mysql":
+        raise ValueError("Snapshots are written to a sqlite: or duckdb: file")
+    final_path = Path(path)
+    temp_path = final_path.with_name(final_path.name + ".tmp")
+    temp_path.unlink(missing_ok=True)
+
+    source = get_connection()
+    target = None
+    try:
+        target = connect(f"{kind}:{temp_path}")
+        cursor = source.cursor()
+        definitions = source_tables(cursor, tables)
+        cursor.close()
+        if kind == "sqlite":
+            # Nothing reads the temporary file until it is complete
+            target.raw.execute("PRAGMA journal_mode = OFF")
+            target.raw.execute("PRAGMA synchronous = OFF")
+        for table, columns in definitions.items():
+            started = time.perf_counter()
+            target.cursor().execute(create_statement(table, columns))
+            copied = copy_table(source, target, table, columns, batch_size)
+            print(f"{table}: {copied} rows in {time.perf_counter() - started:.2f}s")
+        target.close()
+        target = None
+        os.replace(temp_path, final_path)
+    finally:
+        if target is not None:
+            target.close()
+        source.close()
+        # Only left behind when the copy failed
+        temp_path.unlink(missing_ok=True)
+    print(f"Snapshot written: {final_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Copy the MySQL database into SQLite or DuckDB.")
+    parser.add_argument("target", help="sqlite:PATH or duckdb:PATH")
+    parser.add_argument("--tables", nargs="*", help="tables and views to copy (default: all)")
+    parser.add_argument("--batch-size", type=int, default=SNAPSHOT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    try:
+        snapshot(args.target, args.tables, args.batch_size)
+    except (mysql.connector.Error, *EMBEDDED_ERRORS, ValueError, RuntimeError) as err:
+        print(f"Error: {err}")
+        sys.exit(1)
@@ -0,0 +1,151 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Batched Write Path
+
+Writes through server-side prepared statements and groups many inserts, updates
+and deletes into one transaction instead of committing after every statement.
+
+- Each distinct SQL string is prepared once per connection (PooledConnection.prepared()
+  in common/db.py) and re-executed with new parameters.
+- A commit is issued every commit_every affected statements and when the writer
+  is closed; leaving a with-block on an exception rolls back instead.
+- execute() and executemany() return affected-row counts, and totals are kept
+  per statement type.
+- upsert() builds INSERT ... ON DUPLICATE KEY UPDATE for a row dict.
+- When given a QueryCache, cached results that read a written table are dropped.
+
+Usage:
+    with BatchWriter(db, commit_every=500) as writer:
+        writer.execute("UPDATE film SET genre_id = %s WHERE film_name = %s", (1, "Alien"))
+        writer.upsert("studio", {"studio_id": 4, "studio_name": "Warner Bros. Pictures"})
+"""
+
+import re
+
+from common.cache import is_write, tables_in
+
+DEFAULT_COMMIT_EVERY = 1000
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def _check_identifier(name):
+    if not IDENTIFIER.match(name):
+        raise ValueError(f"Invalid table or column name: {name!r}")
+    return name
+
+class BatchWriter:
+    """
+    Executes write statements with prepared cursors and periodic commits.
+    """
+
+    def __init__(self, conn, commit_every=DEFAULT_COMMIT_EVERY, cache=None):
+        self.conn = conn
+        self.commit_every = commit_every
+        self.cache = cache
+        self.pending = 0
+        self.lastrowid = None
+        self.totals = {}
+        self._touched = set()
+        self._cursors = {}
+
+    def _cursor(self, sql):
+        if hasattr(self.conn, "prepared"):
+            return self.conn.prepared(sql)
+        cursor = self._cursors.get(sql)
+        if cursor is None:
+            cursor = self.conn.cursor(prepared=True)
+            self._cursors[sql] = cursor
+        return cursor
+
+    def _record(self, sql, affected, statements):
+        kind = sql.split(None, 1)[0].upper()
+        self.totals[kind] = self.totals.get(kind, 0) + affected
+        if is_write(sql):
+            self._touched |= tables_in(sql)
+            if self.cache is not None:
+                self.cache.invalidate(*tables_in(sql))
+        self.pending += statements
+        if self.pending >= self.commit_every:
+            self.commit()
+
+    def execute(self, sql, params=()):
+        """
+        Executes one statement with a prepared cursor.
+
+        Returns:
+            int: The number of affected rows.
+        """
+        cursor = self._cursor(sql)
+        cursor.execute(sql, params)
+        affected = cursor.rowcount
+        self.lastrowid = cursor.lastrowid
+        self._record(sql, affected, 1)
+        return affected
+
+    def executemany(self, sql, seq_of_params):
+        """
+        Executes one prepared statement for each parameter tuple.
+
+        Returns:
+            int: The total number of affected rows.
+        """
+        cursor = self._cursor(sql)
+        affected = 0
+        for params in seq_of_params:
+            cursor.execute(sql, params)
+            affected += cursor.rowcount
+            self.lastrowid = cursor.lastrowid
+            self._record(sql, cursor.rowcount, 1)
+        return affected
+
+    def upsert(self, table, row, update_columns=None):
+        """
+        Inserts a row, or updates it when its primary or unique key already exists.
+
+        Args:
+            table (str): The table name.
+            row (dict): Column values to insert.
+            update_columns (list): Columns to overwrite on a duplicate key;
+                every column in row by default.
+
+        Returns:
+            int: The affected-row count (1 inserted, 2 updated, 0 unchanged).
+        """
+        columns = [_check_identifier(column) for column in row]
+        updates = [_check_identifier(column) for column in (update_columns or columns)]
+        sql = (f"INSERT INTO {_check_identifier(table)} ({', '.join(columns)}) "
+               f"VALUES ({', '.join(['%s'] * len(columns))}) "
+               f"ON DUPLICATE KEY UPDATE "
+               + ", ".join(f"{column} = VALUES({column})" for column in updates))
+        return self.execute(sql, tuple(row.values()))
+
+    def commit(self):
+        self.conn.commit()
+        self.pending = 0
+        self._touched.clear()
+
+    def rollback(self):
+        """
+        Rolls back uncommitted writes. Results cached while they were visible
+        are dropped, since they no longer match the database.
+        """
+        self.conn.rollback()
+        self.pending = 0
+        if self.cache is not None and self._touched:
+            self.cache.invalidate(*self._touched)
+        self._touched.clear()
+
+    def close(self):
+        for cursor in self._cursors.values():
+            cursor.close()
+        self._cursors.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
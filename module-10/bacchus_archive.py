@@ -0,0 +1,279 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Archive and Retention
+
+Moves finished rows out of the hot tables so the reports work on a small set:
+
+- WineOrders rows that are Shipped or Delivered and were ordered before the
+  retention cutoff
+- SupplyShipment rows that were delivered before the retention cutoff
+
+Rows move in primary-key chunks. Each chunk is copied into an archive table
+(WineOrdersArchive, SupplyShipmentArchive) or written to a gzip JSON Lines file
+and then deleted from the hot table. With table archiving the copy and the
+delete commit together. With file archiving the chunk file is named after its
+first key and replaced atomically. Either way an interrupted run can simply be
+started again. --pause sleeps between chunks to limit lock time and replication
+lag.
+
+Rows are copied by column name. A column a migration adds to a hot table is
+added to its archive table (nullable, as older archived rows have no value) and
+the views are recreated before each run, so the archive follows the schema.
+
+The WineOrdersAll and SupplyShipmentAll views combine the hot and archived rows.
+The report creator reads through them with --include-archive. Hot-only reports
+such as Pending Wine Orders never do. The summary tables from
+bacchus_summaries.py track the hot rows only, because deleting an archived order
+fires the summary DELETE triggers. When the inventory ledger from
+bacchus_ledger.py is installed, a run first posts the movements of the rows it
+is about to move, so archiving never drops a delivery or shipped order from it.
+
+Usage:
+    python bacchus_archive.py install
+    python bacchus_archive.py status --retention-days 365
+    python bacchus_archive.py run --retention-days 365 --chunk-size 5000 --pause 0.5
+    python bacchus_archive.py run --to-files archive/ --dry-run
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import time
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import get_connection, reconnect_to_db
+
+from bacchus_ledger import post_movements
+
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_CHUNK_SIZE = 5000
+
+# Hot table -> its key, the rows that may be archived (before %(cutoff)s),
+# the archive table and the view over both
+ARCHIVED_TABLES = {
+    "WineOrders": {
+        "key": "OrderID",
+        "condition": "OrderStatus IN ('Shipped', 'Delivered') AND OrderDate < %(cutoff)s",
+        "archive": "WineOrdersArchive",
+        "view": "WineOrdersAll",
+    },
+    "SupplyShipment": {
+        "key": "ShipmentID",
+        "condition": "ActualDeliveryDate IS NOT NULL AND ActualDeliveryDate < %(cutoff)s",
+        "archive": "SupplyShipmentArchive",
+        "view": "SupplyShipmentAll",
+    },
+}
+
+def table_columns(cursor, table):
+    """
+    Returns the table's columns in order as (name, column type) tuples.
+    """
+    cursor.execute("""
+        SELECT COLUMN_NAME, COLUMN_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION;
+    """, (table,))
+    return cursor.fetchall()
+
+def sync_archive(cursor, table):
+    """
+    Adds the hot table's new columns to its archive table and recreates the hot
+    + archive view over the hot table's columns.
+
+    Returns:
+        str: The hot table's column list, for copying rows by name.
+    """
+    spec = ARCHIVED_TABLES[table]
+    columns = table_columns(cursor, table)
+    archived = {name for name, _ in table_columns(cursor, spec["archive"])}
+    for name, column_type in columns:
+        if name not in archived:
+            cursor.execute(f"ALTER TABLE {spec['archive']} ADD COLUMN {name} {column_type} NULL;")
+            print(f"{spec['archive']}: added column {name}")
+    column_list = ", ".join(name for name, _ in columns)
+    cursor.execute(f"CREATE OR REPLACE VIEW {spec['view']} AS "
+                   f"SELECT {column_list} FROM {table} "
+                   f"UNION ALL SELECT {column_list} FROM {spec['archive']};")
+    return column_list
+
+def install(conn):
+    """
+    Creates the archive tables and the hot + archive views. Running it again
+    only brings them up to date with the hot tables.
+    """
+    cursor = conn.cursor()
+    for table, spec in ARCHIVED_TABLES.items():
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {spec['archive']} LIKE {table};")
+        sync_archive(cursor, table)
+        print(f"{spec['archive']} and {spec['view']} are ready.")
+    conn.commit()
+    cursor.close()
+
+def with_archive(query):
+    """
+    Returns the query rewritten to read each archived table through its hot +
+    archive view.
+    """
+    for table, spec in ARCHIVED_TABLES.items():
+        query = re.sub(rf"\b{table}\b", spec["view"], query)
+    return query
+
+def archivable_counts(conn, cutoff):
+    """
+    Returns a dict of table name to the number of rows older than the cutoff
+    that the next run would move.
+    """
+    cursor = conn.cursor()
+    counts = {}
+    for table, spec in ARCHIVED_TABLES.items():
+        cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {spec['condition']};",
+                       {"cutoff": cutoff})
+        counts[table] = cursor.fetchone()[0]
+    cursor.close()
+    return counts
+
+def to_json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def write_chunk_file(directory, table, columns, rows):
+    """
+    Writes one chunk of rows as gzip JSON Lines. The file is named after the
+    chunk's first key and written through a temporary file, so a retried chunk
+    replaces it instead of adding duplicates.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{table}_{rows[0][0]:012d}.jsonl.gz"
+    temp_path = path.with_name(path.name + ".tmp")
+    with gzip.open(temp_path, "wt", encoding="utf-8") as writer:
+        for row in rows:
+            writer.write(json.dumps({column: to_json_value(value)
+                                     for column, value in zip(columns, row)}) + "\n")
+    os.replace(temp_path, path)
+    return path
+
+def archive_table(conn, table, cutoff, chunk_size=DEFAULT_CHUNK_SIZE, pause=0.0,
+                  files_dir=None, dry_run=False):
+    """
+    Moves the archivable rows of one table in key order, one chunk per transaction.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        table (str): A table in ARCHIVED_TABLES.
+        cutoff (datetime.date): Rows dated before this are archived.
+        chunk_size (int): Rows per chunk.
+        pause (float): Seconds to sleep between chunks.
+        files_dir (pathlib.Path): Write chunks to gzip files here instead of the
+            archive table.
+        dry_run (bool): Count the chunks without moving anything.
+
+    Returns:
+        int: The number of rows moved (or that would be moved).
+    """
+    spec = ARCHIVED_TABLES[table]
+    key = spec["key"]
+    cursor = conn.cursor()
+    if files_dir is None and not dry_run:
+        column_list = sync_archive(cursor, table)
+    moved = 0
+    last_key = 0
+    while True:
+        cursor.execute(f"SELECT {key} FROM {table} WHERE {key} > %(last_key)s "
+                       f"AND {spec['condition']} ORDER BY {key} LIMIT %(limit)s;",
+                       {"last_key": last_key, "cutoff": cutoff, "limit": chunk_size})
+        keys = [row[0] for row in cursor.fetchall()]
+        if not keys:
+            break
+        last_key = keys[-1]
+        if dry_run:
+            moved += len(keys)
+            continue
+
+        placeholders = ", ".join(["%s"] * len(keys))
+        if files_dir is not None:
+            cursor.execute(f"SELECT * FROM {table} WHERE {key} IN ({placeholders}) ORDER BY {key};",
+                           keys)
+            columns = [column[0] for column in cursor.description]
+            write_chunk_file(Path(files_dir), table, columns, cursor.fetchall())
+        else:
+            cursor.execute(f"INSERT INTO {spec['archive']} ({column_list}) "
+                           f"SELECT {column_list} FROM {table} WHERE {key} IN ({placeholders});",
+                           keys)
+        cursor.execute(f"DELETE FROM {table} WHERE {key} IN ({placeholders});", keys)
+        conn.commit()
+        moved += len(keys)
+        print(f"{table}: archived {moved} rows (through {key} {last_key})")
+        if pause:
+            time.sleep(pause)
+    cursor.close()
+    return moved
+
+def ledger_installed(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'InventoryLedger';
+    """)
+    installed = cursor.fetchone()[0] > 0
+    cursor.close()
+    return installed
+
+def run_archive(conn, retention_days=DEFAULT_RETENTION_DAYS, chunk_size=DEFAULT_CHUNK_SIZE,
+                pause=0.0, files_dir=None, dry_run=False):
+    """
+    Archives every table in ARCHIVED_TABLES up to the retention cutoff, after
+    posting outstanding movements to the inventory ledger when it is installed.
+    """
+    cutoff = date.today() - timedelta(days=retention_days)
+    if not dry_run and ledger_installed(conn):
+        post_movements(conn, chunk_size)
+    for table in ARCHIVED_TABLES:
+        moved = archive_table(conn, table, cutoff, chunk_size, pause, files_dir, dry_run)
+        verb = "would move" if dry_run else "moved"
+        print(f"{table}: {verb} {moved} rows older than {cutoff}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive finished Bacchus orders and shipments.")
+    parser.add_argument("command", choices=["install", "status", "run"])
+    parser.add_argument("--retention-days", type=int, default=DEFAULT_RETENTION_DAYS,
+                        help=f"keep rows newer than this in the hot tables "
+                             f"(default {DEFAULT_RETENTION_DAYS})")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--pause", type=float, default=0.0,
+                        help="seconds to sleep between chunks")
+    parser.add_argument("--to-files", type=Path, default=None, metavar="DIR",
+                        help="write gzip JSON Lines files instead of archive tables")
+    parser.add_argument("--dry-run", action="store_true", help="count rows without moving them")
+    args = parser.parse_args()
+
+    # CREATE TABLE IF NOT EXISTS reports note 1050 for an existing archive table,
+    # so install runs without raise_on_warnings
+    conn = get_connection() if args.command == "install" else reconnect_to_db()
+    try:
+        if args.command == "install":
+            install(conn)
+        elif args.command == "status":
+            cutoff = date.today() - timedelta(days=args.retention_days)
+            for table, count in archivable_counts(conn, cutoff).items():
+                print(f"{table:<16} {count} rows older than {cutoff} can be archived")
+        else:
+            run_archive(conn, args.retention_days, args.chunk_size, args.pause,
+                        args.to_files, args.dry_run)
+    except mysql.connector.Error as err:
+        print(f"Error: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
@@ -0,0 +1,242 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Bulk Data Import
+
+Loads Bacchus Winery data from CSV or JSONL files instead of the hard-coded rows in
+insert_data(). Each file is named after its table (Employee.csv, WineOrders.jsonl, ...)
+and its columns come from the CSV header or the JSON keys of the first record.
+
+Files are read as a stream and inserted in batches with parameterized executemany(),
+committing every --commit-every rows. CSV files can instead use LOAD DATA LOCAL INFILE
+(--local-infile) when the server allows it. Tables are loaded in foreign-key order read
+from information_schema, so parents (Department, Supplier, ...) always load before their
+children (Employee, SupplyShipment, ...).
+
+Usage:
+    python bacchus_bulk_import.py path/to/data --batch-size 5000 --commit-every 50000
+"""
+
+import mysql.connector
+from pathlib import Path
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import get_connection
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_COMMIT_EVERY = 50000
+
+# Table and column names come from file names and headers, so only plain
+# identifiers are accepted before they are placed in SQL
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def connect(local_infile=False):
+    """
+    Returns a pooled database connection, allowing LOAD DATA LOCAL INFILE when requested.
+    """
+    return get_connection(allow_local_infile=local_infile)
+
+def find_input_files(data_dir):
+    """
+    Returns a dict of table name to input file for every .csv/.jsonl file in data_dir.
+    """
+    files = {}
+    for path in sorted(Path(data_dir).iterdir()):
+        if path.suffix.lower() in (".csv", ".jsonl"):
+            if path.stem in files:
+                sys.exit(f"More than one input file for table {path.stem}")
+            files[path.stem] = path
+    return files
+
+def foreign_key_order(cursor, tables):
+    """
+    Sorts tables so every table comes after the tables its foreign keys reference.
+
+    Args:
+        cursor (mysql.connector.cursor.MySQLCursor): The database cursor object.
+        tables (iterable): The table names to order.
+    """
+    cursor.execute("""
+        SELECT TABLE_NAME, REFERENCED_TABLE_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL;
+    """)
+    wanted = set(tables)
+    parents = {table: set() for table in wanted}
+    for child, parent in cursor.fetchall():
+        if child in wanted and parent in wanted and child != parent:
+            parents[child].add(parent)
+
+    ordered = []
+    while parents:
+        ready = sorted(table for table, deps in parents.items() if not deps)
+        if not ready:
+            sys.exit(f"Circular foreign keys between: {', '.join(sorted(parents))}")
+        for table in ready:
+            ordered.append(table)
+            del parents[table]
+        for deps in parents.values():
+            deps.difference_update(ready)
+    return ordered
+
+def check_identifiers(names):
+    """
+    Exits if any table or column name is not a plain SQL identifier.
+    """
+    for name in names:
+        if not IDENTIFIER.match(name):
+            sys.exit(f"Invalid table or column name: {name!r}")
+
+def read_rows(path):
+    """
+    Streams rows from a CSV or JSONL file.
+
+    Returns:
+        tuple: The column names and an iterator of row tuples. Empty CSV fields
+               are read as NULL.
+    """
+    reader = open(path, newline="")
+    if path.suffix.lower() == ".csv":
+        rows = csv.reader(reader)
+        columns = next(rows)
+
+        def generate():
+            with reader:
+                for row in rows:
+                    yield tuple(value if value != "" else None for value in row)
+        return columns, generate()
+
+    first = json.loads(reader.readline())
+    columns = list(first)
+
+    def generate():
+        with reader:
+            yield tuple(first.get(column) for column in columns)
+            for line in reader:
+                if line.strip():
+                    record = json.loads(line)
+                    yield tuple(record.get(column) for column in columns)
+    return columns, generate()
+
+def load_with_executemany(conn, table, path, batch_size, commit_every):
+    """
+    Inserts a file's rows with parameterized executemany() batches, committing
+    every commit_every rows.
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    columns, rows = read_rows(path)
+    check_identifiers(columns)
+    query = (f"INSERT INTO {table} ({', '.join(columns)}) "
+             f"VALUES ({', '.join(['%s'] * len(columns))})")
+    cursor = conn.cursor()
+    loaded = uncommitted = 0
+    batch = []
+
+    def flush():
+        cursor.executemany(query, batch)
+        batch.clear()
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            loaded += len(batch)
+            uncommitted += len(batch)
+            flush()
+            if uncommitted >= commit_every:
+                conn.commit()
+                uncommitted = 0
+    if batch:
+        loaded += len(batch)
+        flush()
+    conn.commit()
+    cursor.close()
+    return loaded
+
+def load_with_local_infile(conn, table, path):
+    """
+    Loads a CSV file with LOAD DATA LOCAL INFILE. Empty fields are loaded as NULL.
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    with open(path, newline="") as reader:
+        first_line = reader.readline()
+    columns = next(csv.reader([first_line]))
+    check_identifiers(columns)
+    line_end = "\\r\\n" if first_line.endswith("\r\n") else "\\n"
+    variables = [f"@c{i}" for i in range(len(columns))]
+    assignments = ", ".join(f"{column} = NULLIF({var}, '')"
+                            for column, var in zip(columns, variables))
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+        LINES TERMINATED BY '{line_end}'
+        IGNORE 1 LINES
+        ({', '.join(variables)})
+        SET {assignments};
+    """, (str(path),))
+    loaded = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    return loaded
+
+def bulk_import(data_dir, batch_size=DEFAULT_BATCH_SIZE, commit_every=DEFAULT_COMMIT_EVERY,
+                local_infile=False):
+    """
+    Loads every table file in data_dir in foreign-key order and prints rows/sec per table.
+
+    Args:
+        data_dir (str): Directory of <Table>.csv / <Table>.jsonl files.
+        batch_size (int): Rows per executemany() call.
+        commit_every (int): Rows between commits.
+        local_infile (bool): Use LOAD DATA LOCAL INFILE for CSV files.
+    """
+    files = find_input_files(data_dir)
+    if not files:
+        sys.exit(f"No .csv or .jsonl files found in {data_dir}")
+    check_identifiers(files)
+
+    conn = connect(local_infile)
+    cursor = conn.cursor()
+
+    try:
+        for table in foreign_key_order(cursor, files):
+            path = files[table]
+            started = time.perf_counter()
+            if local_infile and path.suffix.lower() == ".csv":
+                loaded = load_with_local_infile(conn, table, path)
+            else:
+                loaded = load_with_executemany(conn, table, path, batch_size, commit_every)
+            elapsed = time.perf_counter() - started
+            rate = loaded / elapsed if elapsed else float(loaded)
+            print(f"{table}: {loaded} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+        print("Bulk import complete.")
+
+    except mysql.connector.Error as err:
+        print(f"Error: {err}")
+        conn.rollback()
+
+    cursor.close()
+    conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk load Bacchus tables from CSV/JSONL files.")
+    parser.add_argument("data_dir", help="directory of <Table>.csv or <Table>.jsonl files")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"rows per executemany() call (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--commit-every", type=int, default=DEFAULT_COMMIT_EVERY,
+                        help=f"rows between commits (default {DEFAULT_COMMIT_EVERY})")
+    parser.add_argument("--local-infile", action="store_true",
+                        help="load CSV files with LOAD DATA LOCAL INFILE")
+    args = parser.parse_args()
+    bulk_import(args.data_dir, args.batch_size, args.commit_every, args.local_infile)
@@ -0,0 +1,410 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Inventory Change Capture
+
+Watches SupplyInventory and WineInventory for changes and raises an event as
+soon as an item's stock crosses its threshold, instead of waiting for someone
+to run the low-supply report.
+
+The watcher loads current stock once, then follows changes from one of two
+sources:
+
+- binlog: tails the MySQL binary log with python-mysql-replication. Row events
+  arrive as they are written, with no queries against the database. This needs
+  binlog_format=ROW and a user with REPLICATION SLAVE and REPLICATION CLIENT.
+- triggers: a fallback for servers without row-based binary logging. Triggers
+  copy every inventory write into InventoryChanges, and the watcher reads new
+  change rows by ChangeID, an indexed range read of only the new rows. IDs it
+  skips over are read again for a short grace period, since an ID is assigned
+  at insert time and a slower transaction can commit it after higher ones.
+
+Both sources carry the full row after each change, so replaying a change the
+initial load already saw is harmless.
+
+Thresholds are per item, from the InventoryThresholds table, with
+--default-threshold (100, the low-supply report's value) for items without
+one. In binlog mode threshold edits take effect immediately. In triggers mode
+restart the watcher after editing them.
+
+Usage:
+    python bacchus_cdc.py install [--triggers]
+    python bacchus_cdc.py set-threshold SupplyInventory 3 250
+    python bacchus_cdc.py thresholds
+    python bacchus_cdc.py watch --source auto --events alerts.jsonl
+    python bacchus_cdc.py prune --keep-hours 24
+"""
+
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import get_connection, load_config, reconnect_to_db
+
+try:
+    from pymysqlreplication import BinLogStreamReader
+    from pymysqlreplication.row_event import DeleteRowsEvent, UpdateRowsEvent, WriteRowsEvent
+except ImportError:
+    BinLogStreamReader = None
+
+DEFAULT_THRESHOLD = 100
+POLL_INTERVAL = 1.0
+# Skipped ChangeIDs are looked for again for this many seconds, and at most this
+# many below each new ID, in case their transaction commits late
+GAP_GRACE = 60.0
+MAX_GAP = 1000
+DEFAULT_SERVER_ID = 3101
+
+# Watched table -> its row key and the item the stock belongs to
+INVENTORY_TABLES = {
+    "SupplyInventory": {"id": "SupplyInventoryID", "item": "SupplyTypeID"},
+    "WineInventory": {"id": "WineInventoryID", "item": "WineID"},
+}
+
+THRESHOLD_TABLE = """
+    CREATE TABLE IF NOT EXISTS InventoryThresholds (
+        TableName VARCHAR(64) NOT NULL,
+        ItemID INT NOT NULL,
+        Threshold INT NOT NULL,
+        PRIMARY KEY (TableName, ItemID)
+    );
+"""
+
+CHANGE_TABLE = """
+    CREATE TABLE IF NOT EXISTS InventoryChanges (
+        ChangeID BIGINT AUTO_INCREMENT PRIMARY KEY,
+        TableName VARCHAR(64) NOT NULL,
+        RowID INT NOT NULL,
+        ItemID INT,
+        QuantityOnHand INT,
+        ChangedAt TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+        INDEX idx_inventorychanges_changed (ChangedAt)
+    );
+"""
+
+def change_triggers():
+    """
+    Returns (trigger name, CREATE TRIGGER statement) pairs that copy every
+    inventory write into InventoryChanges. A deleted row is recorded with a
+    NULL quantity.
+    """
+    triggers = []
+    for table, spec in INVENTORY_TABLES.items():
+        rows = {"INSERT": ("NEW", True), "UPDATE": ("NEW", True), "DELETE": ("OLD", False)}
+        for event, (row, has_quantity) in rows.items():
+            name = f"cdc_{table.lower()}_{event.lower()}"
+            quantity = f"{row}.QuantityOnHand" if has_quantity else "NULL"
+            triggers.append((name, f"""
+                CREATE TRIGGER {name} AFTER {event} ON {table} FOR EACH ROW
+                INSERT INTO InventoryChanges (TableName, RowID, ItemID, QuantityOnHand)
+                VALUES ('{table}', {row}.{spec['id']}, {row}.{spec['item']}, {quantity})
+            """))
+    return triggers
+
+def install(conn, triggers=False):
+    """
+    Creates the thresholds table and, for the triggers source, the change table
+    and its triggers (replacing existing ones).
+    """
+    cursor = conn.cursor()
+    cursor.execute(THRESHOLD_TABLE)
+    if triggers:
+        cursor.execute(CHANGE_TABLE)
+        for name, statement in change_triggers():
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(statement)
+            print(f"Trigger installed: {name}")
+    conn.commit()
+    cursor.close()
+    print("Change capture tables are ready.")
+
+def load_thresholds(cursor):
+    cursor.execute("SELECT TableName, ItemID, Threshold FROM InventoryThresholds;")
+    return {(table, item): threshold for table, item, threshold in cursor.fetchall()}
+
+class StockTracker:
+    """
+    Keeps current stock per item in memory and reports threshold crossings.
+
+    Args:
+        thresholds (dict): (table, item id) -> threshold.
+        default_threshold (int): Threshold for items without their own.
+        on_event (func): Called with an event dict for each crossing.
+    """
+
+    def __init__(self, thresholds, default_threshold, on_event):
+        self.thresholds = thresholds
+        self.default_threshold = default_threshold
+        self.on_event = on_event
+        self.rows = {}
+        self.stock = {}
+        self.low = set()
+
+    def threshold(self, key):
+        return self.thresholds.get(key, self.default_threshold)
+
+    def load(self, cursor):
+        """
+        Reads the current inventory rows and reports every item already below
+        its threshold.
+        """
+        for table, spec in INVENTORY_TABLES.items():
+            cursor.execute(f"SELECT {spec['id']}, {spec['item']}, QuantityOnHand FROM {table};")
+            for row_id, item, quantity in cursor.fetchall():
+                self.apply(table, row_id, item, quantity, check=False)
+        for key in list(self.stock):
+            self.check(key)
+
+    def apply(self, table, row_id, item, quantity, check=True):
+        """
+        Applies the latest state of one inventory row. quantity is None when the
+        row was deleted.
+        """
+        affected = set()
+        old = self.rows.pop((table, row_id), None)
+        if old is not None:
+            self.stock[(table, old[0])] -= old[1]
+            affected.add((table, old[0]))
+        if quantity is not None:
+            self.rows[(table, row_id)] = (item, quantity)
+            self.stock[(table, item)] = self.stock.get((table, item), 0) + quantity
+            affected.add((table, item))
+        if check:
+            for key in affected:
+                self.check(key)
+
+    def set_threshold(self, key, threshold):
+        if threshold is None:
+            self.thresholds.pop(key, None)
+        else:
+            self.thresholds[key] = threshold
+        if key in self.stock:
+            self.check(key)
+
+    def check(self, key):
+        quantity = self.stock.get(key, 0)
+        threshold = self.threshold(key)
+        below = quantity < threshold
+        if below == (key in self.low):
+            return
+        if below:
+            self.low.add(key)
+        else:
+            self.low.discard(key)
+        self.on_event({"event": "below" if below else "recovered", "table": key[0],
+                       "item": key[1], "quantity": quantity, "threshold": threshold,
+                       "time": datetime.now().isoformat(timespec="seconds")})
+
+def event_printer(events_path=None):
+    """
+    Returns an on_event handler that prints each event and, with a path, also
+    appends it to a JSON Lines file.
+    """
+    def on_event(event):
+        mark = "LOW" if event["event"] == "below" else "OK "
+        print(f"[{event['time']}] {mark} {event['table']} item {event['item']}: "
+              f"{event['quantity']} on hand (threshold {event['threshold']})", flush=True)
+        if events_path:
+            with open(events_path, "a") as writer:
+                writer.write(json.dumps(event) + "\n")
+    return on_event
+
+def binlog_available(cursor):
+    if BinLogStreamReader is None:
+        return False
+    cursor.execute("SELECT @@log_bin, @@binlog_format;")
+    log_bin, binlog_format = cursor.fetchone()
+    return bool(log_bin) and binlog_format == "ROW"
+
+def binlog_position(cursor):
+    """
+    Returns the current (log file, position), read before the initial load so
+    no change between the load and the stream is missed.
+    """
+    try:
+        cursor.execute("SHOW BINARY LOG STATUS;")
+    except mysql.connector.Error:
+        cursor.execute("SHOW MASTER STATUS;")
+    row = cursor.fetchone()
+    return row[0], row[1]
+
+def watch_binlog(tracker, log_file, log_pos, server_id):
+    """
+    Follows inventory and threshold row events from the binary log, blocking forever.
+    """
+    secrets = load_config()
+    stream = BinLogStreamReader(
+        connection_settings={"host": secrets["HOST"], "port": int(secrets.get("PORT") or 3306),
+                             "user": secrets["USER"], "passwd": secrets["PASSWORD"]},
+        server_id=server_id,
+        only_events=[WriteRowsEvent, UpdateRowsEvent, DeleteRowsEvent],
+        only_schemas=[secrets["DATABASE"]],
+        only_tables=list(INVENTORY_TABLES) + ["InventoryThresholds"],
+        log_file=log_file, log_pos=log_pos, resume_stream=True, blocking=True)
+    try:
+        for event in stream:
+            deleted = isinstance(event, DeleteRowsEvent)
+            for row in event.rows:
+                values = row["after_values"] if isinstance(event, UpdateRowsEvent) else row["values"]
+                if event.table == "InventoryThresholds":
+                    tracker.set_threshold((values["TableName"], values["ItemID"]),
+                                          None if deleted else values["Threshold"])
+                    continue
+                spec = INVENTORY_TABLES[event.table]
+                tracker.apply(event.table, values[spec["id"]], values[spec["item"]],
+                              None if deleted else values["QuantityOnHand"])
+    finally:
+        stream.close()
+
+def watch_changes(tracker, conn, last_change, interval=POLL_INTERVAL, grace=GAP_GRACE):
+    """
+    Follows the trigger-fed InventoryChanges table, blocking forever.
+
+    ChangeIDs missing between the rows read are kept as gaps and read again on
+    every poll until they appear or `grace` seconds pass. A gap that never
+    fills is a rolled-back insert.
+    """
+    cursor = conn.cursor()
+    gaps = {}
+    while True:
+        late = []
+        if gaps:
+            placeholders = ", ".join(["%s"] * len(gaps))
+            cursor.execute(f"""
+                SELECT ChangeID, TableName, RowID, ItemID, QuantityOnHand
+                FROM InventoryChanges WHERE ChangeID IN ({placeholders}) ORDER BY ChangeID;
+            """, list(gaps))
+            late = cursor.fetchall()
+        cursor.execute("""
+            SELECT ChangeID, TableName, RowID, ItemID, QuantityOnHand
+            FROM InventoryChanges WHERE ChangeID > %s ORDER BY ChangeID LIMIT 1000;
+        """, (last_change,))
+        changes = cursor.fetchall()
+        # End the read so the next one sees rows committed since
+        conn.commit()
+
+        now = time.monotonic()
+        for change_id, table, row_id, item, quantity in late:
+            tracker.apply(table, row_id, item, quantity)
+            del gaps[change_id]
+        for change_id, table, row_id, item, quantity in changes:
+            tracker.apply(table, row_id, item, quantity)
+            gaps.update(dict.fromkeys(range(max(last_change + 1, change_id - MAX_GAP), change_id),
+                                      now))
+            last_change = change_id
+        gaps = {change_id: seen for change_id, seen in gaps.items() if now - seen < grace}
+        if not changes:
+            time.sleep(interval)
+
+def watch(conn, source="auto", default_threshold=DEFAULT_THRESHOLD, events_path=None,
+          interval=POLL_INTERVAL, server_id=DEFAULT_SERVER_ID):
+    """
+    Loads current stock and follows changes until interrupted.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        source (str): "binlog", "triggers", or "auto" for binlog when available.
+        default_threshold (int): Threshold for items without their own.
+        events_path (str): Optional JSON Lines file for events.
+        interval (float): Seconds between reads of an empty change table.
+        server_id (int): Replica server id used when reading the binary log.
+    """
+    cursor = conn.cursor()
+    if source == "auto":
+        source = "binlog" if binlog_available(cursor) else "triggers"
+    if source == "binlog" and BinLogStreamReader is None:
+        raise RuntimeError("The binlog source needs the mysql-replication package")
+
+    if source == "binlog":
+        position = binlog_position(cursor)
+    else:
+        cursor.execute("SELECT COALESCE(MAX(ChangeID), 0) FROM InventoryChanges;")
+        position = cursor.fetchone()[0]
+
+    tracker = StockTracker(load_thresholds(cursor), default_threshold, event_printer(events_path))
+    tracker.load(cursor)
+    conn.commit()
+    cursor.close()
+    print(f"Watching {', '.join(INVENTORY_TABLES)} via {source}: "
+          f"{len(tracker.stock)} items, {len(tracker.low)} below threshold", flush=True)
+
+    if source == "binlog":
+        watch_binlog(tracker, position[0], position[1], server_id)
+    else:
+        watch_changes(tracker, conn, position, interval)
+
+def prune(conn, keep_hours):
+    """
+    Deletes change rows older than keep_hours in chunks.
+    """
+    cursor = conn.cursor()
+    deleted = 0
+    while True:
+        cursor.execute("DELETE FROM InventoryChanges "
+                       "WHERE ChangedAt < NOW() - INTERVAL %s HOUR LIMIT 10000;", (keep_hours,))
+        conn.commit()
+        deleted += cursor.rowcount
+        if cursor.rowcount < 10000:
+            break
+    cursor.close()
+    print(f"Pruned {deleted} change rows older than {keep_hours} hours.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inventory threshold alerts from change capture.")
+    parser.add_argument("command",
+                        choices=["install", "watch", "thresholds", "set-threshold", "prune"])
+    parser.add_argument("args", nargs="*", help="set-threshold: TABLE ITEM_ID THRESHOLD")
+    parser.add_argument("--triggers", action="store_true",
+                        help="install: also create the change table and triggers")
+    parser.add_argument("--source", choices=["auto", "binlog", "triggers"], default="auto")
+    parser.add_argument("--default-threshold", type=int, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--events", default=None, help="append events to this JSON Lines file")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="triggers source: seconds to wait when no changes are pending")
+    parser.add_argument("--server-id", type=int, default=DEFAULT_SERVER_ID,
+                        help="binlog source: unique replica server id")
+    parser.add_argument("--keep-hours", type=int, default=24)
+    args = parser.parse_args()
+
+    # DROP TRIGGER IF EXISTS and CREATE TABLE IF NOT EXISTS report notes when the
+    # objects are missing or already there, so install runs without raise_on_warnings
+    conn = get_connection() if args.command == "install" else reconnect_to_db()
+    try:
+        if args.command == "install":
+            install(conn, args.triggers)
+        elif args.command == "watch":
+            watch(conn, args.source, args.default_threshold, args.events, args.interval,
+                  args.server_id)
+        elif args.command == "thresholds":
+            cursor = conn.cursor()
+            for (table, item), threshold in sorted(load_thresholds(cursor).items()):
+                print(f"{table:<16} item {item:<6} threshold {threshold}")
+            cursor.close()
+        elif args.command == "set-threshold":
+            if len(args.args) != 3 or args.args[0] not in INVENTORY_TABLES:
+                sys.exit(f"set-threshold needs TABLE ITEM_ID THRESHOLD, TABLE one of "
+                         f"{', '.join(INVENTORY_TABLES)}")
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO InventoryThresholds (TableName, ItemID, Threshold)
+                VALUES (%s, %s, %s) AS new
+                ON DUPLICATE KEY UPDATE Threshold = new.Threshold;
+            """, (args.args[0], int(args.args[1]), int(args.args[2])))
+            conn.commit()
+            cursor.close()
+            print("Threshold saved.")
+        else:
+            prune(conn, args.keep_hours)
+    except KeyboardInterrupt:
+        print("Stopped.")
+    except (mysql.connector.Error, RuntimeError) as err:
+        print(f"Error: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
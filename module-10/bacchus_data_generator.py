@@ -0,0 +1,278 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Synthetic Data Generator
+
+Generates a deterministic, seedable Bacchus Winery dataset for every table in
+create_tables(), at sizes from thousands to tens of millions of rows, so queries
+and reports can be sized and benchmarked before production reaches those volumes.
+
+--rows sets the size of the history tables (EmployeeHours, SupplyShipment,
+WineOrders); lookup tables grow more slowly with it. IDs are written explicitly so
+foreign keys are always consistent, and orders and shipments are skewed so a few
+distributors, wines and suppliers account for most of the activity.
+
+Rows are streamed: either to <Table>.csv files that bacchus_bulk_import.py can load,
+or straight into the database in executemany() batches.
+
+Usage:
+    python bacchus_data_generator.py --rows 1000000 --seed 7 --out data/
+    python bacchus_data_generator.py --rows 100000 --to-db
+"""
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import argparse
+import bisect
+import csv
+import itertools
+import random
+
+DEFAULT_ROWS = 1000
+DEFAULT_SEED = 310
+DB_BATCH_SIZE = 5000
+
+# Dates the generated history runs up to
+END_DATE = date(2025, 5, 4)
+
+# Orders and shipments cover at least a year and at most five years of history;
+# larger row counts are packed more densely into that window instead of reaching
+# back past MySQL's DATE range or the partition limit
+MIN_SPAN_DAYS = 365
+MAX_SPAN_DAYS = 5 * 365
+
+FIRST_NAMES = ["Janet", "Roz", "Bob", "Henry", "Maria", "Stan", "Davis", "Alex",
+               "Priya", "Kenji", "Lucia", "Omar", "Grace", "Tomas", "Ines", "Wei"]
+LAST_NAMES = ["Collins", "Murphy", "Ulrich", "Doyle", "Costanza", "Bacchus", "Nguyen",
+              "Garcia", "Okafor", "Schmidt", "Rossi", "Kowalski", "Tanaka", "Silva"]
+DEPARTMENTS = ["Finance", "Marketing", "Production", "Distribution"]
+POSITIONS = ["Manager", "Assistant", "Specialist", "Technician", "Coordinator"]
+SUPPLY_TYPES = ["Bottles", "Corks", "Labels", "Boxes", "Vats", "Tubing"]
+WINES = [("Merlot", "Red"), ("Cabernet", "Red"), ("Chablis", "White"), ("Chardonnay", "White")]
+
+# Columns written for each table, in foreign-key load order
+TABLE_COLUMNS = {
+    "Department": ["DepartmentID", "Name"],
+    "Employee": ["EmployeeID", "Name", "DepartmentID", "Position"],
+    "EmployeeHours": ["RecordID", "EmployeeID", "Week", "HoursWorked"],
+    "SupplyType": ["SupplyTypeID", "Description"],
+    "Supplier": ["SupplierID", "Name"],
+    "SupplyShipment": ["ShipmentID", "SupplierID", "SupplyTypeID", "Quantity",
+                       "ExpectedDeliveryDate", "ActualDeliveryDate"],
+    "SupplyInventory": ["SupplyInventoryID", "SupplyTypeID", "QuantityOnHand", "LastUpdated"],
+    "Wine": ["WineID", "Name", "Type"],
+    "Distributor": ["DistributorID", "Name"],
+    "WineOrders": ["OrderID", "DistributorID", "WineID", "Quantity", "OrderDate",
+                   "ShipDate", "OrderStatus"],
+    "WineInventory": ["WineInventoryID", "WineID", "QuantityOnHand", "LastUpdated"],
+}
+
+def table_sizes(rows):
+    """
+    Returns the number of rows to generate per table for a given history size.
+    """
+    return {
+        "Department": max(len(DEPARTMENTS), round(rows ** 0.2)),
+        "Employee": max(5, rows // 50),
+        "EmployeeHours": rows,
+        "SupplyType": max(len(SUPPLY_TYPES), round(rows ** 0.33)),
+        "Supplier": max(3, round(rows ** 0.25)),
+        "SupplyShipment": rows,
+        "Wine": max(len(WINES), round(rows ** 0.33)),
+        "Distributor": max(6, round(rows ** 0.5)),
+        "WineOrders": rows,
+    }
+
+def skewed_picker(rng, count, skew=1.2):
+    """
+    Returns a function that picks an ID from 1..count with Zipf-like weights, so
+    the lowest IDs are chosen far more often than the rest.
+    """
+    cumulative = list(itertools.accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+    total = cumulative[-1]
+    return lambda: min(bisect.bisect(cumulative, rng.random() * total), count - 1) + 1
+
+def history_span(rows):
+    """
+    Returns how many days of order and shipment history to spread rows across.
+    """
+    return min(max(rows // 20, MIN_SPAN_DAYS), MAX_SPAN_DAYS)
+
+def person_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def generate_tables(rows=DEFAULT_ROWS, seed=DEFAULT_SEED):
+    """
+    Yields (table, row iterator) pairs for the full schema in foreign-key order.
+    Each table has its own seeded generator, so output is identical for the same
+    rows and seed regardless of which tables are consumed.
+
+    Args:
+        rows (int): Rows in each history table.
+        seed (int): Random seed.
+    """
+    sizes = table_sizes(rows)
+
+    def rng_for(table):
+        return random.Random(f"{seed}:{table}")
+
+    def departments(rng):
+        for i in range(1, sizes["Department"] + 1):
+            name = DEPARTMENTS[i - 1] if i <= len(DEPARTMENTS) else f"Department {i}"
+            yield (i, name)
+
+    def employees(rng):
+        for i in range(1, sizes["Employee"] + 1):
+            department = rng.randint(1, sizes["Department"])
+            yield (i, person_name(rng), department, rng.choice(POSITIONS))
+
+    def employee_hours(rng):
+        # Every employee gets one record per week, walking back through history
+        employee_count = sizes["Employee"]
+        weeks = (rows + employee_count - 1) // employee_count
+        first_week = END_DATE - timedelta(weeks=weeks - 1)
+        for i in range(rows):
+            week = first_week + timedelta(weeks=i // employee_count)
+            hours = round(min(max(rng.gauss(40, 4), 10), 60), 2)
+            yield (i + 1, i % employee_count + 1, week, hours)
+
+    def supply_types(rng):
+        for i in range(1, sizes["SupplyType"] + 1):
+            yield (i, SUPPLY_TYPES[i - 1] if i <= len(SUPPLY_TYPES) else f"Supply {i}")
+
+    def suppliers(rng):
+        for i in range(1, sizes["Supplier"] + 1):
+            yield (i, f"{rng.choice(LAST_NAMES)} Supply Co. {i}")
+
+    def supply_shipments(rng):
+        pick_supplier = skewed_picker(rng, sizes["Supplier"])
+        pick_type = skewed_picker(rng, sizes["SupplyType"], skew=0.8)
+        span = history_span(rows)
+        for i in range(1, rows + 1):
+            expected = END_DATE - timedelta(days=span * (rows - i) // rows)
+            roll = rng.random()
+            if expected > END_DATE - timedelta(days=14) and roll < 0.5:
+                actual = None
+            elif roll < 0.7:
+                actual = expected - timedelta(days=rng.randint(0, 2))
+            else:
+                actual = expected + timedelta(days=rng.randint(1, 10))
+            yield (i, pick_supplier(), pick_type(), rng.randint(50, 500), expected, actual)
+
+    def supply_inventory(rng):
+        for i in range(1, sizes["SupplyType"] + 1):
+            yield (i, i, rng.randint(0, 500), datetime.combine(END_DATE, datetime.min.time()))
+
+    def wines(rng):
+        for i in range(1, sizes["Wine"] + 1):
+            if i <= len(WINES):
+                yield (i, *WINES[i - 1])
+            else:
+                name, wine_type = rng.choice(WINES)
+                yield (i, f"{name} Reserve {i}", wine_type)
+
+    def distributors(rng):
+        for i in range(1, sizes["Distributor"] + 1):
+            yield (i, f"{rng.choice(LAST_NAMES)} Distributing {i}")
+
+    def wine_orders(rng):
+        pick_distributor = skewed_picker(rng, sizes["Distributor"])
+        pick_wine = skewed_picker(rng, sizes["Wine"], skew=1.0)
+        span = history_span(rows)
+        for i in range(1, rows + 1):
+            ordered = END_DATE - timedelta(days=span * (rows - i) // rows)
+            age = (END_DATE - ordered).days
+            if age < 7 and rng.random() < 0.6:
+                status, shipped = "Pending", None
+            else:
+                shipped = ordered + timedelta(days=rng.randint(0, 5))
+                status = "Shipped" if age < 30 else "Delivered"
+            yield (i, pick_distributor(), pick_wine(), rng.randint(10, 500) // 10 * 10,
+                   ordered, shipped, status)
+
+    def wine_inventory(rng):
+        for i in range(1, sizes["Wine"] + 1):
+            yield (i, i, rng.randint(0, 1000), datetime.combine(END_DATE, datetime.min.time()))
+
+    generators = {
+        "Department": departments,
+        "Employee": employees,
+        "EmployeeHours": employee_hours,
+        "SupplyType": supply_types,
+        "Supplier": suppliers,
+        "SupplyShipment": supply_shipments,
+        "SupplyInventory": supply_inventory,
+        "Wine": wines,
+        "Distributor": distributors,
+        "WineOrders": wine_orders,
+        "WineInventory": wine_inventory,
+    }
+    for table in TABLE_COLUMNS:
+        yield table, generators[table](rng_for(table))
+
+def write_csv_files(out_dir, rows=DEFAULT_ROWS, seed=DEFAULT_SEED):
+    """
+    Streams the generated dataset to one <Table>.csv file per table. NULLs are
+    written as empty fields, which bacchus_bulk_import.py loads as NULL.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for table, table_rows in generate_tables(rows, seed):
+        path = out_dir / f"{table}.csv"
+        count = 0
+        with open(path, "w", newline="", buffering=1024 * 1024) as writer:
+            csv_writer = csv.writer(writer, lineterminator="\n")
+            csv_writer.writerow(TABLE_COLUMNS[table])
+            for row in table_rows:
+                csv_writer.writerow(row)
+                count += 1
+        print(f"{table}: {count} rows written to {path}")
+
+def write_to_database(rows=DEFAULT_ROWS, seed=DEFAULT_SEED, batch_size=DB_BATCH_SIZE):
+    """
+    Streams the generated dataset into the database with executemany() batches,
+    committing after each batch.
+    """
+    # Imported here so generating files does not need the MySQL driver
+    import mysql.connector
+    from bacchus_bulk_import import connect
+
+    conn = connect()
+    cursor = conn.cursor()
+    try:
+        for table, table_rows in generate_tables(rows, seed):
+            columns = TABLE_COLUMNS[table]
+            query = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                     f"VALUES ({', '.join(['%s'] * len(columns))})")
+            count = 0
+            while True:
+                batch = list(itertools.islice(table_rows, batch_size))
+                if not batch:
+                    break
+                cursor.executemany(query, batch)
+                conn.commit()
+                count += len(batch)
+            print(f"{table}: {count} rows inserted")
+
+    except mysql.connector.Error as err:
+        print(f"Error: {err}")
+        conn.rollback()
+
+    cursor.close()
+    conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Bacchus Winery dataset.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS,
+                        help=f"rows per history table (default {DEFAULT_ROWS})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"random seed (default {DEFAULT_SEED})")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="directory to write <Table>.csv files to")
+    target.add_argument("--to-db", action="store_true", help="insert straight into the database")
+    args = parser.parse_args()
+
+    if args.to_db:
+        write_to_database(args.rows, args.seed)
+    else:
+        write_csv_files(args.out, args.rows, args.seed)
@@ -0,0 +1,224 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Secondary Indexes
+
+create_tables() only declares primary and foreign keys. This script declares the
+secondary and covering indexes the Module 11 reports need, applies any that are
+missing with online DDL (ALGORITHM=INPLACE, LOCK=NONE), and uses EXPLAIN to check
+every registered report:
+
+- A filtered report fails when its main table is read by a full table scan
+  (ALL) or a full index scan (index), or when the rows MySQL expects to examine
+  are close to every row of the table. A scan limited to the pruned partitions
+  of a partitioned table passes.
+- A report that reads every row by design must be listed in FULL_READ_REPORTS,
+  and a report in neither list fails, so new reports cannot go unchecked.
+
+Usage:
+    python bacchus_indexes.py list
+    python bacchus_indexes.py apply
+    python bacchus_indexes.py check
+"""
+
+from pathlib import Path
+import argparse
+import sys
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import reconnect_to_db
+
+# The report definitions live in the Module 11 folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "module-11"))
+from report_registry import REPORTS
+
+# (table, index name, columns). Covering indexes list every column the report
+# reads from the table, so MySQL can answer from the index alone.
+INDEXES = [
+    # Pending Wine Orders: WHERE OrderStatus = 'Pending', newest orders by date
+    ("WineOrders", "idx_wineorders_status_date",
+     ["OrderStatus", "OrderDate", "DistributorID", "WineID", "Quantity"]),
+    # Total Wine Ordered Per Distributor: GROUP BY DistributorID, SUM(Quantity)
+    ("WineOrders", "idx_wineorders_distributor_qty", ["DistributorID", "Quantity"]),
+    # Low Supply Inventory: WHERE QuantityOnHand < threshold
+    ("SupplyInventory", "idx_supplyinventory_qty", ["QuantityOnHand", "SupplyTypeID"]),
+    # Incremental inventory reports: WHERE LastUpdated >= watermark
+    ("SupplyInventory", "idx_supplyinventory_updated", ["LastUpdated"]),
+    ("WineInventory", "idx_wineinventory_updated", ["LastUpdated"]),
+    # Employee Weekly Hours: range reads by Week
+    ("EmployeeHours", "idx_employeehours_week", ["Week", "EmployeeID", "HoursWorked"]),
+]
+
+# Reports that filter their main table, and the table that must not be fully
+# scanned
+INDEX_CHECKS = {
+    "pending_wine_orders": "WineOrders",
+    "recent_employee_hours": "EmployeeHours",
+    "recent_wine_orders": "WineOrders",
+}
+
+# Reports that read every row of their main table by design, and why
+FULL_READ_REPORTS = {
+    "employee_weekly_hours": "lists every EmployeeHours row",
+    "wine_inventory": "lists every WineInventory row",
+    "low_supply_inventory": "reads SupplyStockLevels, one row per supply type; "
+                            "without the summaries idx_supplyinventory_qty serves it",
+    "late_supply_shipments": "compares the two delivery dates of each shipment, "
+                             "which an index on the dates cannot serve",
+    "supplier_performance": "reads the SupplierLateness histogram, sized by "
+                            "suppliers and days rather than shipments",
+    "supplier_performance_by_supplier": "the supplier_performance histogram, "
+                                        "grouped by supplier",
+    "supplier_performance_by_supply": "the supplier_performance histogram, "
+                                      "grouped by supply type",
+}
+
+# A plan expecting to examine at least this share of a table's rows counts as a
+# full scan, once the table has MIN_SCAN_CHECK_ROWS rows
+SCAN_FRACTION = 0.9
+MIN_SCAN_CHECK_ROWS = 1000
+
+def existing_indexes(cursor):
+    """
+    Returns a dict of (table, index name) to its column list for the current database.
+    """
+    cursor.execute("""
+        SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX;
+    """)
+    indexes = {}
+    for table, index, column in cursor.fetchall():
+        indexes.setdefault((table, index), []).append(column)
+    return indexes
+
+def index_statement(table, name, columns):
+    """
+    Returns the online DDL that adds one index.
+    """
+    return (f"ALTER TABLE {table} ADD INDEX {name} ({', '.join(columns)}), "
+            f"ALGORITHM=INPLACE, LOCK=NONE")
+
+def missing_index_statements(cursor):
+    """
+    Returns the DDL for every declared index that does not exist yet. An existing
+    index with different columns is reported and left alone.
+    """
+    existing = existing_indexes(cursor)
+    statements = []
+    for table, name, columns in INDEXES:
+        current = existing.get((table, name))
+        if current is None:
+            statements.append(index_statement(table, name, columns))
+        elif current != columns:
+            print(f"{table}.{name}: exists with columns {current}, expected {columns}; "
+                  f"drop it to rebuild")
+    return statements
+
+def apply_indexes(conn):
+    """
+    Creates every declared index that does not exist yet. Running it again is a no-op.
+    """
+    cursor = conn.cursor()
+    statements = missing_index_statements(cursor)
+    for statement in statements:
+        cursor.execute(statement)
+        print(statement)
+    if not statements:
+        print("All declared indexes are present.")
+    cursor.close()
+
+def table_statistics(cursor):
+    """
+    Returns {table: (estimated rows, partition count)} for the current database.
+    """
+    cursor.execute("""
+        SELECT TABLE_NAME, SUM(TABLE_ROWS), COUNT(PARTITION_NAME)
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+        GROUP BY TABLE_NAME;
+    """)
+    return {table: (int(rows or 0), partitions)
+            for table, rows, partitions in cursor.fetchall()}
+
+def plan_problem(step, table_rows, partition_count):
+    """
+    Returns why one EXPLAIN row reads too much of its table, or None.
+    """
+    partitions = step.get("partitions")
+    pruned = partitions is not None and len(partitions.split(",")) < partition_count
+    if step["type"] in ("ALL", "index") and not pruned:
+        return "FULL SCAN" if step["type"] == "ALL" else f"FULL INDEX SCAN of {step['key']}"
+    examined = int(step["rows"] or 0)
+    if table_rows >= MIN_SCAN_CHECK_ROWS and examined >= SCAN_FRACTION * table_rows:
+        return f"examines ~{examined} of {table_rows} rows via {step['type']} on {step['key']}"
+    return None
+
+def check_report_plans(conn):
+    """
+    Runs EXPLAIN on every registered report query and flags reports that scan
+    their main table (see the module docstring).
+
+    Returns:
+        list: Names of reports that failed the check.
+    """
+    cursor = conn.cursor()
+    statistics = table_statistics(cursor)
+    cursor.close()
+    cursor = conn.cursor(dictionary=True)
+    failures = []
+
+    for name, report in REPORTS.items():
+        if name in FULL_READ_REPORTS:
+            print(f"{name}: reads every row by design ({FULL_READ_REPORTS[name]})")
+            continue
+        table = INDEX_CHECKS.get(name)
+        if table is None:
+            failures.append(name)
+            print(f"{name}: no index check declared; add it to INDEX_CHECKS or FULL_READ_REPORTS")
+            continue
+        cursor.execute("EXPLAIN " + report["query"].strip().rstrip(";"),
+                       report["params"] or None)
+        plan = [row for row in cursor.fetchall() if row["table"] == table]
+        table_rows, partition_count = statistics.get(table, (0, 0))
+        problems = [problem for problem in (plan_problem(step, table_rows, partition_count)
+                                            for step in plan) if problem]
+        if not plan:
+            problems.append("table missing from the plan")
+        if problems:
+            failures.append(name)
+            print(f"{name}: {table} {'; '.join(problems)}")
+        else:
+            print(f"{name}: {table} read via {plan[0]['type']} on {plan[0]['key']}"
+                  + (f" (partitions {plan[0]['partitions']})" if plan[0].get("partitions") else ""))
+
+    cursor.close()
+    if failures:
+        print("Note: on very small tables the optimizer may prefer a scan even when "
+              "an index exists; re-check with realistic data.")
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage secondary indexes for the Bacchus schema.")
+    parser.add_argument("command", choices=["list", "apply", "check"])
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for table, name, columns in INDEXES:
+            print(f"{table:<16} {name:<34} ({', '.join(columns)})")
+        sys.exit(0)
+
+    conn = reconnect_to_db()
+    try:
+        if args.command == "apply":
+            apply_indexes(conn)
+        elif check_report_plans(conn):
+            sys.exit(1)
+    except mysql.connector.Error as err:
+        print(f"Error: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
@@ -0,0 +1,366 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Inventory Ledger
+
+SupplyInventory.QuantityOnHand and WineInventory.QuantityOnHand are values set
+by hand, not linked to what was delivered or shipped. This script keeps an
+append-only InventoryLedger instead. Each entry is one stock movement:
+
+- delivery: +Quantity of a supply type when a SupplyShipment has an
+  ActualDeliveryDate
+- order: -Quantity of a wine when a WineOrders row is Shipped or Delivered
+  with a ShipDate
+- adjustment: a manual correction, or a reconcile entry that lines the ledger
+  up with the hand-set snapshot values
+
+Entries are never updated or deleted. Corrections are new entries. Each entry
+also records the item's running Balance after it, in posting order.
+
+Reads never replay the whole ledger:
+- InventoryBalances holds the current balance per item. It is updated in the
+  same transaction as each posted entry, so current stock is one primary-key read.
+- InventoryCheckpoints stores each item's balance at checkpoint times, for
+  example from a nightly "checkpoint" run. Stock at a past time is the last
+  checkpoint before it plus the entries since, which is one short index range.
+  Posting an entry dated before an existing checkpoint removes that item's
+  later checkpoints, and the next checkpoint run recreates them.
+
+Movements are read from the hot tables only. bacchus_archive.py runs "post"
+itself before it moves orders and shipments out of them.
+
+Usage:
+    python bacchus_ledger.py install
+    python bacchus_ledger.py post
+    python bacchus_ledger.py reconcile --dry-run
+    python bacchus_ledger.py checkpoint
+    python bacchus_ledger.py stock Wine 3 --at "2025-03-01 00:00:00"
+    python bacchus_ledger.py adjust Supply 2 -15 --note "Damaged corks"
+"""
+
+from datetime import datetime
+from pathlib import Path
+import argparse
+import sys
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import get_connection, reconnect_to_db
+
+DEFAULT_CHUNK_SIZE = 5000
+ITEM_TYPES = ("Supply", "Wine")
+
+LEDGER_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS InventoryLedger (
+        EntryID BIGINT AUTO_INCREMENT PRIMARY KEY,
+        ItemType ENUM('Supply', 'Wine') NOT NULL,
+        ItemID INT NOT NULL,
+        Quantity INT NOT NULL,
+        Balance BIGINT NOT NULL,
+        Reason ENUM('delivery', 'order', 'adjustment') NOT NULL,
+        SourceID INT,
+        EffectiveAt DATETIME NOT NULL,
+        PostedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        Note VARCHAR(255),
+        UNIQUE KEY uq_inventoryledger_source (Reason, SourceID),
+        INDEX idx_inventoryledger_item_time (ItemType, ItemID, EffectiveAt, Quantity)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS InventoryBalances (
+        ItemType ENUM('Supply', 'Wine') NOT NULL,
+        ItemID INT NOT NULL,
+        Balance BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (ItemType, ItemID)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS InventoryCheckpoints (
+        ItemType ENUM('Supply', 'Wine') NOT NULL,
+        ItemID INT NOT NULL,
+        CheckpointAt DATETIME NOT NULL,
+        Balance BIGINT NOT NULL,
+        PRIMARY KEY (ItemType, ItemID, CheckpointAt)
+    );
+    """,
+]
+
+# Movement sources: rows after the last posted source id that are not yet in the
+# ledger, as (source id, item id, quantity, effective date), oldest key first.
+# Each chunk seeks past the one before it; the anti-join only keeps a re-run from
+# posting a movement twice.
+SOURCES = {
+    "delivery": {
+        "item_type": "Supply",
+        "sign": 1,
+        "query": """
+            SELECT s.ShipmentID, s.SupplyTypeID, s.Quantity, s.ActualDeliveryDate
+            FROM SupplyShipment s
+            LEFT JOIN InventoryLedger l ON l.Reason = 'delivery' AND l.SourceID = s.ShipmentID
+            WHERE s.ActualDeliveryDate IS NOT NULL AND s.SupplyTypeID IS NOT NULL
+              AND s.ShipmentID > %s AND l.EntryID IS NULL
+            ORDER BY s.ShipmentID
+            LIMIT %s;
+        """,
+    },
+    "order": {
+        "item_type": "Wine",
+        "sign": -1,
+        "query": """
+            SELECT o.OrderID, o.WineID, o.Quantity, o.ShipDate
+            FROM WineOrders o
+            LEFT JOIN InventoryLedger l ON l.Reason = 'order' AND l.SourceID = o.OrderID
+            WHERE o.OrderStatus IN ('Shipped', 'Delivered') AND o.ShipDate IS NOT NULL
+              AND o.WineID IS NOT NULL AND o.OrderID > %s AND l.EntryID IS NULL
+            ORDER BY o.OrderID
+            LIMIT %s;
+        """,
+    },
+}
+
+# Hand-set snapshot quantity per item, for reconcile
+SNAPSHOTS = {
+    "Supply": """
+        SELECT SupplyTypeID, SUM(QuantityOnHand) FROM SupplyInventory
+        WHERE SupplyTypeID IS NOT NULL GROUP BY SupplyTypeID;
+    """,
+    "Wine": """
+        SELECT WineID, SUM(QuantityOnHand) FROM WineInventory
+        WHERE WineID IS NOT NULL GROUP BY WineID;
+    """,
+}
+
+def install(conn):
+    cursor = conn.cursor()
+    for statement in LEDGER_TABLES:
+        cursor.execute(statement)
+    conn.commit()
+    cursor.close()
+    print("Ledger tables are ready.")
+
+def post_entries(cursor, entries):
+    """
+    Appends entries to the ledger and moves the running balances, in the
+    caller's transaction. Balance rows are locked first so concurrent posts to
+    the same item queue up instead of computing the same running balance.
+
+    Args:
+        cursor (mysql.connector.cursor.MySQLCursor): A cursor on the posting connection.
+        entries (list): (item type, item id, quantity, reason, source id,
+            effective at, note) tuples, with signed quantities.
+    """
+    items = sorted({(entry[0], entry[1]) for entry in entries})
+    cursor.executemany("""
+        INSERT INTO InventoryBalances (ItemType, ItemID, Balance) VALUES (%s, %s, 0)
+        ON DUPLICATE KEY UPDATE Balance = Balance;
+    """, items)
+    placeholders = ", ".join(["(%s, %s)"] * len(items))
+    cursor.execute(f"""
+        SELECT ItemType, ItemID, Balance FROM InventoryBalances
+        WHERE (ItemType, ItemID) IN ({placeholders}) FOR UPDATE;
+    """, [value for item in items for value in item])
+    balances = {(item_type, item_id): balance for item_type, item_id, balance in cursor.fetchall()}
+
+    rows = []
+    earliest = {}
+    for item_type, item_id, quantity, reason, source_id, effective_at, note in entries:
+        key = (item_type, item_id)
+        balances[key] += quantity
+        earliest[key] = min(earliest.get(key, effective_at), effective_at)
+        rows.append((item_type, item_id, quantity, balances[key], reason, source_id,
+                     effective_at, note))
+
+    cursor.executemany("""
+        INSERT INTO InventoryLedger
+            (ItemType, ItemID, Quantity, Balance, Reason, SourceID, EffectiveAt, Note)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+    """, rows)
+    cursor.executemany("UPDATE InventoryBalances SET Balance = %s WHERE ItemType = %s AND ItemID = %s;",
+                       [(balance, item_type, item_id)
+                        for (item_type, item_id), balance in balances.items()])
+    # Checkpoints at or after a backdated entry no longer hold the right balance
+    cursor.executemany("""
+        DELETE FROM InventoryCheckpoints
+        WHERE ItemType = %s AND ItemID = %s AND CheckpointAt >= %s;
+    """, [(item_type, item_id, effective_at)
+          for (item_type, item_id), effective_at in earliest.items()])
+
+def post_movements(conn, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Posts every delivery and shipped order not yet in the ledger, one chunk per
+    transaction. Running it again only posts new movements.
+    """
+    cursor = conn.cursor()
+    for reason, source in SOURCES.items():
+        posted = last_id = 0
+        while True:
+            cursor.execute(source["query"], (last_id, chunk_size))
+            movements = cursor.fetchall()
+            if not movements:
+                break
+            entries = [(source["item_type"], item_id, source["sign"] * (quantity or 0), reason,
+                        source_id, effective_at, None)
+                       for source_id, item_id, quantity, effective_at in movements]
+            try:
+                post_entries(cursor, entries)
+                conn.commit()
+            except mysql.connector.Error:
+                conn.rollback()
+                raise
+            posted += len(entries)
+            last_id = movements[-1][0]
+        print(f"{reason}: {posted} entries posted")
+    cursor.close()
+
+def adjust(conn, item_type, item_id, quantity, note=None):
+    cursor = conn.cursor()
+    try:
+        post_entries(cursor, [(item_type, item_id, quantity, "adjustment", None,
+                               datetime.now().replace(microsecond=0), note)])
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def reconcile(conn, dry_run=False):
+    """
+    Compares the ledger balances with the hand-set QuantityOnHand values and,
+    unless dry_run, posts an adjustment for each difference.
+
+    Returns:
+        int: The number of items that differed.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT ItemType, ItemID, Balance FROM InventoryBalances;")
+    balances = {(item_type, item_id): balance for item_type, item_id, balance in cursor.fetchall()}
+    entries = []
+    for item_type, query in SNAPSHOTS.items():
+        cursor.execute(query)
+        for item_id, quantity in cursor.fetchall():
+            difference = int(quantity or 0) - balances.get((item_type, item_id), 0)
+            if difference:
+                print(f"{item_type} {item_id}: ledger {balances.get((item_type, item_id), 0)}, "
+                      f"on hand {quantity} ({difference:+d})")
+                entries.append((item_type, item_id, difference, "adjustment", None,
+                                datetime.now().replace(microsecond=0), "Reconcile with QuantityOnHand"))
+    if entries and not dry_run:
+        try:
+            post_entries(cursor, entries)
+            conn.commit()
+        except mysql.connector.Error:
+            conn.rollback()
+            raise
+    cursor.close()
+    print(f"{len(entries)} items differ" + (" (dry run)" if dry_run else ""))
+    return len(entries)
+
+def create_checkpoints(conn, at=None):
+    """
+    Records every item's balance as of `at` (now by default). Each balance is the
+    item's previous checkpoint plus the entries since it, so a checkpoint run
+    reads only the entries since the last one.
+    """
+    at = at or datetime.now().replace(microsecond=0)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO InventoryCheckpoints (ItemType, ItemID, CheckpointAt, Balance)
+        SELECT * FROM (
+            SELECT b.ItemType, b.ItemID, %(at)s AS CheckpointAt,
+                   COALESCE(c.Balance, 0) + COALESCE((
+                       SELECT SUM(l.Quantity) FROM InventoryLedger l
+                       WHERE l.ItemType = b.ItemType AND l.ItemID = b.ItemID
+                         AND l.EffectiveAt <= %(at)s
+                         AND (c.CheckpointAt IS NULL OR l.EffectiveAt > c.CheckpointAt)
+                   ), 0) AS Balance
+            FROM InventoryBalances b
+            LEFT JOIN InventoryCheckpoints c
+              ON c.ItemType = b.ItemType AND c.ItemID = b.ItemID
+             AND c.CheckpointAt = (SELECT MAX(p.CheckpointAt) FROM InventoryCheckpoints p
+                                   WHERE p.ItemType = b.ItemType AND p.ItemID = b.ItemID
+                                     AND p.CheckpointAt < %(at)s)
+        ) AS new
+        ON DUPLICATE KEY UPDATE Balance = new.Balance;
+    """, {"at": at})
+    conn.commit()
+    cursor.close()
+    print(f"Checkpoint at {at} recorded.")
+
+def current_stock(cursor, item_type, item_id):
+    """
+    Returns the item's current balance with one primary-key read.
+    """
+    cursor.execute("SELECT Balance FROM InventoryBalances WHERE ItemType = %s AND ItemID = %s;",
+                   (item_type, item_id))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def stock_at(cursor, item_type, item_id, at):
+    """
+    Returns the item's balance as of `at`: the last checkpoint at or before it
+    plus the ledger entries between the two.
+    """
+    cursor.execute("""
+        SELECT CheckpointAt, Balance FROM InventoryCheckpoints
+        WHERE ItemType = %s AND ItemID = %s AND CheckpointAt <= %s
+        ORDER BY CheckpointAt DESC LIMIT 1;
+    """, (item_type, item_id, at))
+    checkpoint = cursor.fetchone()
+    since, balance = checkpoint if checkpoint else (None, 0)
+    cursor.execute("""
+        SELECT COALESCE(SUM(Quantity), 0) FROM InventoryLedger
+        WHERE ItemType = %s AND ItemID = %s AND EffectiveAt <= %s
+          AND (%s IS NULL OR EffectiveAt > %s);
+    """, (item_type, item_id, at, since, since))
+    return int(balance + cursor.fetchone()[0])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the Bacchus inventory ledger.")
+    parser.add_argument("command",
+                        choices=["install", "post", "reconcile", "checkpoint", "stock", "adjust"])
+    parser.add_argument("args", nargs="*",
+                        help="stock: TYPE ITEM_ID; adjust: TYPE ITEM_ID QUANTITY")
+    parser.add_argument("--at", type=datetime.fromisoformat, default=None,
+                        help="checkpoint or stock time (default: now)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="reconcile: only report differences")
+    parser.add_argument("--note", default=None, help="adjust: reason for the correction")
+    args = parser.parse_args()
+
+    expected = {"stock": 2, "adjust": 3}.get(args.command, 0)
+    if len(args.args) != expected or (expected and args.args[0] not in ITEM_TYPES):
+        sys.exit(f"{args.command} takes {expected} arguments; TYPE is one of {', '.join(ITEM_TYPES)}"
+                 if expected else f"{args.command} takes no arguments")
+
+    # CREATE TABLE IF NOT EXISTS reports a note when the tables are already there,
+    # so install runs without raise_on_warnings
+    conn = get_connection() if args.command == "install" else reconnect_to_db()
+    try:
+        if args.command == "install":
+            install(conn)
+        elif args.command == "post":
+            post_movements(conn, args.chunk_size)
+        elif args.command == "reconcile":
+            reconcile(conn, args.dry_run)
+        elif args.command == "checkpoint":
+            create_checkpoints(conn, args.at)
+        elif args.command == "adjust":
+            adjust(conn, args.args[0], int(args.args[1]), int(args.args[2]), args.note)
+            print("Adjustment posted.")
+        else:
+            cursor = conn.cursor()
+            item_type, item_id = args.args[0], int(args.args[1])
+            if args.at:
+                print(f"{item_type} {item_id} at {args.at}: "
+                      f"{stock_at(cursor, item_type, item_id, args.at)}")
+            else:
+                print(f"{item_type} {item_id}: {current_stock(cursor, item_type, item_id)}")
+            cursor.close()
+    except mysql.connector.Error as err:
+        print(f"Error: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
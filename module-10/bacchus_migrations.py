@@ -0,0 +1,378 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Schema Migrations
+
+Versioned migrations for the Bacchus schema. create_tables() can only create
+missing tables; this script applies numbered up/down steps and records each
+applied version in a schema_version table.
+
+Each step is one of:
+- an SQL string, run as-is
+- a function taking a cursor and returning the SQL strings to run
+- a {"table": ..., "alter": ...} table change. Normally this is a plain
+  ALTER TABLE; with --online it is applied to a shadow copy of the table
+  that is filled in primary-key chunks while triggers mirror concurrent
+  writes, then swapped in with an atomic RENAME TABLE. The table's own
+  triggers move to the copy under a brief write lock just before the swap.
+  This keeps large tables such as WineOrders and EmployeeHours writable
+  during a deploy. Steps that return SQL from a function run as given, so a
+  migration whose functions cannot be applied online (migration 4, which
+  partitions tables) sets "offline" and is refused with --online.
+
+--dry-run prints the planned DDL without running anything.
+
+Usage:
+    python bacchus_migrations.py status
+    python bacchus_migrations.py up --dry-run
+    python bacchus_migrations.py up --online --chunk-size 20000
+    python bacchus_migrations.py down --to 2
+"""
+
+from pathlib import Path
+import argparse
+import re
+import sys
+import time
+
+import mysql.connector
+
+from bacchus_indexes import INDEXES, existing_indexes, missing_index_statements
+from bacchus_partitions import partition_statements, unpartition_statements
+from jjenkins_module_10_1_mysql_table_creation_script import TABLE_DEFINITIONS
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import get_connection
+
+DEFAULT_CHUNK_SIZE = 10000
+
+TABLE_NAMES = [re.search(r"CREATE TABLE IF NOT EXISTS (\w+)", ddl).group(1)
+               for ddl in TABLE_DEFINITIONS]
+
+ORDER_STATUSES = ("Pending", "Shipped", "Delivered")
+
+def drop_declared_indexes(cursor):
+    """
+    Returns the DDL that drops every declared index that exists. When the index
+    is the only one that can back a foreign key, a plain index on the key column
+    is added in the same statement so the foreign key keeps an index.
+    """
+    existing = existing_indexes(cursor)
+    cursor.execute("""
+        SELECT TABLE_NAME, COLUMN_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL;
+    """)
+    foreign_keys = set(cursor.fetchall())
+
+    statements = []
+    for table, name, columns in INDEXES:
+        if (table, name) not in existing:
+            continue
+        statement = f"ALTER TABLE {table} DROP INDEX {name}"
+        first = columns[0]
+        other_index = any(t == table and index != name and cols[0] == first
+                          for (t, index), cols in existing.items())
+        if (table, first) in foreign_keys and not other_index:
+            statement += f", ADD INDEX {first} ({first})"
+        statements.append(statement)
+    return statements
+
+def drop_delivery_index(cursor):
+    """
+    Returns the DDL that drops idx_supplyshipment_delivery where migration 2
+    created it. Late Supply Shipments compares the two dates of each row, so
+    the index was never used.
+    """
+    if ("SupplyShipment", "idx_supplyshipment_delivery") not in existing_indexes(cursor):
+        return []
+    return ["ALTER TABLE SupplyShipment DROP INDEX idx_supplyshipment_delivery"]
+
+# ----------------------
+# Migrations, in version order
+# ----------------------
+MIGRATIONS = [
+    {
+        "version": 1,
+        "description": "Baseline Bacchus schema from create_tables()",
+        "up": TABLE_DEFINITIONS,
+        "down": [f"DROP TABLE IF EXISTS {table}" for table in reversed(TABLE_NAMES)],
+    },
+    {
+        "version": 2,
+        "description": "Secondary indexes for the report queries",
+        "up": [missing_index_statements],
+        "down": [drop_declared_indexes],
+    },
+    {
+        "version": 3,
+        "description": "Store WineOrders.OrderStatus as a one-byte ENUM",
+        # Any row returned here would not fit the new column type
+        "check": "SELECT DISTINCT OrderStatus FROM WineOrders WHERE OrderStatus NOT IN ({})"
+                 .format(", ".join(f"'{status}'" for status in ORDER_STATUSES)),
+        "up": [{"table": "WineOrders",
+                "alter": "MODIFY OrderStatus ENUM({})".format(
+                    ", ".join(f"'{status}'" for status in ORDER_STATUSES))}],
+        "down": [{"table": "WineOrders", "alter": "MODIFY OrderStatus VARCHAR(100)"}],
+    },
+    {
+        "version": 4,
+        "description": "Partition EmployeeHours and WineOrders by month",
+        # The partition column becomes part of the primary key, so it cannot be NULL
+        "check": "SELECT 'EmployeeHours', COUNT(*) FROM EmployeeHours WHERE Week IS NULL "
+                 "HAVING COUNT(*) > 0 UNION ALL "
+                 "SELECT 'WineOrders', COUNT(*) FROM WineOrders WHERE OrderDate IS NULL "
+                 "HAVING COUNT(*) > 0",
+        "up": [partition_statements],
+        "down": [unpartition_statements],
+        # The shadow copy re-adds the table's foreign keys, which a partitioned
+        # table cannot hold, so these ALTERs always run in place
+        "offline": "partitioning rebuilds each table with a blocking ALTER TABLE; "
+                   "run it in a maintenance window without --online",
+    },
+    {
+        "version": 5,
+        "description": "Drop the unused SupplyShipment delivery date index",
+        "up": [drop_delivery_index],
+        # Nothing reads the index, so going back down leaves it dropped
+        "down": [],
+    },
+]
+
+def ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+def current_version(cursor):
+    """
+    Returns the highest applied migration version, or 0 if none has been applied.
+    """
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'schema_version';
+    """)
+    if cursor.fetchone()[0] == 0:
+        return 0
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version;")
+    return cursor.fetchone()[0]
+
+def run_ddl(cursor, statement, dry_run):
+    print(statement.strip() + ";")
+    if not dry_run:
+        cursor.execute(statement)
+
+def table_layout(cursor, table):
+    """
+    Returns the table's leading primary key column, its columns in order, and its
+    foreign keys as (column, referenced table, referenced column) tuples. The
+    partitioned tables have an (id, date) primary key; chunking on the
+    auto-increment id still visits every row once.
+    """
+    cursor.execute("""
+        SELECT COLUMN_NAME, COLUMN_KEY FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION;
+    """, (table,))
+    rows = cursor.fetchall()
+    columns = [name for name, _ in rows]
+    primary = [name for name, key in rows if key == "PRI"]
+    if not primary:
+        raise ValueError(f"Online changes need a primary key on {table}")
+
+    cursor.execute("""
+        SELECT COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+          AND REFERENCED_TABLE_NAME IS NOT NULL;
+    """, (table,))
+    return primary[0], columns, cursor.fetchall()
+
+def online_alter(conn, cursor, table, alter, dry_run, chunk_size, pause):
+    """
+    Applies an ALTER to a shadow copy of the table, copies rows across in
+    primary-key chunks while triggers mirror concurrent writes, then swaps the
+    tables with an atomic RENAME TABLE.
+    """
+    shadow, old = f"_{table}_new", f"_{table}_old"
+    primary, columns, foreign_keys = table_layout(cursor, table)
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{column}" for column in columns)
+
+    run_ddl(cursor, f"DROP TABLE IF EXISTS {shadow}", dry_run)
+    run_ddl(cursor, f"CREATE TABLE {shadow} LIKE {table}", dry_run)
+    run_ddl(cursor, f"ALTER TABLE {shadow} {alter}", dry_run)
+    for column, ref_table, ref_column in foreign_keys:
+        run_ddl(cursor, f"ALTER TABLE {shadow} ADD FOREIGN KEY ({column}) "
+                        f"REFERENCES {ref_table}({ref_column})", dry_run)
+
+    triggers = {
+        f"{shadow}_ins": f"AFTER INSERT ON {table} FOR EACH ROW "
+                         f"REPLACE INTO {shadow} ({column_list}) VALUES ({new_values})",
+        f"{shadow}_upd": f"AFTER UPDATE ON {table} FOR EACH ROW "
+                         f"REPLACE INTO {shadow} ({column_list}) VALUES ({new_values})",
+        f"{shadow}_del": f"AFTER DELETE ON {table} FOR EACH ROW "
+                         f"DELETE FROM {shadow} WHERE {primary} = OLD.{primary}",
+    }
+    for name, body in triggers.items():
+        run_ddl(cursor, f"DROP TRIGGER IF EXISTS {name}", dry_run)
+        run_ddl(cursor, f"CREATE TRIGGER {name} {body}", dry_run)
+
+    # Rows already mirrored by a trigger are newer, so the copy skips their keys.
+    # A plain INSERT (not INSERT IGNORE) keeps strict mode on: a value that does
+    # not fit the altered column stops the migration instead of becoming '' or 0.
+    copy = (f"INSERT INTO {shadow} ({column_list}) SELECT {column_list} "
+            f"FROM {table} WHERE {primary} >= %s AND {primary} < %s "
+            f"AND NOT EXISTS (SELECT 1 FROM {shadow} mirrored "
+            f"WHERE mirrored.{primary} = {table}.{primary})")
+    if dry_run:
+        print(f"-- copy {table} into {shadow} in chunks of {chunk_size} rows by {primary}:")
+        print(f"{copy};")
+    else:
+        cursor.execute(f"SELECT MIN({primary}), MAX({primary}) FROM {table};")
+        low, high = cursor.fetchone()
+        copied = 0
+        if low is not None:
+            for start in range(low, high + 1, chunk_size):
+                cursor.execute(copy, (start, start + chunk_size))
+                conn.commit()
+                copied += cursor.rowcount
+                if pause:
+                    time.sleep(pause)
+        print(f"-- copied {copied} rows into {shadow}")
+
+    # Other triggers (such as the summary table triggers) would stay with the
+    # renamed original table. They move to the shadow table before the swap,
+    # with both tables write-locked, so no write runs between the move and the
+    # rename and every write fires them exactly once.
+    cursor.execute("""
+        SELECT TRIGGER_NAME, ACTION_TIMING, EVENT_MANIPULATION, ACTION_STATEMENT
+        FROM information_schema.TRIGGERS
+        WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE = %s
+        ORDER BY ACTION_ORDER;
+    """, (table,))
+    kept_triggers = [row for row in cursor.fetchall() if row[0] not in triggers]
+
+    run_ddl(cursor, f"LOCK TABLES {table} WRITE, {shadow} WRITE", dry_run)
+    try:
+        for name in triggers:
+            run_ddl(cursor, f"DROP TRIGGER IF EXISTS {name}", dry_run)
+        for name, timing, event, action in kept_triggers:
+            run_ddl(cursor, f"DROP TRIGGER {name}", dry_run)
+            run_ddl(cursor, f"CREATE TRIGGER {name} {timing} {event} ON {shadow} "
+                            f"FOR EACH ROW {action}", dry_run)
+        run_ddl(cursor, f"RENAME TABLE {table} TO {old}, {shadow} TO {table}", dry_run)
+    finally:
+        run_ddl(cursor, "UNLOCK TABLES", dry_run)
+    run_ddl(cursor, f"DROP TABLE {old}", dry_run)
+
+def run_steps(conn, cursor, steps, dry_run, online, chunk_size, pause):
+    for step in steps:
+        if callable(step):
+            for statement in step(cursor):
+                run_ddl(cursor, statement, dry_run)
+        elif isinstance(step, dict):
+            if online:
+                online_alter(conn, cursor, step["table"], step["alter"],
+                             dry_run, chunk_size, pause)
+            else:
+                run_ddl(cursor, f"ALTER TABLE {step['table']} {step['alter']}", dry_run)
+        else:
+            run_ddl(cursor, step, dry_run)
+
+def migrate(conn, target=None, dry_run=False, online=False, chunk_size=DEFAULT_CHUNK_SIZE,
+            pause=0.0):
+    """
+    Moves the schema up or down to the target version (the latest by default).
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        target (int): The version to end at.
+        dry_run (bool): Print the planned DDL without running it.
+        online (bool): Apply table changes through a shadow table and chunked copy.
+            Migrations marked "offline" are refused instead of run as blocking ALTERs.
+        chunk_size (int): Rows per copy chunk in online mode.
+        pause (float): Seconds to sleep between chunks, to limit load and replication lag.
+    """
+    cursor = conn.cursor()
+    version = current_version(cursor)
+    target = MIGRATIONS[-1]["version"] if target is None else target
+    if online:
+        for migration in MIGRATIONS:
+            low, high = sorted((version, target))
+            if low < migration["version"] <= high and migration.get("offline"):
+                raise ValueError(f"Migration {migration['version']} cannot run with --online: "
+                                 f"{migration['offline']}")
+    if not dry_run:
+        ensure_version_table(cursor)
+
+    if target >= version:
+        for migration in MIGRATIONS:
+            if not version < migration["version"] <= target:
+                continue
+            print(f"-- up {migration['version']}: {migration['description']}")
+            # In a dry run from an empty database the checked tables do not exist yet
+            if migration.get("check") and not (dry_run and version == 0):
+                cursor.execute(migration["check"])
+                bad = cursor.fetchall()
+                if bad:
+                    raise ValueError(f"Migration {migration['version']} blocked by rows: {bad}")
+            run_steps(conn, cursor, migration["up"], dry_run, online, chunk_size, pause)
+            if not dry_run:
+                cursor.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                               (migration["version"], migration["description"]))
+                conn.commit()
+    else:
+        for migration in reversed(MIGRATIONS):
+            if not target < migration["version"] <= version:
+                continue
+            print(f"-- down {migration['version']}: {migration['description']}")
+            run_steps(conn, cursor, migration["down"], dry_run, online, chunk_size, pause)
+            if not dry_run:
+                cursor.execute("DELETE FROM schema_version WHERE version = %s",
+                               (migration["version"],))
+                conn.commit()
+
+    cursor.close()
+    print(f"Schema version: {version} -> {target}" + (" (dry run)" if dry_run else ""))
+
+def print_status(conn):
+    cursor = conn.cursor()
+    version = current_version(cursor)
+    cursor.close()
+    for migration in MIGRATIONS:
+        mark = "applied" if migration["version"] <= version else "pending"
+        print(f"{migration['version']:>3}  {mark:<8} {migration['description']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply versioned Bacchus schema migrations.")
+    parser.add_argument("command", choices=["status", "up", "down"])
+    parser.add_argument("--to", type=int, help="target version (default: latest for up)")
+    parser.add_argument("--dry-run", action="store_true", help="print the planned DDL only")
+    parser.add_argument("--online", action="store_true",
+                        help="apply table changes via shadow table and chunked copy")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--pause", type=float, default=0.0,
+                        help="seconds to sleep between copy chunks")
+    args = parser.parse_args()
+
+    if args.command == "down" and args.to is None:
+        sys.exit("down needs --to VERSION")
+
+    # No raise_on_warnings: DROP ... IF EXISTS and CREATE TABLE IF NOT EXISTS
+    # report already-absent or existing objects as notes
+    conn = get_connection()
+    try:
+        if args.command == "status":
+            print_status(conn)
+        else:
+            migrate(conn, args.to, args.dry_run, args.online, args.chunk_size, args.pause)
+    except (mysql.connector.Error, ValueError) as err:
+        print(f"Error: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
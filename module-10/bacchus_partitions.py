@@ -0,0 +1,388 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Date Partitioning
+
+EmployeeHours and WineOrders grow by date and are mostly read and purged by
+date. Migration 4 in bacchus_migrations.py partitions them by RANGE COLUMNS on
+Week and OrderDate, one partition per month, with a trailing MAXVALUE partition
+to catch anything past the last boundary. This script keeps those partitions
+maintained:
+
+- maintain adds partitions for upcoming periods by splitting the empty MAXVALUE
+  partition, and with --retain drops partitions older than the retention window.
+  With --archive an expired partition is first swapped into its own table with
+  EXCHANGE PARTITION, so purging a month is a metadata change, not a DELETE.
+  WineOrders rows are then copied into WineOrdersArchive (run
+  bacchus_archive.py install first), so the WineOrdersAll view and
+  --include-archive still read them; EmployeeHours, which has no archive
+  table, keeps an EmployeeHoursArchive_<partition> table per month.
+  Dropped and exchanged partitions do not fire DELETE triggers, so the
+  installed summaries of a purged table (see bacchus_summaries.py) are rebuilt
+  afterwards.
+- check runs EXPLAIN on the date-window reports and prints which partitions
+  each one reads.
+
+MySQL does not allow foreign keys on partitioned tables and needs the partition
+column in every unique key, so migration 4 drops the two tables' foreign keys
+and widens their primary keys to (id, date).
+
+Usage:
+    python bacchus_partitions.py list
+    python bacchus_partitions.py maintain --ahead 3
+    python bacchus_partitions.py maintain --retain 24 --archive --dry-run
+    python bacchus_partitions.py check
+"""
+
+from datetime import date
+from pathlib import Path
+import argparse
+import sys
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import reconnect_to_db
+
+from bacchus_archive import ARCHIVED_TABLES, sync_archive, table_columns
+from bacchus_summaries import rebuild, summaries_for
+
+# The report definitions live in the Module 11 folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "module-11"))
+from report_registry import REPORTS
+
+DEFAULT_AHEAD = 3
+
+# Partitioned table -> its date column, id column, partition period and the
+# foreign keys from create_tables() that partitioning removes
+PARTITIONED_TABLES = {
+    "EmployeeHours": {
+        "column": "Week",
+        "id": "RecordID",
+        "period": "month",
+        "foreign_keys": [("EmployeeID", "Employee", "EmployeeID")],
+    },
+    "WineOrders": {
+        "column": "OrderDate",
+        "id": "OrderID",
+        "period": "month",
+        "foreign_keys": [("DistributorID", "Distributor", "DistributorID"),
+                         ("WineID", "Wine", "WineID")],
+    },
+}
+
+# Reports that filter a partitioned table on a date window
+PRUNING_CHECKS = {
+    "recent_employee_hours": "EmployeeHours",
+    "recent_wine_orders": "WineOrders",
+}
+
+def period_start(day, period):
+    """
+    Returns the first day of the month or year containing day.
+    """
+    return date(day.year, 1, 1) if period == "year" else date(day.year, day.month, 1)
+
+def next_period(start, period):
+    """
+    Returns the first day of the month or year after start.
+    """
+    if period == "year":
+        return date(start.year + 1, 1, 1)
+    return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+def partition_name(start, period):
+    return f"p{start.year}" if period == "year" else f"p{start.year}_{start.month:02d}"
+
+def partition_definition(start, period):
+    """
+    Returns the partition clause for the period beginning at start.
+    """
+    bound = next_period(start, period)
+    return f"PARTITION {partition_name(start, period)} VALUES LESS THAN ('{bound.isoformat()}')"
+
+def partition_definitions(first, last, period):
+    """
+    Returns partition clauses covering every period from first through last.
+    """
+    definitions = []
+    start = period_start(first, period)
+    while start <= last:
+        definitions.append(partition_definition(start, period))
+        start = next_period(start, period)
+    return definitions
+
+def existing_partitions(cursor, table):
+    """
+    Returns the table's partitions in order as (name, upper bound) tuples. The
+    bound is a date, or None for the MAXVALUE partition. An unpartitioned table
+    returns an empty list.
+    """
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION;
+    """, (table,))
+    partitions = []
+    for name, description in cursor.fetchall():
+        bound = None if description == "MAXVALUE" else date.fromisoformat(description.strip("'"))
+        partitions.append((name, bound))
+    return partitions
+
+def foreign_key_names(cursor, table):
+    cursor.execute("""
+        SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = %s;
+    """, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+def partition_statements(cursor, ahead=DEFAULT_AHEAD, today=None):
+    """
+    Returns the DDL that partitions each table in PARTITIONED_TABLES, with one
+    partition per period from the oldest row through `ahead` periods from today.
+    Tables that are already partitioned are skipped. Used by migration 4.
+    """
+    today = today or date.today()
+    statements = []
+    for table, spec in PARTITIONED_TABLES.items():
+        if existing_partitions(cursor, table):
+            continue
+        column, period = spec["column"], spec["period"]
+        cursor.execute(f"SELECT MIN({column}) FROM {table};")
+        oldest = cursor.fetchone()[0] or today
+        last = period_start(today, period)
+        for _ in range(ahead):
+            last = next_period(last, period)
+
+        changes = [f"DROP FOREIGN KEY {name}" for name in foreign_key_names(cursor, table)]
+        changes += [f"MODIFY {column} DATE NOT NULL",
+                    f"DROP PRIMARY KEY, ADD PRIMARY KEY ({spec['id']}, {column})"]
+        statements.append(f"ALTER TABLE {table} " + ", ".join(changes))
+
+        definitions = partition_definitions(oldest, last, period)
+        definitions.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+        statements.append(f"ALTER TABLE {table} PARTITION BY RANGE COLUMNS ({column}) (\n    "
+                          + ",\n    ".join(definitions) + "\n)")
+    return statements
+
+def unpartition_statements(cursor):
+    """
+    Returns the DDL that reverses partition_statements(): removes partitioning
+    and restores the original primary and foreign keys.
+    """
+    statements = []
+    for table, spec in PARTITIONED_TABLES.items():
+        if not existing_partitions(cursor, table):
+            continue
+        statements.append(f"ALTER TABLE {table} REMOVE PARTITIONING")
+        changes = [f"DROP PRIMARY KEY, ADD PRIMARY KEY ({spec['id']})",
+                   f"MODIFY {spec['column']} DATE NULL"]
+        changes += [f"ADD FOREIGN KEY ({column}) REFERENCES {parent}({parent_column})"
+                    for column, parent, parent_column in spec["foreign_keys"]]
+        statements.append(f"ALTER TABLE {table} " + ", ".join(changes))
+    return statements
+
+def upcoming_partition_statement(cursor, table, ahead=DEFAULT_AHEAD, today=None):
+    """
+    Returns the DDL that adds partitions up to `ahead` periods past today by
+    splitting the MAXVALUE partition, or None if they already exist.
+    """
+    spec = PARTITIONED_TABLES[table]
+    period = spec["period"]
+    partitions = existing_partitions(cursor, table)
+    if not partitions:
+        raise ValueError(f"{table} is not partitioned; run bacchus_migrations.py up first")
+    bounds = [bound for _, bound in partitions if bound is not None]
+    maxvalue = [name for name, bound in partitions if bound is None]
+
+    last = period_start(today or date.today(), period)
+    for _ in range(ahead):
+        last = next_period(last, period)
+    # The last bounded partition ends just before its bound, so the next one starts there
+    first = max(bounds) if bounds else period_start(today or date.today(), period)
+    definitions = partition_definitions(first, last, period) if first <= last else []
+    if not definitions:
+        return None
+    if not maxvalue:
+        return f"ALTER TABLE {table} ADD PARTITION ({', '.join(definitions)})"
+    definitions.append(f"PARTITION {maxvalue[0]} VALUES LESS THAN (MAXVALUE)")
+    return (f"ALTER TABLE {table} REORGANIZE PARTITION {maxvalue[0]} INTO (\n    "
+            + ",\n    ".join(definitions) + "\n)")
+
+def expired_partitions(cursor, table, retain, today=None):
+    """
+    Returns the names of partitions whose whole range is older than the last
+    `retain` periods.
+    """
+    period = PARTITIONED_TABLES[table]["period"]
+    cutoff = period_start(today or date.today(), period)
+    for _ in range(retain):
+        cutoff = date(cutoff.year - 1, 1, 1) if period == "year" else (
+            date(cutoff.year - (cutoff.month == 1), (cutoff.month - 2) % 12 + 1, 1))
+    return [name for name, bound in existing_partitions(cursor, table)
+            if bound is not None and bound <= cutoff]
+
+def archive_columns(cursor, table, dry_run=False):
+    """
+    Returns the column list for copying a table's exchanged partitions into its
+    bacchus_archive.py archive table, or None for a table without one.
+
+    Raises:
+        ValueError: If the archive table has not been installed.
+    """
+    if table not in ARCHIVED_TABLES:
+        return None
+    archive = ARCHIVED_TABLES[table]["archive"]
+    if not table_columns(cursor, archive):
+        raise ValueError(f"{archive} not found; run bacchus_archive.py install first")
+    if dry_run:
+        return ", ".join(name for name, _ in table_columns(cursor, table))
+    return sync_archive(cursor, table)
+
+def archive_statements(table, partition, column_list=None):
+    """
+    Returns the DDL that moves one partition's rows into a table of their own
+    with EXCHANGE PARTITION and then drops the emptied partition. With the
+    column list from archive_columns() the rows are then copied into the
+    table's archive table and the exchanged table is dropped.
+    """
+    exchanged = f"{table}Archive_{partition}"
+    statements = [
+        f"CREATE TABLE {exchanged} LIKE {table}",
+        f"ALTER TABLE {exchanged} REMOVE PARTITIONING",
+        f"ALTER TABLE {table} EXCHANGE PARTITION {partition} WITH TABLE {exchanged}",
+        f"ALTER TABLE {table} DROP PARTITION {partition}",
+    ]
+    if column_list:
+        statements += [
+            f"INSERT INTO {ARCHIVED_TABLES[table]['archive']} ({column_list}) "
+            f"SELECT {column_list} FROM {exchanged}",
+            f"DROP TABLE {exchanged}",
+        ]
+    return statements
+
+def maintain_partitions(conn, ahead=DEFAULT_AHEAD, retain=None, archive=False, dry_run=False):
+    """
+    Adds upcoming partitions to every partitioned table and, when a retention is
+    given, drops (or archives, then drops) the partitions that have expired.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        ahead (int): Periods past the current one that must have a partition.
+        retain (int): Periods of history to keep; None keeps everything.
+        archive (bool): Move expired partitions into archive tables before dropping.
+        dry_run (bool): Print the planned DDL without running it.
+    """
+    cursor = conn.cursor()
+    purged = []
+    for table in PARTITIONED_TABLES:
+        statements = []
+        upcoming = upcoming_partition_statement(cursor, table, ahead)
+        if upcoming:
+            statements.append(upcoming)
+        if retain is not None:
+            expired = expired_partitions(cursor, table, retain)
+            column_list = archive_columns(cursor, table, dry_run) if archive and expired else None
+            for partition in expired:
+                if archive:
+                    statements.extend(archive_statements(table, partition, column_list))
+                else:
+                    statements.append(f"ALTER TABLE {table} DROP PARTITION {partition}")
+                purged.append(table)
+        if not statements:
+            print(f"{table}: partitions are up to date.")
+        for statement in statements:
+            print(statement + ";")
+            if not dry_run:
+                cursor.execute(statement)
+    if not dry_run:
+        conn.commit()
+
+    summaries = installed_summaries(cursor, purged)
+    cursor.close()
+    if summaries:
+        print(f"-- rebuild {', '.join(summaries)}")
+        if not dry_run:
+            rebuild(conn, summaries)
+
+def installed_summaries(cursor, tables):
+    """
+    Returns the installed summary tables aggregated from any of the given tables.
+    """
+    names = sorted({name for table in tables for name in summaries_for(table)})
+    if not names:
+        return []
+    cursor.execute(f"""
+        SELECT TABLE_NAME FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({", ".join(["%s"] * len(names))});
+    """, names)
+    installed = {row[0] for row in cursor.fetchall()}
+    return [name for name in names if name in installed]
+
+def print_partitions(conn):
+    cursor = conn.cursor()
+    for table in PARTITIONED_TABLES:
+        partitions = existing_partitions(cursor, table)
+        if not partitions:
+            print(f"{table}: not partitioned")
+            continue
+        cursor.execute("""
+            SELECT PARTITION_NAME, TABLE_ROWS FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s;
+        """, (table,))
+        rows = dict(cursor.fetchall())
+        for name, bound in partitions:
+            print(f"{table:<14} {name:<10} < {bound or 'MAXVALUE'!s:<10} ~{rows.get(name, 0)} rows")
+    cursor.close()
+
+def check_pruning(conn):
+    """
+    Runs EXPLAIN on each date-window report and prints the partitions it reads.
+
+    Returns:
+        list: Names of reports that read every partition of their table.
+    """
+    cursor = conn.cursor()
+    # existing_partitions() unpacks tuples; only the EXPLAIN rows are read by column name
+    explain = conn.cursor(dictionary=True)
+    failures = []
+    for name, table in PRUNING_CHECKS.items():
+        report = REPORTS[name]
+        total = len(existing_partitions(cursor, table))
+        explain.execute("EXPLAIN " + report["query"].strip().rstrip(";"), report["params"] or None)
+        plan = [row for row in explain.fetchall() if row["table"] == table]
+        partitions = (plan[0].get("partitions") or "") if plan else ""
+        read = len(partitions.split(",")) if partitions else 0
+        if total > 1 and read >= total:
+            failures.append(name)
+        print(f"{name}: reads {read} of {total} {table} partitions ({partitions or 'none'})")
+    explain.close()
+    cursor.close()
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain date partitions for the Bacchus schema.")
+    parser.add_argument("command", choices=["list", "maintain", "check"])
+    parser.add_argument("--ahead", type=int, default=DEFAULT_AHEAD,
+                        help=f"future periods to keep partitions for (default {DEFAULT_AHEAD})")
+    parser.add_argument("--retain", type=int, default=None,
+                        help="periods of history to keep; older partitions are dropped")
+    parser.add_argument("--archive", action="store_true",
+                        help="exchange expired partitions into archive tables before dropping")
+    parser.add_argument("--dry-run", action="store_true", help="print the planned DDL only")
+    args = parser.parse_args()
+
+    conn = reconnect_to_db()
+    try:
+        if args.command == "list":
+            print_partitions(conn)
+        elif args.command == "maintain":
+            maintain_partitions(conn, args.ahead, args.retain, args.archive, args.dry_run)
+        elif check_pruning(conn):
+            sys.exit(1)
+    except (mysql.connector.Error, ValueError) as err:
+        print(f"Error: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
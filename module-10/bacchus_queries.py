@@ -0,0 +1,101 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Data Viewer Queries
+
+The joined queries shown by view_joined_data(), kept in their own module so they
+can be reused (for example by the benchmark harness) without a database connection.
+
+Sections in SUMMARY_VIEWS read a bacchus_summaries.py table instead of grouping
+the base tables; their JOINED_VIEWS query is the fallback for a database
+without the summaries.
+"""
+
+# (section title, query) pairs in the order the data viewer prints them
+JOINED_VIEWS = [
+    ("Employee with Department (INNER JOIN)", """
+        SELECT e.EmployeeID, e.Name, d.Name AS Department, e.Position
+        FROM Employee e
+        INNER JOIN Department d ON e.DepartmentID = d.DepartmentID;
+    """),
+    ("Employee Hours with Names (LEFT JOIN)", """
+        SELECT eh.RecordID, e.Name, eh.Week, eh.HoursWorked
+        FROM EmployeeHours eh
+        LEFT JOIN Employee e ON eh.EmployeeID = e.EmployeeID;
+    """),
+    ("Supply Shipments with Supplier and Supply Type (INNER JOIN)", """
+        SELECT ss.ShipmentID, s.Name AS Supplier, st.Description AS SupplyType, ss.Quantity
+        FROM SupplyShipment ss
+        JOIN Supplier s ON ss.SupplierID = s.SupplierID
+        JOIN SupplyType st ON ss.SupplyTypeID = st.SupplyTypeID;
+    """),
+    ("Wine Orders with Distributor and Wine Info (INNER JOIN)", """
+        SELECT wo.OrderID, d.Name AS Distributor, w.Name AS Wine, wo.Quantity, wo.OrderStatus
+        FROM WineOrders wo
+        INNER JOIN Distributor d ON wo.DistributorID = d.DistributorID
+        INNER JOIN Wine w ON wo.WineID = w.WineID;
+    """),
+    ("Total Wine Ordered Per Distributor (JOIN with GROUP BY)", """
+        SELECT d.Name, SUM(wo.Quantity) AS TotalOrdered
+        FROM WineOrders wo
+        JOIN Distributor d ON wo.DistributorID = d.DistributorID
+        GROUP BY d.Name;
+    """),
+]
+
+# Section title -> (summary table, query reading it instead of the base tables)
+SUMMARY_VIEWS = {
+    "Total Wine Ordered Per Distributor (JOIN with GROUP BY)": ("DistributorWineTotals", """
+        SELECT d.Name, SUM(t.TotalQuantity) AS TotalOrdered
+        FROM DistributorWineTotals t
+        JOIN Distributor d ON t.DistributorID = d.DistributorID
+        GROUP BY d.Name;
+    """),
+}
+
+def joined_views(missing=()):
+    """
+    Returns JOINED_VIEWS with each SUMMARY_VIEWS section reading its summary
+    table, unless that table is in missing.
+
+    Args:
+        missing (list): Summary tables not installed in the database.
+    """
+    views = []
+    for title, query in JOINED_VIEWS:
+        table, summary_query = SUMMARY_VIEWS.get(title, (None, None))
+        views.append((title, summary_query if table and table not in missing else query))
+    return views
+
+# Views the data viewer can page through with common/pager.py, keyed by the
+# name given to --pager. Each page is a range read on the table's primary key;
+# filters name the only columns --where may compare.
+PAGED_VIEWS = {
+    "employee_hours": {
+        "title": "Employee Hours with Names (LEFT JOIN)",
+        "key": "eh.RecordID",
+        "select": "eh.RecordID, e.Name, eh.Week, eh.HoursWorked",
+        "from": "EmployeeHours eh LEFT JOIN Employee e ON eh.EmployeeID = e.EmployeeID",
+        "filters": {"Employee": "e.Name", "EmployeeID": "eh.EmployeeID", "Week": "eh.Week"},
+    },
+    "supply_shipments": {
+        "title": "Supply Shipments with Supplier and Supply Type (INNER JOIN)",
+        "key": "ss.ShipmentID",
+        "select": "ss.ShipmentID, s.Name AS Supplier, st.Description AS SupplyType, ss.Quantity",
+        "from": """SupplyShipment ss
+                   JOIN Supplier s ON ss.SupplierID = s.SupplierID
+                   JOIN SupplyType st ON ss.SupplyTypeID = st.SupplyTypeID""",
+        "filters": {"Supplier": "s.Name", "SupplyType": "st.Description",
+                    "SupplierID": "ss.SupplierID"},
+    },
+    "wine_orders": {
+        "title": "Wine Orders with Distributor and Wine Info (INNER JOIN)",
+        "key": "wo.OrderID",
+        "select": "wo.OrderID, d.Name AS Distributor, w.Name AS Wine, wo.Quantity, wo.OrderStatus",
+        "from": """WineOrders wo
+                   INNER JOIN Distributor d ON wo.DistributorID = d.DistributorID
+                   INNER JOIN Wine w ON wo.WineID = w.WineID""",
+        "filters": {"Distributor": "d.Name", "Wine": "w.Name", "OrderStatus": "wo.OrderStatus",
+                    "DistributorID": "wo.DistributorID"},
+    },
+}
@@ -0,0 +1,360 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 10.1 - Summary Tables
+
+Maintained summary tables so dashboards read totals in O(distributors) instead of
+grouping the whole WineOrders table on every call:
+
+- DistributorWineTotals: ordered quantity and order count per distributor and wine
+- OrderStatusTotals: order count and quantity per OrderStatus
+- SupplyStockLevels / WineStockLevels: quantity on hand per supply type and wine
+- SupplierLateness: delivered shipments per supplier, supply type, delivery date
+  and days late, a histogram the supplier performance report reads instead of
+  every shipment
+- SupplierOutstanding: undelivered shipments per supplier, supply type and
+  expected date
+
+Triggers on WineOrders, SupplyInventory, WineInventory and SupplyShipment apply each insert, update
+and delete to the summaries as it happens. "rebuild" recomputes them from the base
+tables and "check" compares them with the base tables.
+
+Usage:
+    python bacchus_summaries.py install     # tables, triggers and a first rebuild
+    python bacchus_summaries.py check
+    python bacchus_summaries.py rebuild
+    python bacchus_summaries.py show
+"""
+
+from pathlib import Path
+import argparse
+import re
+import sys
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import get_connection, reconnect_to_db
+
+SUMMARY_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS DistributorWineTotals (
+        DistributorID INT NOT NULL,
+        WineID INT NOT NULL,
+        TotalQuantity BIGINT NOT NULL DEFAULT 0,
+        OrderCount INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (DistributorID, WineID)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS OrderStatusTotals (
+        OrderStatus VARCHAR(100) NOT NULL PRIMARY KEY,
+        TotalQuantity BIGINT NOT NULL DEFAULT 0,
+        OrderCount INT NOT NULL DEFAULT 0
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS SupplyStockLevels (
+        SupplyTypeID INT NOT NULL PRIMARY KEY,
+        QuantityOnHand BIGINT NOT NULL DEFAULT 0
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS WineStockLevels (
+        WineID INT NOT NULL PRIMARY KEY,
+        QuantityOnHand BIGINT NOT NULL DEFAULT 0
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS SupplierLateness (
+        SupplierID INT NOT NULL,
+        SupplyTypeID INT NOT NULL,
+        DeliveryDate DATE NOT NULL,
+        DaysLate INT NOT NULL,
+        Shipments INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (SupplierID, SupplyTypeID, DeliveryDate, DaysLate),
+        INDEX idx_supplierlateness_date (DeliveryDate)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS SupplierOutstanding (
+        SupplierID INT NOT NULL,
+        SupplyTypeID INT NOT NULL,
+        ExpectedDeliveryDate DATE NOT NULL,
+        Shipments INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (SupplierID, SupplyTypeID, ExpectedDeliveryDate)
+    );
+    """,
+]
+
+# Each summary: its table, key columns, value columns and the query that
+# computes it from the base tables. NULL keys are stored as 0 / '', a missing
+# expected date as 9999-12-31 (never overdue) and a delivery with no expected
+# date as on time.
+SUMMARIES = {
+    "DistributorWineTotals": {
+        "keys": ["DistributorID", "WineID"],
+        "values": ["TotalQuantity", "OrderCount"],
+        "source": """
+            SELECT COALESCE(DistributorID, 0), COALESCE(WineID, 0),
+                   SUM(COALESCE(Quantity, 0)), COUNT(*)
+            FROM WineOrders
+            GROUP BY COALESCE(DistributorID, 0), COALESCE(WineID, 0)
+        """,
+    },
+    "OrderStatusTotals": {
+        "keys": ["OrderStatus"],
+        "values": ["TotalQuantity", "OrderCount"],
+        "source": """
+            SELECT COALESCE(OrderStatus, ''), SUM(COALESCE(Quantity, 0)), COUNT(*)
+            FROM WineOrders
+            GROUP BY COALESCE(OrderStatus, '')
+        """,
+    },
+    "SupplyStockLevels": {
+        "keys": ["SupplyTypeID"],
+        "values": ["QuantityOnHand"],
+        "source": """
+            SELECT COALESCE(SupplyTypeID, 0), SUM(COALESCE(QuantityOnHand, 0))
+            FROM SupplyInventory
+            GROUP BY COALESCE(SupplyTypeID, 0)
+        """,
+    },
+    "WineStockLevels": {
+        "keys": ["WineID"],
+        "values": ["QuantityOnHand"],
+        "source": """
+            SELECT COALESCE(WineID, 0), SUM(COALESCE(QuantityOnHand, 0))
+            FROM WineInventory
+            GROUP BY COALESCE(WineID, 0)
+        """,
+    },
+    "SupplierLateness": {
+        "keys": ["SupplierID", "SupplyTypeID", "DeliveryDate", "DaysLate"],
+        "values": ["Shipments"],
+        "source": """
+            SELECT COALESCE(SupplierID, 0), COALESCE(SupplyTypeID, 0), ActualDeliveryDate,
+                   COALESCE(DATEDIFF(ActualDeliveryDate, ExpectedDeliveryDate), 0), COUNT(*)
+            FROM SupplyShipment
+            WHERE ActualDeliveryDate IS NOT NULL
+            GROUP BY COALESCE(SupplierID, 0), COALESCE(SupplyTypeID, 0), ActualDeliveryDate,
+                     COALESCE(DATEDIFF(ActualDeliveryDate, ExpectedDeliveryDate), 0)
+        """,
+    },
+    "SupplierOutstanding": {
+        "keys": ["SupplierID", "SupplyTypeID", "ExpectedDeliveryDate"],
+        "values": ["Shipments"],
+        "source": """
+            SELECT COALESCE(SupplierID, 0), COALESCE(SupplyTypeID, 0),
+                   COALESCE(ExpectedDeliveryDate, DATE '9999-12-31'), COUNT(*)
+            FROM SupplyShipment
+            WHERE ActualDeliveryDate IS NULL
+            GROUP BY COALESCE(SupplierID, 0), COALESCE(SupplyTypeID, 0),
+                     COALESCE(ExpectedDeliveryDate, DATE '9999-12-31')
+        """,
+    },
+}
+
+def order_delta(row, sign):
+    """
+    Returns trigger statements that add (sign "+") or remove (sign "-") one
+    WineOrders row (NEW or OLD) from the order summaries.
+    """
+    quantity = f"{sign}COALESCE({row}.Quantity, 0)"
+    count = f"{sign}1"
+    return f"""
+        INSERT INTO DistributorWineTotals (DistributorID, WineID, TotalQuantity, OrderCount)
+        VALUES (COALESCE({row}.DistributorID, 0), COALESCE({row}.WineID, 0), {quantity}, {count})
+        ON DUPLICATE KEY UPDATE TotalQuantity = TotalQuantity + ({quantity}),
+                                OrderCount = OrderCount + ({count});
+        INSERT INTO OrderStatusTotals (OrderStatus, TotalQuantity, OrderCount)
+        VALUES (COALESCE({row}.OrderStatus, ''), {quantity}, {count})
+        ON DUPLICATE KEY UPDATE TotalQuantity = TotalQuantity + ({quantity}),
+                                OrderCount = OrderCount + ({count});
+    """
+
+def stock_delta(summary, key, row, sign):
+    """
+    Returns a trigger statement that adds or removes one inventory row's
+    quantity from a stock level summary.
+    """
+    quantity = f"{sign}COALESCE({row}.QuantityOnHand, 0)"
+    return f"""
+        INSERT INTO {summary} ({key}, QuantityOnHand)
+        VALUES (COALESCE({row}.{key}, 0), {quantity})
+        ON DUPLICATE KEY UPDATE QuantityOnHand = QuantityOnHand + ({quantity});
+    """
+
+def shipment_delta(row, sign):
+    """
+    Returns trigger statements that add or remove one SupplyShipment row from
+    the lateness histogram (delivered) or the outstanding counts (not delivered).
+    """
+    count = f"{sign}1"
+    return f"""
+        IF {row}.ActualDeliveryDate IS NOT NULL THEN
+            INSERT INTO SupplierLateness (SupplierID, SupplyTypeID, DeliveryDate, DaysLate, Shipments)
+            VALUES (COALESCE({row}.SupplierID, 0), COALESCE({row}.SupplyTypeID, 0),
+                    {row}.ActualDeliveryDate,
+                    COALESCE(DATEDIFF({row}.ActualDeliveryDate, {row}.ExpectedDeliveryDate), 0),
+                    {count})
+            ON DUPLICATE KEY UPDATE Shipments = Shipments + ({count});
+        ELSE
+            INSERT INTO SupplierOutstanding (SupplierID, SupplyTypeID, ExpectedDeliveryDate, Shipments)
+            VALUES (COALESCE({row}.SupplierID, 0), COALESCE({row}.SupplyTypeID, 0),
+                    COALESCE({row}.ExpectedDeliveryDate, DATE '9999-12-31'), {count})
+            ON DUPLICATE KEY UPDATE Shipments = Shipments + ({count});
+        END IF;
+    """
+
+def trigger_definitions():
+    """
+    Returns (trigger name, CREATE TRIGGER statement) pairs for every summary trigger.
+    """
+    sources = [
+        ("WineOrders", lambda row, sign: order_delta(row, sign)),
+        ("SupplyInventory", lambda row, sign: stock_delta("SupplyStockLevels", "SupplyTypeID", row, sign)),
+        ("WineInventory", lambda row, sign: stock_delta("WineStockLevels", "WineID", row, sign)),
+        ("SupplyShipment", shipment_delta),
+    ]
+    triggers = []
+    for table, delta in sources:
+        bodies = {
+            "INSERT": delta("NEW", "+"),
+            "UPDATE": delta("OLD", "-") + delta("NEW", "+"),
+            "DELETE": delta("OLD", "-"),
+        }
+        for event, body in bodies.items():
+            name = f"summary_{table.lower()}_{event.lower()}"
+            triggers.append((name, f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+                                   f"FOR EACH ROW BEGIN {body} END"))
+    return triggers
+
+def install(conn):
+    """
+    Creates the summary tables and triggers (replacing existing triggers) and
+    fills the summaries from the base tables.
+    """
+    cursor = conn.cursor()
+    for statement in SUMMARY_TABLES:
+        cursor.execute(statement)
+    for name, statement in trigger_definitions():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(statement)
+        print(f"Trigger installed: {name}")
+    cursor.close()
+    rebuild(conn)
+
+def summaries_for(base_table):
+    """
+    Returns the names of the summaries aggregated from base_table.
+    """
+    return [table for table, summary in SUMMARIES.items()
+            if re.search(rf"\bFROM {base_table}\b", summary["source"])]
+
+def rebuild(conn, tables=None):
+    """
+    Recomputes summaries from their base tables in one transaction. INSERT ...
+    SELECT holds shared locks on the rows it reads, so concurrent writes wait for
+    the rebuild instead of being counted twice.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        tables (list): Summary names to rebuild; every summary when omitted.
+    """
+    cursor = conn.cursor()
+    try:
+        for table, summary in SUMMARIES.items():
+            if tables is not None and table not in tables:
+                continue
+            columns = ", ".join(summary["keys"] + summary["values"])
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table} ({columns}) {summary['source']}")
+            print(f"{table} rebuilt: {cursor.rowcount} rows")
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def check(conn):
+    """
+    Compares each summary with a fresh aggregate of its base table. Summary rows
+    that have dropped to zero (every order or item removed) are not mismatches.
+
+    Returns:
+        int: The number of mismatched keys across all summaries.
+    """
+    cursor = conn.cursor()
+    mismatches = 0
+    for table, summary in SUMMARIES.items():
+        width = len(summary["keys"])
+        cursor.execute(summary["source"])
+        expected = {row[:width]: tuple(int(v) for v in row[width:]) for row in cursor.fetchall()}
+        cursor.execute(f"SELECT {', '.join(summary['keys'] + summary['values'])} FROM {table}")
+        actual = {row[:width]: tuple(int(v) for v in row[width:]) for row in cursor.fetchall()}
+
+        zero = tuple([0] * len(summary["values"]))
+        bad = [key for key in expected.keys() | actual.keys()
+               if expected.get(key, zero) != actual.get(key, zero)]
+        for key in bad[:10]:
+            print(f"{table} {key}: expected {expected.get(key, zero)}, found {actual.get(key, zero)}")
+        print(f"{table}: {'OK' if not bad else f'{len(bad)} mismatched keys'}")
+        mismatches += len(bad)
+    cursor.close()
+    return mismatches
+
+def show(conn):
+    """
+    Prints the summary-backed dashboard totals.
+    """
+    cursor = conn.cursor()
+    print("\n--- Total Wine Ordered Per Distributor (summary) ---")
+    cursor.execute("""
+        SELECT d.Name, SUM(t.TotalQuantity) AS TotalOrdered
+        FROM DistributorWineTotals t
+        JOIN Distributor d ON t.DistributorID = d.DistributorID
+        GROUP BY d.Name;
+    """)
+    for row in cursor.fetchall():
+        print(row)
+
+    print("\n--- Orders Per Status (summary) ---")
+    cursor.execute("SELECT OrderStatus, OrderCount, TotalQuantity FROM OrderStatusTotals;")
+    for row in cursor.fetchall():
+        print(row)
+
+    print("\n--- Supply Stock Levels (summary) ---")
+    cursor.execute("""
+        SELECT st.Description, l.QuantityOnHand
+        FROM SupplyStockLevels l
+        JOIN SupplyType st ON l.SupplyTypeID = st.SupplyTypeID;
+    """)
+    for row in cursor.fetchall():
+        print(row)
+    cursor.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the Bacchus summary tables.")
+    parser.add_argument("command", choices=["install", "rebuild", "check", "show"])
+    args = parser.parse_args()
+
+    # DROP TRIGGER IF EXISTS and CREATE TABLE IF NOT EXISTS report notes when the
+    # objects are missing or already there, so install runs without raise_on_warnings
+    conn = get_connection() if args.command == "install" else reconnect_to_db()
+    try:
+        if args.command == "install":
+            install(conn)
+        elif args.command == "rebuild":
+            rebuild(conn)
+        elif args.command == "check":
+            if check(conn):
+                sys.exit(1)
+        else:
+            show(conn)
+    except mysql.connector.Error as err:
+        print(f"Error: {err}")
+        sys.exit(1)
+    finally:
+        conn.close()
@@ -11,25 +11,13 @@ and take a screenshot of the results of the script that displays the data in eac
 """
 
 import mysql.connector
-from dotenv import dotenv_values
 from pathlib import Path
-import os, sys
+import sys
 
+# Connections come from the shared pool in common/db.py
 BASE_DIR = Path(__file__).resolve().parent.parent
-ENV = Path(os.path.join(BASE_DIR, ".env"))
-
-if os.path.exists(ENV):
-    secrets = dotenv_values(ENV)
-else:
-    sys.exit("No .env file found.")
-
-
-def reconnect_to_db():
-    return mysql.connector.connect(**{"user": secrets["USER"],
-    "password": secrets["PASSWORD"],
-    "host": secrets["HOST"],
-    "database": secrets["DATABASE"],
-    "raise_on_warnings": True})
+sys.path.insert(0, str(BASE_DIR))
+from common.db import reconnect_to_db
 
 def insert_data():
     conn = reconnect_to_db()
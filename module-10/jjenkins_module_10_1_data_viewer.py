@@ -10,80 +10,113 @@ and take a screenshot of the results of the script that displays the data in eac
 
 """
 
-import mysql.connector
-from dotenv import dotenv_values
 from pathlib import Path
-import os, sys
+import argparse
+import sys
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-ENV = Path(os.path.join(BASE_DIR, ".env"))
+from bacchus_queries import PAGED_VIEWS, SUMMARY_VIEWS, joined_views
 
-if os.path.exists(ENV):
-    secrets = dotenv_values(ENV)
-else:
-    sys.exit("No .env file found.")
+# Connections come from the shared pool in common/db.py
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+from common.async_runner import run_queries_concurrently
+from common.backends import connect, missing_tables
+from common.cache import get_default_cache
+from common.db import reconnect_to_db
+from common.pager import DEFAULT_PAGE_SIZE, KeysetPager, parse_filters
 
-def reconnect_to_db():
-    return mysql.connector.connect(**{"user": secrets["USER"],
-    "password": secrets["PASSWORD"],
-    "host": secrets["HOST"],
-    "database": secrets["DATABASE"],
-    "raise_on_warnings": True})
+def summary_views(conn):
+    # Summary sections fall back to their GROUP BY query without bacchus_summaries.py
+    return joined_views(missing_tables(conn, {table for table, _ in SUMMARY_VIEWS.values()}))
 
-def view_joined_data():
-    conn = reconnect_to_db()
+def view_joined_data(backend=None):
+    # backend is a common/backends.py spec such as sqlite:bacchus.db
+    conn = connect(backend) if backend else reconnect_to_db()
     cursor = conn.cursor()
+    cache = get_default_cache()
 
-    print("\n--- Employee with Department (INNER JOIN) ---")
-    cursor.execute("""
-        SELECT e.EmployeeID, e.Name, d.Name AS Department, e.Position
-        FROM Employee e
-        INNER JOIN Department d ON e.DepartmentID = d.DepartmentID;
-    """)
-    for row in cursor.fetchall():
-        print(row)
+    for title, query in summary_views(conn):
+        print(f"\n--- {title} ---")
+        for row in cache.fetchall(cursor, query):
+            print(row)
 
-    print("\n--- Employee Hours with Names (LEFT JOIN) ---")
-    cursor.execute("""
-        SELECT eh.RecordID, e.Name, eh.Week, eh.HoursWorked
-        FROM EmployeeHours eh
-        LEFT JOIN Employee e ON eh.EmployeeID = e.EmployeeID;
-    """)
-    for row in cursor.fetchall():
-        print(row)
+    cursor.close()
+    conn.close()
 
-    print("\n--- Supply Shipments with Supplier and Supply Type (INNER JOIN) ---")
-    cursor.execute("""
-        SELECT ss.ShipmentID, s.Name AS Supplier, st.Description AS SupplyType, ss.Quantity
-        FROM SupplyShipment ss
-        JOIN Supplier s ON ss.SupplierID = s.SupplierID
-        JOIN SupplyType st ON ss.SupplyTypeID = st.SupplyTypeID;
-    """)
-    for row in cursor.fetchall():
-        print(row)
+def view_joined_data_concurrent():
+    # All five queries are in flight at once; sections still print in order
+    conn = reconnect_to_db()
+    views = summary_views(conn)
+    conn.close()
+    results = run_queries_concurrently([query for _, query in views], raise_on_warnings=True)
+    for (title, _), rows in zip(views, results):
+        print(f"\n--- {title} ---")
+        for row in rows:
+            print(row)
 
-    print("\n--- Wine Orders with Distributor and Wine Info (INNER JOIN) ---")
-    cursor.execute("""
-        SELECT wo.OrderID, d.Name AS Distributor, w.Name AS Wine, wo.Quantity, wo.OrderStatus
-        FROM WineOrders wo
-        INNER JOIN Distributor d ON wo.DistributorID = d.DistributorID
-        INNER JOIN Wine w ON wo.WineID = w.WineID;
-    """)
-    for row in cursor.fetchall():
+def show_page(title, number, rows):
+    print(f"\n--- {title} (page {number}) ---")
+    for row in rows:
         print(row)
 
-    print("\n--- Total Wine Ordered Per Distributor (JOIN with GROUP BY) ---")
-    cursor.execute("""
-        SELECT d.Name, SUM(wo.Quantity) AS TotalOrdered
-        FROM WineOrders wo
-        JOIN Distributor d ON wo.DistributorID = d.DistributorID
-        GROUP BY d.Name;
-    """)
-    for row in cursor.fetchall():
-        print(row)
+def view_paged_data(name, page_size=DEFAULT_PAGE_SIZE, filters=None, page=None, backend=None):
+    """
+    Shows one joined view a page at a time, read by keyset pagination on its key.
 
-    cursor.close()
-    conn.close()
+    Args:
+        name (str): A PAGED_VIEWS name, such as wine_orders.
+        page_size (int): Rows per page.
+        filters (dict): {column: value} filters; * in a value matches anything.
+        page (int): Print just this page and exit. Without it, pages are browsed
+            interactively, or all printed in turn when stdin is not a terminal.
+        backend (str): A common/backends.py spec; MySQL when omitted.
+    """
+    view = PAGED_VIEWS[name]
+    conn = connect(backend) if backend else reconnect_to_db()
+    cursor = conn.cursor()
+    try:
+        pager = KeysetPager(cursor, view, page_size, filters, cache=get_default_cache())
+
+        def show(number, rows):
+            show_page(view["title"], number, rows)
+
+        if page is not None:
+            rows = pager.page(page)
+            if rows:
+                show(page, rows)
+            else:
+                print(f"No page {page}; {name} has {pager.page_count()} page(s)")
+        elif sys.stdin.isatty():
+            pager.browse(show)
+        else:
+            for number, rows in pager.pages():
+                show(number, rows)
+    finally:
+        cursor.close()
+        conn.close()
 
 if __name__ == "__main__":
-    view_joined_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Display the joined Bacchus tables.")
+    parser.add_argument("--async", dest="concurrent", action="store_true",
+                        help="send the five queries concurrently (MySQL only)")
+    parser.add_argument("--backend", default=None, metavar="SPEC",
+                        help="mysql (default), sqlite:PATH or duckdb:PATH snapshot")
+    parser.add_argument("--pager", choices=sorted(PAGED_VIEWS), metavar="VIEW",
+                        help=f"page through one view: {', '.join(sorted(PAGED_VIEWS))}")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--page", type=int, help="with --pager, print only this page")
+    parser.add_argument("--where", nargs="*", default=[], metavar="COLUMN=VALUE",
+                        help="with --pager, filter rows (* matches anything)")
+    args = parser.parse_args()
+    if args.concurrent and args.backend not in (None, "mysql"):
+        parser.error("--async only runs against MySQL; drop --backend or --async")
+    if args.pager:
+        try:
+            view_paged_data(args.pager, args.page_size, parse_filters(args.where), args.page,
+                            args.backend)
+        except ValueError as err:
+            parser.error(str(err))
+    elif args.concurrent:
+        view_joined_data_concurrent()
+    else:
+        view_joined_data(args.backend)
\ No newline at end of file
@@ -0,0 +1,284 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 11.1 - Report Benchmarks
+
+Description:
+------------
+Benchmarks every registered report query and every joined view from the Module 10
+data viewer at several data sizes. For each scale the database is seeded with
+bacchus_data_generator.py, then each query is run --iterations times and the
+following are recorded:
+
+- latency percentiles (p50, p95, max) in milliseconds
+- rows returned and rows/sec
+- bytes written when the rows are formatted to a report file
+- the peak resident memory of the process after the query, and how much the
+  query raised that peak
+
+Results are saved as JSON so runs can be compared between commits. With --baseline,
+any query whose p50 latency is more than --threshold slower than the baseline
+fails the run with exit status 1.
+
+By default an in-memory SQLite database with the same schema is used, so no
+server is needed. The schema is translated from the create_tables() definitions
+and the bacchus_summaries.py summary tables, which are rebuilt after each seed.
+It is opened through common/backends.py, the same layer the report creator uses
+for --backend snapshots; --backend duckdb uses an in-memory DuckDB database
+instead. --backend mysql seeds the database named in .env instead, and requires
+--reset-database because every Bacchus table is emptied first.
+
+Usage:
+    python bacchus_benchmark.py --scales 1000,10000,100000 --output bench.json
+    python bacchus_benchmark.py --baseline bench.json --threshold 0.25
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from report_registry import REPORTS, WINDOW_DAYS, format_row, with_window
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.backends import connect, missing_tables
+
+# The generator and data viewer queries live in the Module 10 folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "module-10"))
+from bacchus_data_generator import END_DATE, TABLE_COLUMNS, generate_tables
+from bacchus_queries import SUMMARY_VIEWS, joined_views
+from bacchus_summaries import SUMMARIES, SUMMARY_TABLES
+from jjenkins_module_10_1_mysql_table_creation_script import TABLE_DEFINITIONS
+
+DEFAULT_SCALES = [1000, 10000]
+DEFAULT_ITERATIONS = 5
+DEFAULT_THRESHOLD = 0.25
+SEED_BATCH_SIZE = 5000
+
+# MySQL column and index syntax the embedded engines do not accept
+AUTO_INCREMENT_KEY = re.compile(r"\bINT AUTO_INCREMENT PRIMARY KEY\b")
+INLINE_INDEX = re.compile(r",\s*INDEX \w+ \([^)]*\)")
+
+def embedded_schema(statements):
+    """
+    Translates MySQL CREATE TABLE statements into a script SQLite and DuckDB
+    both run: AUTO_INCREMENT keys become INTEGER PRIMARY KEY and inline
+    secondary indexes are dropped.
+    """
+    return "\n".join(INLINE_INDEX.sub("", AUTO_INCREMENT_KEY.sub("INTEGER PRIMARY KEY", ddl))
+                     .strip() for ddl in statements)
+
+SQLITE_SCHEMA = embedded_schema(TABLE_DEFINITIONS + SUMMARY_TABLES)
+
+def connect_embedded(backend):
+    """
+    Returns an in-memory SQLite or DuckDB database with the Bacchus schema. The
+    connection takes the MySQL report queries unchanged.
+    """
+    conn = connect(f"{backend}::memory:")
+    conn.executescript(SQLITE_SCHEMA)
+    return conn
+
+def connect_mysql():
+    """
+    Returns a pooled connection to the MySQL database named in the project .env file.
+    """
+    from common.db import get_connection
+
+    return get_connection()
+
+def seed(conn, backend, rows, seed_value):
+    """
+    Empties the Bacchus tables and loads the generated dataset for one scale,
+    then rebuilds the summary tables that exist from it, as
+    bacchus_summaries.py rebuild does.
+    """
+    cursor = conn.cursor()
+    if backend == "mysql":
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table in reversed(list(TABLE_COLUMNS)):
+        cursor.execute(f"DELETE FROM {table}")
+    if backend == "mysql":
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+    for table, table_rows in generate_tables(rows, seed_value):
+        columns = TABLE_COLUMNS[table]
+        query = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                 f"VALUES ({', '.join(['%s'] * len(columns))})")
+        batch = []
+        for row in table_rows:
+            batch.append(row)
+            if len(batch) >= SEED_BATCH_SIZE:
+                cursor.executemany(query, batch)
+                batch.clear()
+        if batch:
+            cursor.executemany(query, batch)
+
+    missing = missing_tables(conn, SUMMARIES)
+    for table, summary in SUMMARIES.items():
+        if table not in missing:
+            columns = ", ".join(summary["keys"] + summary["values"])
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table} ({columns}) {summary['source']}")
+    conn.commit()
+    cursor.close()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+def peak_rss_kb():
+    """
+    Returns the peak resident set size of the whole process so far, in kilobytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def time_query(conn, query, params, formatter, iterations, output_path):
+    """
+    Runs one query repeatedly, streaming its rows to output_path each time.
+
+    Returns:
+        dict: Latency percentiles, row counts, rows/sec, bytes written, the
+            process peak RSS and how much this query raised it.
+    """
+    peak_before = peak_rss_kb()
+    latencies = []
+    row_count = bytes_written = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        cursor = conn.cursor()
+        cursor.execute(query, params or None)
+        row_count = 0
+        with open(output_path, "w", buffering=1024 * 1024) as writer:
+            while True:
+                batch = cursor.fetchmany(1000)
+                if not batch:
+                    break
+                for row in batch:
+                    writer.write(formatter(row) + "\n")
+                row_count += len(batch)
+        cursor.close()
+        latencies.append(time.perf_counter() - started)
+        bytes_written = os.path.getsize(output_path)
+
+    p50 = percentile(latencies, 0.5)
+    return {
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+        "rows": row_count,
+        "rows_per_sec": round(row_count / p50, 1) if p50 else None,
+        "bytes_written": bytes_written,
+        "process_peak_rss_kb": peak_rss_kb(),
+        "peak_rss_growth_kb": peak_rss_kb() - peak_before,
+    }
+
+def run_benchmarks(backend="sqlite", scales=DEFAULT_SCALES, iterations=DEFAULT_ITERATIONS,
+                   seed_value=310):
+    """
+    Seeds each scale and times every report and joined view.
+
+    Returns:
+        dict: Run metadata and a "results" mapping of "scale/kind/name" to metrics.
+    """
+    conn = connect_mysql() if backend == "mysql" else connect_embedded(backend)
+    # The generated history ends at END_DATE, so date windows count back from it
+    reports = with_window(list(REPORTS.values()), END_DATE - timedelta(days=WINDOW_DAYS - 1),
+                          END_DATE)
+    # Without bacchus_summaries.py install a MySQL database has no summary tables,
+    # so reports run their fallback query or are left out, as in report_engine
+    reports = [dict(r, query=r["fallback"]) if missing_tables(conn, r["requires"]) else r
+               for r in reports]
+    queries = [("report", r["name"], r["query"], r["params"],
+                lambda row, r=r: format_row(r, row)) for r in reports if r["query"]]
+    views = joined_views(missing_tables(conn, {table for table, _ in SUMMARY_VIEWS.values()}))
+    queries += [("view", title, query, None, str) for title, query in views]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "output.txt")
+        for scale in scales:
+            started = time.perf_counter()
+            seed(conn, backend, scale, seed_value)
+            print(f"Seeded {scale} rows per history table in {time.perf_counter() - started:.2f}s")
+            for kind, name, query, params, formatter in queries:
+                metrics = time_query(conn, query, params, formatter, iterations, output_path)
+                results[f"{scale}/{kind}/{name}"] = metrics
+                print(f"  {kind:<6} {name:<60} p50 {metrics['p50_ms']:>10.3f} ms"
+                      f"  {metrics['rows']:>9} rows")
+    conn.close()
+
+    return {
+        "backend": backend,
+        "commit": git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "iterations": iterations,
+        "scales": scales,
+        "results": results,
+    }
+
+def git_commit():
+    """
+    Returns the current git commit hash, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def find_regressions(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares p50 latencies against a baseline run.
+
+    Returns:
+        list: (key, baseline_ms, current_ms) for each query slower than the threshold allows.
+    """
+    regressions = []
+    for key, metrics in current["results"].items():
+        before = baseline.get("results", {}).get(key)
+        if before and metrics["p50_ms"] > before["p50_ms"] * (1 + threshold):
+            regressions.append((key, before["p50_ms"], metrics["p50_ms"]))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Bacchus reports and joined views.")
+    parser.add_argument("--backend", choices=["sqlite", "duckdb", "mysql"], default="sqlite")
+    parser.add_argument("--reset-database", action="store_true",
+                        help="required with --backend mysql; empties every Bacchus table")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="comma separated rows per history table")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--seed", type=int, default=310)
+    parser.add_argument("--output", help="file to save the JSON results to")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed p50 slowdown before failing (default {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    if args.backend == "mysql" and not args.reset_database:
+        sys.exit("--backend mysql empties the database in .env; pass --reset-database to confirm.")
+
+    report = run_benchmarks(args.backend, [int(s) for s in args.scales.split(",")],
+                            args.iterations, args.seed)
+    if args.output:
+        with open(args.output, "w") as writer:
+            json.dump(report, writer, indent=2)
+        print(f"Results saved: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as reader:
+            regressions = find_regressions(report, json.load(reader), args.threshold)
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before:.3f} ms -> {after:.3f} ms")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
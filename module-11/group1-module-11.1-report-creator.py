@@ -5,132 +5,197 @@ Assignment: Module 11.1 - Report Creator
 
 Description:
 ------------
-This script connects to a MySQL database and generates three reports in text file format
-to assist with business decisions for Bacchus Winery. It reads credentials from a .env file,
-retrieves data from the database using SQL queries, and writes the results to .txt files.
+This script connects to a MySQL database and generates reports in text file format
+to assist with business decisions for Bacchus Winery. It reads credentials from a .env file
+through common/db.py,
+runs the report definitions in report_registry.py through report_engine.py, and writes the
+results to .txt files.
 
 Reports Generated:
 1. Pending Wine Orders
 2. Low Supply Inventory
 3. Employee Weekly Hours
+4. Wine Inventory
+5. Late Supply Shipments
+6. Recent Employee Hours (date window)
+7. Recent Wine Orders (date window)
+8. Supplier Delivery Performance (lateness histograms kept by module-10/bacchus_summaries.py;
+   skipped until that script's install has been run)
+9. Supplier Delivery Performance by Supplier
+10. Supplier Delivery Performance by Supply Type
+
+Usage:
+    python group1-module-11.1-report-creator.py                    # all reports
+    python group1-module-11.1-report-creator.py pending_wine_orders
+    python group1-module-11.1-report-creator.py --list
+    python group1-module-11.1-report-creator.py recent_wine_orders --since 2025-01-01
+    python group1-module-11.1-report-creator.py late_supply_shipments --include-archive
+    python group1-module-11.1-report-creator.py --profile --prometheus bacchus.prom
+    python group1-module-11.1-report-creator.py --backend duckdb:bacchus.duckdb --analytics
+    python group1-module-11.1-report-creator.py --analytics employee_hours_summary
 """
 
-import mysql.connector
-from datetime import datetime
-from dotenv import dotenv_values
+from datetime import date
 from pathlib import Path
-import os
-
-# Set current and base directories to locate .env and output folders/files
-CURRENT_DIR = Path(__file__).resolve().parent
-BASE_DIR = Path(__file__).resolve().parent.parent
-ENV = Path(os.path.join(BASE_DIR, ".env"))
+import argparse
+import sys
 
-# Load environment variables from .env file
-if os.path.exists(ENV):
-    secrets = dotenv_values(ENV)
-else:
-    raise FileNotFoundError("No .env file found.")
-
-def reconnect_to_db():
-    """
-    Establishes and returns a new connection to the MySQL database using credentials
-    loaded from the .env file.
-    """
-    return mysql.connector.connect(
-        user=secrets["USER"],
-        password=secrets["PASSWORD"],
-        host=secrets["HOST"],
-        database=secrets["DATABASE"],
-        raise_on_warnings=True
-    )
+import mysql.connector
 
-def write_report(file_name, title, rows, formatter):
+# Set the base directory so the shared database module in common/ can be imported
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+from common import instrument
+from common.backends import EMBEDDED_ERRORS, connect
+from common.db import reconnect_to_db
+
+from report_analytics import ANALYTICS_REPORTS, run_analytics
+from report_engine import STREAM_BATCH_SIZE, run_reports, run_reports_parallel
+from report_export import FORMATS
+from report_incremental import run_reports_incremental
+from report_registry import REPORTS, WINDOW_DAYS, get_reports, with_window
+
+# The archive tables and views are managed from the Module 10 folder
+sys.path.insert(0, str(BASE_DIR / "module-10"))
+from bacchus_archive import with_archive
+
+def include_archive(reports):
     """
-    Writes a report to the specified file.
-
-    Args:
-        file_name (str): The name of the output file.
-        title (str): The report header to write.
-        rows (list): Query result rows to write.
-        formatter (func): A function that takes a row and returns a formatted string.
+    Returns the reports rewritten to read archived orders and shipments as well
+    as the hot rows. Reports marked hot_only are returned unchanged.
     """
-    output_path = os.path.join(CURRENT_DIR, file_name)
-    with open(output_path, "w") as writer:
-        writer.write(f"***** {title} *****\n")
-        for row in rows:
-            writer.write(formatter(row) + "\n")
-    print(f"{title} report written: {len(rows)} records")
-    print(f"File created: {output_path}\n")
-
-def generate_reports():
+    return [report if report["hot_only"] else
+            dict(report, query=with_archive(report["query"]),
+                 fallback=report["fallback"] and with_archive(report["fallback"]))
+            for report in reports]
+
+def generate_reports(names=None, stream=False, batch_size=None, parallel=False, workers=None,
+                     incremental=False, rebuild=False, fmt="text", since=None, until=None,
+                     archived=False, backend=None):
     """
-    Generates three separate business reports:
+    Generates the registered business reports, by default:
     1. Pending Wine Orders
     2. Low Supply Inventory
     3. Employee Weekly Hours
+    4. Wine Inventory
+    5. Late Supply Shipments
+    6. Recent Employee Hours
+    7. Recent Wine Orders
+    8. Supplier Delivery Performance
 
     Each report is written to a uniquely named .txt file in the current directory.
-    """
-    conn = reconnect_to_db()
-    cursor = conn.cursor()
-
-    # ----------------------
-    # Report 1: Pending Wine Orders
-    # ----------------------
-    cursor.execute("""
-        SELECT Distributor.Name, Wine.Name, WineOrders.Quantity, WineOrders.OrderDate
-        FROM WineOrders
-        JOIN Distributor ON WineOrders.DistributorID = Distributor.DistributorID
-        JOIN Wine ON WineOrders.WineID = Wine.WineID
-        WHERE WineOrders.OrderStatus = 'Pending';
-    """)
-    rows = cursor.fetchall()
-    write_report(
-        "bacchus_pending_wine_report.txt",
-        "Pending Wine Orders",
-        rows,
-        lambda r: f"Distributor: {r[0]}, Wine: {r[1]}, Quantity: {r[2]}, Ordered On: {r[3]}"
-    )
-
-    # ----------------------
-    # Report 2: Low Supply Inventory
-    # ----------------------
-    cursor.execute("""
-        SELECT SupplyType.Description, SupplyInventory.QuantityOnHand
-        FROM SupplyInventory
-        JOIN SupplyType ON SupplyInventory.SupplyTypeID = SupplyType.SupplyTypeID
-        WHERE SupplyInventory.QuantityOnHand < 100;
-    """)
-    rows = cursor.fetchall()
-    write_report(
-        "bacchus_low_supply_inventory_report.txt",
-        "Low Supply Inventory",
-        rows,
-        lambda r: f"Supply: {r[0]}, Quantity On Hand: {r[1]}"
-    )
-
-    # ----------------------
-    # Report 3: Employee Weekly Hours
-    # ----------------------
-    cursor.execute("""
-        SELECT Employee.Name, EmployeeHours.Week, EmployeeHours.HoursWorked
-        FROM EmployeeHours
-        JOIN Employee ON EmployeeHours.EmployeeID = Employee.EmployeeID;
-    """)
-    rows = cursor.fetchall()
-    write_report(
-        "bacchus_employee_weekly_hours_report.txt",
-        "Employee Weekly Hours",
-        rows,
-        lambda r: f"Employee: {r[0]}, Week: {r[1]}, Hours Worked: {r[2]}"
-    )
 
-    # Clean up DB resources
-    cursor.close()
-    conn.close()
-
-    print("All reports generated successfully.")
+    Args:
+        names (list): Optional report names to run; all reports when omitted.
+        stream (bool): Read rows with an unbuffered cursor in fetchmany() batches
+            instead of loading each full result set with fetchall().
+        batch_size (int): Rows per batch in streaming mode.
+        parallel (bool): Run the reports concurrently over a connection pool.
+        workers (int): Worker threads in parallel mode; one per report by default.
+        incremental (bool): Fetch only rows past each report's stored watermark
+            and merge them into the existing report file.
+        rebuild (bool): In incremental mode, ignore stored watermarks.
+        fmt (str): Output format: text, csv.gz, csv.zst, arrow or parquet.
+            Incremental mode always writes text.
+        since (datetime.date): First date included by the date-window reports.
+        until (datetime.date): Last date included by the date-window reports.
+        archived (bool): Also read rows moved out by bacchus_archive.py.
+        backend (str): Run against a snapshot such as "sqlite:bacchus.db"
+            (see common/snapshot.py) instead of the MySQL server.
+
+    Returns:
+        list: (title, error) tuples for the reports that failed.
+    """
+    reports = with_window(get_reports(names), since, until)
+    if archived:
+        reports = include_archive(reports)
+    if incremental:
+        conn = reconnect_to_db()
+        try:
+            run_reports_incremental(conn, reports, batch_size, rebuild)
+        finally:
+            conn.close()
+        return []
+    if parallel:
+        return run_reports_parallel(reports, workers or len(reports), stream, batch_size, fmt,
+                                    backend)
+    return run_reports(reports, stream, batch_size, fmt, backend)
+
+def parse_args():
+    """
+    Parses command line options for the report creator.
+    """
+    parser = argparse.ArgumentParser(description="Generate Bacchus Winery reports.")
+    parser.add_argument("reports", nargs="*", metavar="REPORT",
+                        help="report names to run (default: all)")
+    parser.add_argument("--list", action="store_true",
+                        help="list the available reports and exit")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream rows in batches instead of loading full result sets")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help=f"rows per fetch in streaming mode (default {STREAM_BATCH_SIZE})")
+    parser.add_argument("--parallel", action="store_true",
+                        help="run the reports concurrently over a connection pool")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker threads in parallel mode (default: one per report)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only fetch rows past each report's stored watermark")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="with --incremental, discard stored watermarks and rebuild")
+    parser.add_argument("--since", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help=f"start of the date-window reports (default: {WINDOW_DAYS} days ago)")
+    parser.add_argument("--until", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="last day of the date-window reports (default: today)")
+    parser.add_argument("--include-archive", action="store_true",
+                        help="also read archived orders and shipments (not in incremental mode)")
+    parser.add_argument("--backend", default=None, metavar="SPEC",
+                        help="mysql (default), sqlite:PATH or duckdb:PATH snapshot to read from")
+    parser.add_argument("--analytics", nargs="*", metavar="NAME",
+                        help="run pandas analytics reports instead (default: all of them)")
+    parser.add_argument("--profile", nargs="?", const=instrument.DEFAULT_LOG, metavar="LOG",
+                        help=f"record query, fetch, connect and write timings to a JSON Lines "
+                             f"log (default {instrument.DEFAULT_LOG})")
+    parser.add_argument("--prometheus", metavar="FILE",
+                        help="with --profile, also write a Prometheus text file")
+    parser.add_argument("--explain-top", type=int, default=0, metavar="N",
+                        help="with --profile, EXPLAIN ANALYZE the N slowest queries at exit")
+    parser.add_argument("--format", dest="fmt", choices=list(FORMATS), default="text",
+                        help="output format (default text)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    generate_reports()
+    args = parse_args()
+    if args.profile:
+        instrument.enable(args.profile, args.prometheus, args.explain_top)
+    if args.list:
+        for report in REPORTS.values():
+            print(f"{report['name']:<24} {report['title']}")
+        for name, (title, _, _) in ANALYTICS_REPORTS.items():
+            print(f"{name:<24} {title} (--analytics)")
+        sys.exit(0)
+    if args.backend and args.backend != "mysql" and args.incremental:
+        sys.exit("--incremental needs the MySQL server; it cannot be used with --backend")
+    if args.analytics is not None:
+        try:
+            conn = connect(args.backend) if args.backend else reconnect_to_db()
+            try:
+                run_analytics(conn, args.analytics, args.fmt)
+            finally:
+                conn.close()
+        except KeyError as err:
+            sys.exit(err.args[0])
+        except (mysql.connector.Error, ValueError, RuntimeError, *EMBEDDED_ERRORS) as err:
+            sys.exit(f"Error: {err}")
+        sys.exit(0)
+    try:
+        failures = generate_reports(args.reports, stream=args.stream, batch_size=args.batch_size,
+                                    parallel=args.parallel, workers=args.workers,
+                                    incremental=args.incremental, rebuild=args.rebuild,
+                                    fmt=args.fmt, since=args.since, until=args.until,
+                                    archived=args.include_archive, backend=args.backend)
+    except KeyError as err:
+        sys.exit(err.args[0])
+    except (mysql.connector.Error, ValueError, RuntimeError, *EMBEDDED_ERRORS) as err:
+        sys.exit(f"Error: {err}")
+    if failures:
+        sys.exit(1)
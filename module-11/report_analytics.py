@@ -0,0 +1,191 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 11.1 - Report Analytics
+
+Description:
+------------
+Analytics reports computed with pandas/NumPy instead of per-row Python loops.
+Query results are fetched in large fetchmany() batches straight into DataFrame
+columns, then totals, rolling averages, overtime counts and order trends are
+computed with vectorized groupby/rolling operations.
+
+Reports:
+1. employee_hours_summary - per employee: weeks worked, total and average hours,
+   latest rolling average and overtime weeks
+2. department_weekly_hours - total hours per department per week
+3. wine_order_trends - ordered quantity per wine per month with the
+   month-over-month change
+
+Output is a text table by default, or CSV/Parquet when one of those formats is
+chosen; other report formats are rejected. pandas is only needed when an
+analytics report is run.
+"""
+
+from pathlib import Path
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+OUTPUT_DIR = Path(__file__).resolve().parent
+FETCH_BATCH_SIZE = 50000
+OVERTIME_HOURS = 40
+# The rolling average covers the weeks dated in the last ROLLING_WEEKS * 7 days,
+# so a missed week is not filled by an older one
+ROLLING_WEEKS = 4
+# Output file suffix per supported format
+ANALYTICS_FORMATS = {"text": ".txt", "csv.gz": ".csv.gz", "parquet": ".parquet"}
+
+HOURS_QUERY = """
+    SELECT eh.EmployeeID, e.Name, d.Name AS Department, eh.Week, eh.HoursWorked
+    FROM EmployeeHours eh
+    JOIN Employee e ON eh.EmployeeID = e.EmployeeID
+    LEFT JOIN Department d ON e.DepartmentID = d.DepartmentID;
+"""
+HOURS_COLUMNS = ["EmployeeID", "Name", "Department", "Week", "HoursWorked"]
+
+ORDERS_QUERY = """
+    SELECT wo.OrderDate, w.Name AS Wine, wo.Quantity
+    FROM WineOrders wo
+    JOIN Wine w ON wo.WineID = w.WineID;
+"""
+ORDERS_COLUMNS = ["OrderDate", "Wine", "Quantity"]
+
+def load_frame(conn, query, columns, batch_size=FETCH_BATCH_SIZE):
+    """
+    Loads a query result into a DataFrame one fetchmany() batch at a time.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        query (str): The SQL query to run.
+        columns (list): Column names for the selected columns.
+        batch_size (int): Rows per fetchmany() batch.
+    """
+    if pd is None:
+        raise RuntimeError("Analytics reports need the pandas package")
+    cursor = conn.cursor(buffered=False)
+    cursor.execute(query)
+    frames = []
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        frames.append(pd.DataFrame.from_records(batch, columns=columns))
+    cursor.close()
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+def load_hours(conn):
+    hours = load_frame(conn, HOURS_QUERY, HOURS_COLUMNS)
+    hours["HoursWorked"] = hours["HoursWorked"].astype("float64")
+    hours["Week"] = pd.to_datetime(hours["Week"])
+    hours["Department"] = hours["Department"].fillna("(none)")
+    return hours
+
+def weekly_hours(hours):
+    """
+    Totals hours per employee per week and adds the rolling average and an
+    overtime flag. The rolling window is a span of days on Week, not a count of
+    rows, so weeks without hours do not stretch it further back.
+    """
+    weekly = (hours.groupby(["EmployeeID", "Name", "Department", "Week"], as_index=False)
+              ["HoursWorked"].sum()
+              .sort_values(["EmployeeID", "Week"], ignore_index=True))
+    # The result is ordered by (EmployeeID, Week), the same order as weekly
+    weekly["RollingAverage"] = (weekly.set_index("Week").groupby("EmployeeID")["HoursWorked"]
+                                .rolling(f"{ROLLING_WEEKS * 7}D", min_periods=1).mean()
+                                .to_numpy())
+    weekly["Overtime"] = weekly["HoursWorked"] > OVERTIME_HOURS
+    return weekly
+
+def employee_hours_summary(conn):
+    weekly = weekly_hours(load_hours(conn))
+    summary = (weekly.groupby(["EmployeeID", "Name", "Department"], as_index=False)
+               .agg(Weeks=("Week", "count"),
+                    TotalHours=("HoursWorked", "sum"),
+                    AverageHours=("HoursWorked", "mean"),
+                    LatestRollingAverage=("RollingAverage", "last"),
+                    OvertimeWeeks=("Overtime", "sum")))
+    return summary.round(2)
+
+def department_weekly_hours(conn):
+    hours = load_hours(conn)
+    hours["Overtime"] = hours["HoursWorked"] > OVERTIME_HOURS
+    totals = (hours.groupby(["Department", "Week"], as_index=False)
+              .agg(TotalHours=("HoursWorked", "sum"),
+                   Employees=("EmployeeID", "nunique"),
+                   OvertimeRecords=("Overtime", "sum")))
+    totals["Week"] = totals["Week"].dt.date
+    return totals.sort_values(["Department", "Week"], ignore_index=True).round(2)
+
+def wine_order_trends(conn):
+    """
+    Totals ordered quantity per wine per month. Every wine gets a row for every
+    month in the data (0 when it had no orders), so ChangePct always compares a
+    month with the calendar month before it. A change from 0 has no percentage.
+    """
+    orders = load_frame(conn, ORDERS_QUERY, ORDERS_COLUMNS)
+    if orders.empty:
+        return pd.DataFrame(columns=["Wine", "Month", "Quantity", "ChangePct"])
+    orders["Quantity"] = orders["Quantity"].astype("float64")
+    orders["Month"] = pd.to_datetime(orders["OrderDate"]).dt.to_period("M")
+    months = pd.period_range(orders["Month"].min(), orders["Month"].max(), freq="M")
+    every_month = pd.MultiIndex.from_product([sorted(orders["Wine"].unique()), months],
+                                             names=["Wine", "Month"])
+    trends = (orders.groupby(["Wine", "Month"])["Quantity"].sum()
+              .reindex(every_month, fill_value=0.0)
+              .reset_index())
+    previous = trends.groupby("Wine")["Quantity"].shift()
+    trends["ChangePct"] = (trends["Quantity"] - previous) / previous.where(previous != 0) * 100
+    trends["Month"] = trends["Month"].astype(str)
+    return trends.round(2)
+
+# Analytics report name -> (title, function returning a DataFrame, output file stem)
+ANALYTICS_REPORTS = {
+    "employee_hours_summary": ("Employee Hours Summary", employee_hours_summary,
+                               "bacchus_employee_hours_summary"),
+    "department_weekly_hours": ("Department Weekly Hours", department_weekly_hours,
+                                "bacchus_department_weekly_hours"),
+    "wine_order_trends": ("Wine Order Trends", wine_order_trends,
+                          "bacchus_wine_order_trends"),
+}
+
+def run_analytics(conn, names=None, fmt="text"):
+    """
+    Runs analytics reports and writes each result table.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        names (list): Analytics report names; all of them when omitted.
+        fmt (str): One of ANALYTICS_FORMATS: "text", "csv.gz" or "parquet".
+
+    Raises:
+        KeyError: If a name does not match an analytics report.
+        ValueError: If the format is not one of ANALYTICS_FORMATS.
+    """
+    names = names or list(ANALYTICS_REPORTS)
+    unknown = [name for name in names if name not in ANALYTICS_REPORTS]
+    if unknown:
+        raise KeyError(f"Unknown analytics report(s): {', '.join(unknown)}. "
+                       f"Available: {', '.join(ANALYTICS_REPORTS)}")
+    if fmt not in ANALYTICS_FORMATS:
+        raise ValueError(f"Analytics reports cannot be written as {fmt}; "
+                         f"use one of: {', '.join(ANALYTICS_FORMATS)}")
+
+    for name in names:
+        title, compute, stem = ANALYTICS_REPORTS[name]
+        frame = compute(conn)
+        output_path = OUTPUT_DIR / f"{stem}{ANALYTICS_FORMATS[fmt]}"
+        if fmt == "csv.gz":
+            frame.to_csv(output_path, index=False, compression="gzip")
+        elif fmt == "parquet":
+            frame.to_parquet(output_path, index=False)
+        else:
+            with open(output_path, "w") as writer:
+                writer.write(f"***** {title} *****\n")
+                writer.write(frame.to_string(index=False) + "\n")
+        print(f"{title} report written: {len(frame)} records")
+        print(f"File created: {output_path}\n")
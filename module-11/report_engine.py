@@ -0,0 +1,188 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 11.1 - Report Engine
+
+Description:
+------------
+Runs report definitions from report_registry against the Bacchus Winery
+database and writes each result through report_export, as the "Label: value"
+text report or a machine-readable format. Streaming (unbuffered cursors) and
+parallel execution over a connection pool are handled here once for every
+registered report. Reports can also run against a local SQLite
+or DuckDB snapshot through common/backends.py. With profiling on, the time spent writing
+each report file is recorded through common/instrument.py.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import os
+import sys
+import time
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common import instrument
+from common.backends import EMBEDDED_ERRORS, connect, missing_tables
+from common.db import get_pool, reconnect_to_db
+
+from report_export import WRITE_BUFFER_SIZE, export_rows, iter_batches, output_file
+
+# Reports are written next to this module
+OUTPUT_DIR = Path(__file__).resolve().parent
+
+# Streaming mode: rows fetched per round-trip, so memory stays flat regardless
+# of table size (the output buffer is report_export.WRITE_BUFFER_SIZE)
+STREAM_BATCH_SIZE = 1000
+
+def iter_rows(cursor, batch_size=STREAM_BATCH_SIZE):
+    """
+    Yields the rows of an executed query one at a time, read in iter_batches()
+    batches so only one batch is held in memory at a time.
+
+    Args:
+        cursor (mysql.connector.cursor.MySQLCursor): A cursor with an executed query.
+        batch_size (int): The number of rows to fetch per round-trip.
+    """
+    for batch in iter_batches(cursor, batch_size):
+        yield from batch
+
+def run_report(conn, report, stream=False, batch_size=None, fmt="text"):
+    """
+    Runs a single report definition on the given connection and writes its file.
+    A report whose required tables (see register_report) are missing runs its
+    fallback query, or without one is skipped with a message naming the command
+    that creates them.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        report (dict): A definition from report_registry.
+        stream (bool): Read rows from the server as they are written (an
+            unbuffered cursor) instead of buffering the whole result first.
+            Machine-readable formats always stream.
+        batch_size (int): Rows per written batch. Defaults to the report's own
+            batch_size, then STREAM_BATCH_SIZE.
+        fmt (str): One of report_export.FORMATS; "text" is the "Label: value" report.
+
+    Returns:
+        int: The number of records written; 0 for a skipped report.
+    """
+    missing = missing_tables(conn, report["requires"]) if report["requires"] else []
+    query = report["fallback"] if missing else report["query"]
+    if query is None:
+        commands = sorted({report["requires"][table] for table in missing})
+        print(f"{report['title']} skipped: {', '.join(missing)} not found "
+              f"(create with {' and '.join(commands)})\n")
+        return 0
+    batch_size = batch_size or report["batch_size"] or STREAM_BATCH_SIZE
+    stream = stream or fmt != "text"
+    cursor = conn.cursor(buffered=False) if stream else conn.cursor()
+    try:
+        cursor.execute(query, report["params"] or None)
+        # In streaming mode the timed block also includes the fetches it drives
+        with instrument.timed("write", report=report["name"], format=fmt) as entry:
+            output_path = OUTPUT_DIR / output_file(report, fmt)
+            count = export_rows(cursor, report, output_path, fmt, batch_size)
+            entry.update(rows=count, bytes=os.path.getsize(output_path))
+        return count
+    finally:
+        cursor.close()
+
+def print_failures(failures, total):
+    """
+    Prints the reports that failed, or the success message when none did.
+    """
+    if failures:
+        print(f"{len(failures)} of {total} reports failed:")
+        for title, err in failures:
+            print(f"  - {title}: {err}")
+    else:
+        print("All reports generated successfully.")
+
+def run_reports(reports, stream=False, batch_size=None, fmt="text", backend=None):
+    """
+    Runs the given reports one after another on a single pooled connection.
+
+    A report that fails with a database error is reported and skipped, so the
+    remaining reports still run, as in parallel mode.
+
+    Args:
+        reports (list): Report definitions to run.
+        stream (bool): Read rows in fetchmany() batches instead of fetchall().
+        batch_size (int): Rows per batch in streaming mode.
+        fmt (str): The output format (see run_report).
+        backend (str): A common/backends.py spec such as "sqlite:bacchus.db";
+            the MySQL server when omitted.
+
+    Returns:
+        list: (title, error) tuples for each report that failed.
+    """
+    failures = []
+    conn = connect(backend) if backend else reconnect_to_db()
+    try:
+        for report in reports:
+            try:
+                run_report(conn, report, stream, batch_size, fmt)
+            except (mysql.connector.Error, *EMBEDDED_ERRORS) as err:
+                failures.append((report["title"], err))
+                print(f"{report['title']} failed: {err}\n")
+                if not conn.is_connected():
+                    break
+    finally:
+        conn.close()
+
+    print_failures(failures, len(reports))
+    return failures
+
+def run_reports_parallel(reports, workers, stream=False, batch_size=None, fmt="text",
+                         backend=None):
+    """
+    Runs the given reports concurrently, each on its own pooled connection, so
+    the total wall time is roughly that of the slowest report instead of the sum.
+
+    Every report is attempted; failures are collected and printed together
+    rather than stopping at the first one.
+
+    Args:
+        reports (list): Report definitions to run.
+        workers (int): The number of worker threads; the shared pool grows to match.
+        stream (bool): Read rows in fetchmany() batches instead of fetchall().
+        batch_size (int): Rows per batch in streaming mode.
+        fmt (str): The output format (see run_report).
+        backend (str): A common/backends.py spec; each report then opens its own
+            embedded connection instead of using the MySQL pool.
+
+    Returns:
+        list: (title, error) tuples for each report that failed.
+    """
+    workers = max(1, workers)
+    pool = None if backend else get_pool(size=workers, raise_on_warnings=True)
+
+    def acquire():
+        return pool.get_connection() if pool else connect(backend)
+
+    def timed_run(report):
+        started = time.perf_counter()
+        conn = acquire()
+        try:
+            run_report(conn, report, stream, batch_size, fmt)
+        finally:
+            conn.close()  # returns a MySQL connection to the pool
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    failures = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(timed_run, report): report for report in reports}
+        for future in as_completed(futures):
+            title = futures[future]["title"]
+            try:
+                print(f"{title} finished in {future.result():.3f}s")
+            except Exception as err:
+                failures.append((title, err))
+                print(f"{title} failed: {err}")
+
+    print(f"Total wall time: {time.perf_counter() - started:.3f}s")
+    print_failures(failures, len(reports))
+    return failures
@@ -0,0 +1,234 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 11.1 - Report Export Formats
+
+Description:
+------------
+Output formats for the report engine. Every format reads the executed query
+the same way, a fetchmany() batch at a time, and differs only in how a batch is
+written. The machine-readable formats give downstream jobs typed columns
+instead of "Label: value" text lines:
+
+- text: the "Label: value" report, one formatted line per row
+- csv.gz / csv.zst: compressed CSV with a header row (csv.zst needs zstandard)
+- arrow: Apache Arrow IPC file (needs pyarrow)
+- parquet: Parquet file, zstd compressed (needs pyarrow)
+
+Text batches are formatted with the report's formatter and written with one
+write() per batch. CSV batches go through
+csv.writer.writerows(); Arrow and Parquet batches are transposed into typed
+column arrays and written as record batches, so no per-row string formatting
+happens. Column names are the report's column labels in snake_case, and column
+types come from the cursor description.
+"""
+
+from pathlib import Path
+import csv
+import gzip
+import io
+import re
+
+from report_registry import format_row
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from mysql.connector import FieldType
+except ImportError:
+    FieldType = None
+
+# Size of the text output file buffer
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Output file suffix per format
+FORMATS = {
+    "text": ".txt",
+    "csv.gz": ".csv.gz",
+    "csv.zst": ".csv.zst",
+    "arrow": ".arrow",
+    "parquet": ".parquet",
+}
+
+def column_names(report):
+    """
+    Returns snake_case column names from the report's column labels.
+    """
+    return [re.sub(r"\W+", "_", label).strip("_").lower() for label, _ in report["columns"]]
+
+def output_file(report, fmt):
+    """
+    Returns the report's file name with the suffix for the given format. Text
+    reports keep their registered file name.
+    """
+    if fmt == "text":
+        return report["file_name"]
+    return Path(report["file_name"]).stem + FORMATS[fmt]
+
+def iter_batches(cursor, batch_size):
+    """
+    Yields the rows of an executed query as fetchmany() batches, so only one
+    batch is held in memory at a time.
+
+    Args:
+        cursor (mysql.connector.cursor.MySQLCursor): A cursor with an executed query.
+        batch_size (int): The number of rows to fetch per round-trip.
+    """
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        yield batch
+
+def arrow_type(type_code):
+    """
+    Maps a MySQL column type code from cursor.description to an Arrow type.
+    DECIMAL columns are exported as float64 for analytics use.
+    """
+    # Embedded backends report no MySQL type codes; their columns export as strings
+    name = (FieldType.get_info(type_code)
+            if FieldType is not None and isinstance(type_code, int) else None)
+    if name in ("TINY", "SHORT", "LONG", "INT24", "LONGLONG", "YEAR"):
+        return pa.int64()
+    if name in ("FLOAT", "DOUBLE", "DECIMAL", "NEWDECIMAL"):
+        return pa.float64()
+    if name == "DATE":
+        return pa.date32()
+    if name in ("DATETIME", "TIMESTAMP"):
+        return pa.timestamp("us")
+    return pa.string()
+
+def arrow_schema(report, cursor):
+    """
+    Returns the Arrow schema for an executed report query: the report's column
+    names with types mapped from the cursor description.
+    """
+    names = column_names(report)
+    return pa.schema([pa.field(name, arrow_type(description[1]))
+                      for name, description in zip(names, cursor.description)])
+
+def to_record_batch(batch, schema):
+    """
+    Transposes a list of row tuples into typed Arrow column arrays.
+    """
+    columns = list(zip(*batch))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_floating(field.type):
+            values = [None if value is None else float(value) for value in values]
+        elif pa.types.is_string(field.type):
+            values = [None if value is None else str(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def write_text(cursor, report, output_path, batch_size, fmt):
+    """
+    Writes the "Label: value" text report: the title line, then each batch of
+    rows formatted by the report's columns.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    with open(output_path, "w", buffering=WRITE_BUFFER_SIZE) as writer:
+        writer.write(f"***** {report['title']} *****\n")
+        for batch in iter_batches(cursor, batch_size):
+            writer.write("".join(format_row(report, row) + "\n" for row in batch))
+            count += len(batch)
+    return count
+
+def write_csv(cursor, report, output_path, batch_size, fmt):
+    """
+    Writes a compressed CSV file with a header row of column names, one
+    csv.writer.writerows() call per batch.
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        RuntimeError: If csv.zst is requested and zstandard is not installed.
+    """
+    if fmt == "csv.gz":
+        writer = gzip.open(output_path, "wt", newline="")
+    else:
+        if zstandard is None:
+            raise RuntimeError("csv.zst output needs the zstandard package")
+        raw = open(output_path, "wb")
+        writer = io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), newline="")
+
+    count = 0
+    with writer:
+        csv_writer = csv.writer(writer, lineterminator="\n")
+        csv_writer.writerow(column_names(report))
+        for batch in iter_batches(cursor, batch_size):
+            csv_writer.writerows(batch)
+            count += len(batch)
+    return count
+
+def write_arrow(cursor, report, output_path, batch_size, fmt):
+    """
+    Writes an Arrow IPC or Parquet file, one typed record batch per fetched batch.
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed.
+    """
+    if pa is None:
+        raise RuntimeError(f"{fmt} output needs the pyarrow package")
+    schema = arrow_schema(report, cursor)
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(output_path, schema, compression="zstd")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_file(str(output_path), schema)
+        write = writer.write_batch
+
+    count = 0
+    try:
+        for batch in iter_batches(cursor, batch_size):
+            write(to_record_batch(batch, schema))
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+def export_rows(cursor, report, output_path, fmt, batch_size):
+    """
+    Writes the rows of an executed report query in one of the FORMATS.
+
+    Args:
+        cursor (mysql.connector.cursor.MySQLCursor): A cursor with the report query executed.
+        report (dict): A definition from report_registry.
+        output_path (Path): The file to write.
+        fmt (str): One of the FORMATS keys.
+        batch_size (int): Rows per fetchmany() batch.
+
+    Returns:
+        int: The number of records written.
+    """
+    if fmt == "text":
+        count = write_text(cursor, report, output_path, batch_size, fmt)
+    elif fmt in ("csv.gz", "csv.zst"):
+        count = write_csv(cursor, report, output_path, batch_size, fmt)
+    elif fmt in ("arrow", "parquet"):
+        count = write_arrow(cursor, report, output_path, batch_size, fmt)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "text":
+        print(f"{report['title']} report written: {count} records")
+    else:
+        print(f"{report['title']} {fmt} export written: {count} records")
+    print(f"File created: {output_path}\n")
+    return count
@@ -0,0 +1,194 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 11.1 - Incremental Reports
+
+Description:
+------------
+Incremental refresh for reports that declare an "incremental" definition in
+report_registry. A high-watermark per report is kept in a small JSON state file;
+later runs fetch only rows past the watermark and merge them into the existing
+report file:
+
+- append mode adds new history rows (Employee Weekly Hours) to the end of the file.
+- upsert mode replaces or removes changed rows by key (inventory reports), so
+  items that rise above a threshold drop out of the report.
+
+A full rebuild happens when the state or report file is missing, or when the
+report query or the columns of its tables have changed since the last run.
+Upsert mode relies on writers setting LastUpdated and does not see deletes;
+use --rebuild after bulk deletes.
+
+Append mode also stores the size of the report file. A run that stops after
+appending rows but before saving the new watermark leaves those rows past the
+stored size; the next run cuts the file back to that size before appending, so
+the rows are fetched again without being duplicated.
+"""
+
+import hashlib
+import json
+import os
+
+from report_engine import OUTPUT_DIR, WRITE_BUFFER_SIZE, iter_rows, run_report
+from report_registry import format_row
+
+STATE_FILE = OUTPUT_DIR / "report_state.json"
+
+def load_state(path=STATE_FILE):
+    """
+    Loads the per-report watermark state, or an empty state if the file is
+    missing or unreadable.
+
+    Args:
+        path (Path): The state file location.
+    """
+    try:
+        with open(path) as reader:
+            return json.load(reader)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state, path=STATE_FILE):
+    """
+    Writes the watermark state, replacing the old file atomically so an
+    interrupted run never leaves a half-written state behind.
+
+    Args:
+        state (dict): The per-report state.
+        path (Path): The state file location.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as writer:
+        json.dump(state, writer, indent=2)
+    os.replace(temp_path, path)
+
+def report_fingerprint(conn, report):
+    """
+    Returns a hash of the report's incremental definition and the current column
+    definitions of its tables, used to detect when a full rebuild is needed.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        report (dict): A definition from report_registry.
+    """
+    digest = hashlib.sha256()
+    digest.update(report["incremental"]["query"].encode())
+    digest.update(repr([label for label, _ in report["columns"]]).encode())
+    digest.update(repr(sorted(report["params"].items())).encode())
+
+    if report["tables"]:
+        placeholders = ", ".join(["%s"] * len(report["tables"]))
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({placeholders})
+            ORDER BY TABLE_NAME, ORDINAL_POSITION;
+        """, report["tables"])
+        digest.update(repr(cursor.fetchall()).encode())
+        cursor.close()
+    return digest.hexdigest()
+
+def to_json_value(value):
+    """
+    Converts a watermark value to something the JSON state file can hold.
+    Dates and timestamps are stored as strings, which MySQL compares correctly.
+    """
+    return value if isinstance(value, (int, float, str)) or value is None else str(value)
+
+def run_incremental(conn, report, state, batch_size=None, rebuild=False):
+    """
+    Refreshes one report from its watermark and updates its entry in state.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        report (dict): A definition from report_registry with an incremental definition.
+        state (dict): The per-report state, updated in place.
+        batch_size (int): Rows per fetchmany() batch.
+        rebuild (bool): Ignore the stored watermark and rebuild the whole report.
+
+    Returns:
+        int: The number of records in the report after the refresh.
+    """
+    incremental = report["incremental"]
+    output_path = os.path.join(OUTPUT_DIR, report["file_name"])
+    fingerprint = report_fingerprint(conn, report)
+    entry = state.get(report["name"])
+
+    full = (rebuild or entry is None or entry.get("fingerprint") != fingerprint
+            or not os.path.exists(output_path))
+    if not full and incremental["mode"] == "append":
+        # Drop rows appended after the last saved watermark, or rebuild when
+        # the file is shorter than recorded (or the state predates sizes)
+        size = entry.get("size")
+        if size is None or os.path.getsize(output_path) < size:
+            full = True
+        elif os.path.getsize(output_path) > size:
+            os.truncate(output_path, size)
+    watermark = incremental["initial"] if full else entry["watermark"]
+
+    cursor = conn.cursor(buffered=False)
+    cursor.execute(incremental["query"], {**report["params"], "watermark": watermark})
+    rows = iter_rows(cursor, batch_size or report["batch_size"] or 1000)
+    changed = 0
+
+    if incremental["mode"] == "append":
+        count = 0 if full else entry["count"]
+        with open(output_path, "w" if full else "a", buffering=WRITE_BUFFER_SIZE) as writer:
+            if full:
+                writer.write(f"***** {report['title']} *****\n")
+            for row in rows:
+                writer.write(format_row(report, row) + "\n")
+                watermark = row[-1]
+                changed += 1
+        count += changed
+        new_entry = {"count": count, "size": os.path.getsize(output_path)}
+    else:
+        lines = {} if full else entry["lines"]
+        keep = incremental.get("keep")
+        for row in rows:
+            key = str(row[-2])
+            if keep is None or keep(row, report["params"]):
+                lines[key] = format_row(report, row)
+            else:
+                lines.pop(key, None)
+            watermark = row[-1]
+            changed += 1
+        with open(output_path, "w", buffering=WRITE_BUFFER_SIZE) as writer:
+            writer.write(f"***** {report['title']} *****\n")
+            for line in lines.values():
+                writer.write(line + "\n")
+        count = len(lines)
+        new_entry = {"count": count, "lines": lines}
+
+    cursor.close()
+    state[report["name"]] = {"fingerprint": fingerprint,
+                             "watermark": to_json_value(watermark), **new_entry}
+
+    action = "rebuilt" if full else "updated"
+    print(f"{report['title']} report {action}: {changed} new/changed rows, {count} records")
+    print(f"File created: {output_path}\n")
+    return count
+
+def run_reports_incremental(conn, reports, batch_size=None, rebuild=False, state_path=STATE_FILE):
+    """
+    Runs the given reports incrementally on one connection. Reports without an
+    incremental definition are regenerated in full. State is saved after each
+    report so an interrupted run keeps the progress already made.
+
+    Args:
+        conn (mysql.connector.connection.MySQLConnection): An open database connection.
+        reports (list): Report definitions to run.
+        batch_size (int): Rows per fetchmany() batch.
+        rebuild (bool): Ignore stored watermarks and rebuild every report.
+        state_path (Path): The state file location.
+    """
+    state = load_state(state_path)
+    for report in reports:
+        if report["incremental"]:
+            run_incremental(conn, report, state, batch_size, rebuild)
+            save_state(state, state_path)
+        else:
+            run_report(conn, report, stream=True, batch_size=batch_size)
+
+    print("All reports generated successfully.")
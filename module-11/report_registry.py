@@ -0,0 +1,472 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 11.1 - Report Registry
+
+Description:
+------------
+Declarative definitions for the Bacchus Winery reports. Each report is a
+name, a title, an SQL query with optional parameters, the labelled columns
+used to format each row, and the output file. The report engine runs these
+definitions, so adding a report means adding a register_report() call here.
+
+Reports over the date-partitioned EmployeeHours and WineOrders tables take a
+start/end date window, so MySQL only reads the partitions inside the window.
+"""
+
+from datetime import date, timedelta
+
+# Days covered by the date-window reports unless --since/--until are given
+WINDOW_DAYS = 90
+
+# Rolling windows, in days, of the supplier performance report
+SUPPLIER_WINDOWS = (30, 90, 365)
+
+# Registered reports keyed by name, in registration order
+REPORTS = {}
+
+def register_report(name, title, query, columns, file_name, params=None, batch_size=None,
+                    tables=None, incremental=None, hot_only=False, requires=None,
+                    fallback=None):
+    """
+    Adds a report definition to the registry.
+
+    Args:
+        name (str): Short identifier used on the command line.
+        title (str): The report header written to the output file.
+        query (str): The SQL query to run.
+        columns (list): (label, formatter) tuples, one per selected column. The
+            formatter takes the column value and returns a string; None uses str().
+        file_name (str): The name of the output file.
+        params (dict): Optional query parameters passed to cursor.execute().
+        batch_size (int): Optional fetchmany() batch size for this report in
+            streaming mode, overriding the engine default.
+        tables (list): Base tables the query reads from.
+        incremental (dict): Optional incremental-refresh definition used by
+            report_incremental. Keys:
+                mode: "append" for immutable history rows, or "upsert" for keyed
+                    rows that can change or drop out of the report.
+                query: SQL selecting the display columns followed by the
+                    row key (upsert mode only) and the watermark column, for
+                    rows past %(watermark)s.
+                initial: The watermark value that selects every row.
+                keep: Upsert mode only; a predicate taking (row, params) that
+                    decides whether the row belongs in the report.
+        hot_only (bool): Never read archived rows, even when the report creator
+            is run with --include-archive.
+        requires (dict): Tables outside the base schema that the query reads,
+            mapped to the command that creates them. The engine skips the
+            report with that hint when one is missing.
+        fallback (str): Optional query over the base tables that the engine runs
+            instead of skipping the report when a required table is missing.
+
+    Returns:
+        dict: The registered report definition.
+    """
+    if name in REPORTS:
+        raise ValueError(f"Report already registered: {name}")
+    REPORTS[name] = {
+        "name": name,
+        "title": title,
+        "query": query,
+        "columns": columns,
+        "file_name": file_name,
+        "params": params or {},
+        "batch_size": batch_size,
+        "tables": tables or [],
+        "incremental": incremental,
+        "hot_only": hot_only,
+        "requires": requires or {},
+        "fallback": fallback,
+    }
+    return REPORTS[name]
+
+def format_row(report, row):
+    """
+    Formats a result row as "Label: value, Label: value, ..." using the
+    report's column definitions.
+
+    Args:
+        report (dict): A registered report definition.
+        row (tuple): A query result row.
+    """
+    return ", ".join(
+        f"{label}: {formatter(value) if formatter else value}"
+        for (label, formatter), value in zip(report["columns"], row)
+    )
+
+def get_reports(names=None):
+    """
+    Returns report definitions by name, or all reports when no names are given.
+
+    Args:
+        names (list): Optional report names to select.
+
+    Raises:
+        KeyError: If a name does not match a registered report.
+    """
+    if not names:
+        return list(REPORTS.values())
+    unknown = [name for name in names if name not in REPORTS]
+    if unknown:
+        raise KeyError(f"Unknown report(s): {', '.join(unknown)}. "
+                       f"Available: {', '.join(REPORTS)}")
+    return [REPORTS[name] for name in names]
+
+def date_window(days=WINDOW_DAYS, end=None):
+    """
+    Returns {"start": ..., "end": ...} parameters for the `days` days before
+    end (today by default). The end date is exclusive.
+    """
+    end = end or date.today() + timedelta(days=1)
+    return {"start": end - timedelta(days=days), "end": end}
+
+def supplier_windows(days=SUPPLIER_WINDOWS, today=None):
+    """
+    Returns the parameters for the supplier performance report: today and the
+    first delivery date of each rolling window, as since_<days>.
+    """
+    today = today or date.today()
+    return {"today": today, **{f"since_{window}": today - timedelta(days=window)
+                               for window in days}}
+
+def with_window(reports, since=None, until=None):
+    """
+    Returns the reports with the date window of windowed reports replaced. The
+    supplier performance windows end at until when it is given. Other reports
+    are returned unchanged.
+
+    Args:
+        reports (list): Report definitions.
+        since (datetime.date): First date to include. With only until given,
+            the window covers the WINDOW_DAYS days ending at until.
+        until (datetime.date): Last date to include.
+    """
+    if since is None and until is None:
+        return reports
+    window = {}
+    if since is None:
+        since = until - timedelta(days=WINDOW_DAYS - 1)
+    window["start"] = since
+    if until is not None:
+        window["end"] = until + timedelta(days=1)
+    windowed = []
+    for report in reports:
+        if "start" in report["params"]:
+            report = dict(report, params={**report["params"], **window})
+        elif "today" in report["params"] and until is not None:
+            report = dict(report, params={**report["params"],
+                                          **supplier_windows(today=until + timedelta(days=1))})
+        windowed.append(report)
+    return windowed
+
+# ----------------------
+# Report 1: Pending Wine Orders
+# ----------------------
+register_report(
+    "pending_wine_orders",
+    "Pending Wine Orders",
+    """
+        SELECT Distributor.Name, Wine.Name, WineOrders.Quantity, WineOrders.OrderDate
+        FROM WineOrders
+        JOIN Distributor ON WineOrders.DistributorID = Distributor.DistributorID
+        JOIN Wine ON WineOrders.WineID = Wine.WineID
+        WHERE WineOrders.OrderStatus = %(status)s;
+    """,
+    [("Distributor", None), ("Wine", None), ("Quantity", None), ("Ordered On", None)],
+    "bacchus_pending_wine_report.txt",
+    params={"status": "Pending"},
+    tables=["WineOrders", "Distributor", "Wine"],
+    hot_only=True,
+)
+
+# ----------------------
+# Report 2: Low Supply Inventory
+# ----------------------
+# Reads the per-supply-type stock kept by bacchus_summaries.py, one row per
+# supply type; without the summaries it scans SupplyInventory instead
+register_report(
+    "low_supply_inventory",
+    "Low Supply Inventory",
+    """
+        SELECT SupplyType.Description, SupplyStockLevels.QuantityOnHand
+        FROM SupplyStockLevels
+        JOIN SupplyType ON SupplyStockLevels.SupplyTypeID = SupplyType.SupplyTypeID
+        WHERE SupplyStockLevels.QuantityOnHand < %(threshold)s;
+    """,
+    [("Supply", None), ("Quantity On Hand", None)],
+    "bacchus_low_supply_inventory_report.txt",
+    params={"threshold": 100},
+    tables=["SupplyInventory", "SupplyType"],
+    requires={"SupplyStockLevels": "module-10/bacchus_summaries.py install"},
+    fallback="""
+        SELECT SupplyType.Description, SupplyInventory.QuantityOnHand
+        FROM SupplyInventory
+        JOIN SupplyType ON SupplyInventory.SupplyTypeID = SupplyType.SupplyTypeID
+        WHERE SupplyInventory.QuantityOnHand < %(threshold)s;
+    """,
+    incremental={
+        "mode": "upsert",
+        "query": """
+            SELECT SupplyType.Description, SupplyInventory.QuantityOnHand,
+                   SupplyInventory.SupplyInventoryID, SupplyInventory.LastUpdated
+            FROM SupplyInventory
+            JOIN SupplyType ON SupplyInventory.SupplyTypeID = SupplyType.SupplyTypeID
+            WHERE SupplyInventory.LastUpdated >= %(watermark)s
+            ORDER BY SupplyInventory.LastUpdated;
+        """,
+        "initial": "1970-01-01 00:00:01",
+        "keep": lambda row, params: row[1] < params["threshold"],
+    },
+    hot_only=True,
+)
+
+# ----------------------
+# Report 3: Employee Weekly Hours
+# ----------------------
+register_report(
+    "employee_weekly_hours",
+    "Employee Weekly Hours",
+    """
+        SELECT Employee.Name, EmployeeHours.Week, EmployeeHours.HoursWorked
+        FROM EmployeeHours
+        JOIN Employee ON EmployeeHours.EmployeeID = Employee.EmployeeID;
+    """,
+    [("Employee", None), ("Week", None), ("Hours Worked", None)],
+    "bacchus_employee_weekly_hours_report.txt",
+    tables=["EmployeeHours", "Employee"],
+    incremental={
+        "mode": "append",
+        "query": """
+            SELECT Employee.Name, EmployeeHours.Week, EmployeeHours.HoursWorked,
+                   EmployeeHours.RecordID
+            FROM EmployeeHours
+            JOIN Employee ON EmployeeHours.EmployeeID = Employee.EmployeeID
+            WHERE EmployeeHours.RecordID > %(watermark)s
+            ORDER BY EmployeeHours.RecordID;
+        """,
+        "initial": 0,
+    },
+)
+
+# ----------------------
+# Report 4: Wine Inventory
+# ----------------------
+register_report(
+    "wine_inventory",
+    "Wine Inventory",
+    """
+        SELECT Wine.Name, Wine.Type, WineInventory.QuantityOnHand, WineInventory.LastUpdated
+        FROM WineInventory
+        JOIN Wine ON WineInventory.WineID = Wine.WineID;
+    """,
+    [("Wine", None), ("Type", None), ("Quantity On Hand", None), ("Last Updated", None)],
+    "bacchus_wine_inventory_report.txt",
+    tables=["WineInventory", "Wine"],
+    incremental={
+        "mode": "upsert",
+        "query": """
+            SELECT Wine.Name, Wine.Type, WineInventory.QuantityOnHand, WineInventory.LastUpdated,
+                   WineInventory.WineInventoryID, WineInventory.LastUpdated
+            FROM WineInventory
+            JOIN Wine ON WineInventory.WineID = Wine.WineID
+            WHERE WineInventory.LastUpdated >= %(watermark)s
+            ORDER BY WineInventory.LastUpdated;
+        """,
+        "initial": "1970-01-01 00:00:01",
+    },
+)
+
+# ----------------------
+# Report 5: Late Supply Shipments
+# ----------------------
+register_report(
+    "late_supply_shipments",
+    "Late Supply Shipments",
+    """
+        SELECT Supplier.Name, SupplyType.Description, SupplyShipment.ExpectedDeliveryDate,
+               SupplyShipment.ActualDeliveryDate
+        FROM SupplyShipment
+        JOIN Supplier ON SupplyShipment.SupplierID = Supplier.SupplierID
+        JOIN SupplyType ON SupplyShipment.SupplyTypeID = SupplyType.SupplyTypeID
+        WHERE SupplyShipment.ActualDeliveryDate > SupplyShipment.ExpectedDeliveryDate
+           OR (SupplyShipment.ActualDeliveryDate IS NULL
+               AND SupplyShipment.ExpectedDeliveryDate < CURDATE());
+    """,
+    [("Supplier", None), ("Supply", None), ("Expected", None),
+     ("Delivered", lambda value: value or "Outstanding")],
+    "bacchus_late_supply_shipments_report.txt",
+    tables=["SupplyShipment", "Supplier", "SupplyType"],
+)
+
+# ----------------------
+# Report 6: Recent Employee Hours
+# ----------------------
+register_report(
+    "recent_employee_hours",
+    "Recent Employee Hours",
+    """
+        SELECT Employee.Name, EmployeeHours.Week, EmployeeHours.HoursWorked
+        FROM EmployeeHours
+        JOIN Employee ON EmployeeHours.EmployeeID = Employee.EmployeeID
+        WHERE EmployeeHours.Week >= %(start)s AND EmployeeHours.Week < %(end)s;
+    """,
+    [("Employee", None), ("Week", None), ("Hours Worked", None)],
+    "bacchus_recent_employee_hours_report.txt",
+    params=date_window(),
+    tables=["EmployeeHours", "Employee"],
+)
+
+# ----------------------
+# Report 7: Recent Wine Orders
+# ----------------------
+register_report(
+    "recent_wine_orders",
+    "Recent Wine Orders",
+    """
+        SELECT Distributor.Name, Wine.Name, WineOrders.Quantity, WineOrders.OrderDate,
+               WineOrders.OrderStatus
+        FROM WineOrders
+        JOIN Distributor ON WineOrders.DistributorID = Distributor.DistributorID
+        JOIN Wine ON WineOrders.WineID = Wine.WineID
+        WHERE WineOrders.OrderDate >= %(start)s AND WineOrders.OrderDate < %(end)s;
+    """,
+    [("Distributor", None), ("Wine", None), ("Quantity", None), ("Ordered On", None),
+     ("Status", None)],
+    "bacchus_recent_wine_orders_report.txt",
+    params=date_window(),
+    tables=["WineOrders", "Distributor", "Wine"],
+)
+
+# ----------------------
+# Reports 8-10: Supplier Delivery Performance
+# ----------------------
+# Read the SupplierLateness histogram and SupplierOutstanding counts kept by
+# the bacchus_summaries.py triggers, so their cost grows with suppliers and days,
+# not shipments. Percentiles are the first DaysLate bucket whose running count
+# reaches 50% / 95% of the deliveries. Archived shipments leave the histogram,
+# so keep the archive retention longer than the longest window.
+
+# Grouping key -> the lookup table and column that name it
+SUPPLIER_KEYS = {
+    "SupplierID": ("Supplier", "Name"),
+    "SupplyTypeID": ("SupplyType", "Description"),
+}
+
+# Created by bacchus_summaries.py install; the reports are skipped without them
+SUPPLIER_SUMMARIES = {
+    "SupplierLateness": "module-10/bacchus_summaries.py install",
+    "SupplierOutstanding": "module-10/bacchus_summaries.py install",
+}
+
+def supplier_performance_query(keys):
+    """
+    Returns the supplier performance query grouped by the given SUPPLIER_KEYS.
+    Every key combination found in either summary gets a row per window, so a
+    supplier with only outstanding shipments is listed with 0 deliveries.
+
+    Args:
+        keys (list): SupplierID and/or SupplyTypeID.
+    """
+    key_list = ", ".join(keys)
+
+    def match(left, right):
+        return " AND ".join(f"{left}.{key} = {right}.{key}" for key in keys)
+
+    windows = "\n            UNION ALL ".join(
+        f"SELECT {days} AS WindowDays, %(since_{days})s AS Since" for days in SUPPLIER_WINDOWS)
+    names = ", ".join(f"{table}.{column}" for table, column in
+                      (SUPPLIER_KEYS[key] for key in keys))
+    joins = "\n        ".join(f"JOIN {SUPPLIER_KEYS[key][0]} ON k.{key} = {SUPPLIER_KEYS[key][0]}.{key}"
+                              for key in keys)
+    return f"""
+        WITH windows AS (
+            {windows}
+        ),
+        report_keys AS (
+            SELECT {key_list} FROM SupplierLateness
+            UNION SELECT {key_list} FROM SupplierOutstanding
+        ),
+        buckets AS (
+            SELECT w.WindowDays, {", ".join(f"l.{key}" for key in keys)}, l.DaysLate,
+                   SUM(l.Shipments) AS Shipments
+            FROM windows w
+            JOIN SupplierLateness l ON l.DeliveryDate >= w.Since
+            GROUP BY w.WindowDays, {", ".join(f"l.{key}" for key in keys)}, l.DaysLate
+        ),
+        ranked AS (
+            SELECT WindowDays, {key_list}, DaysLate, Shipments,
+                   SUM(Shipments) OVER (PARTITION BY WindowDays, {key_list}
+                                        ORDER BY DaysLate) AS Running,
+                   SUM(Shipments) OVER (PARTITION BY WindowDays, {key_list}) AS Delivered
+            FROM buckets
+        ),
+        delivered AS (
+            SELECT WindowDays, {key_list}, MAX(Delivered) AS Delivered,
+                   ROUND(1.0 * SUM(DaysLate * Shipments) / MAX(Delivered), 2) AS MeanDaysLate,
+                   MIN(CASE WHEN Running >= 0.5 * Delivered THEN DaysLate END) AS P50,
+                   MIN(CASE WHEN Running >= 0.95 * Delivered THEN DaysLate END) AS P95,
+                   ROUND(100.0 * SUM(CASE WHEN DaysLate <= 0 THEN Shipments ELSE 0 END)
+                         / MAX(Delivered), 1) AS OnTime
+            FROM ranked
+            GROUP BY WindowDays, {key_list}
+        ),
+        outstanding AS (
+            SELECT {key_list}, SUM(Shipments) AS Outstanding,
+                   SUM(CASE WHEN ExpectedDeliveryDate < %(today)s THEN Shipments ELSE 0 END)
+                       AS Overdue
+            FROM SupplierOutstanding
+            GROUP BY {key_list}
+        )
+        SELECT {names}, w.WindowDays, COALESCE(d.Delivered, 0), d.MeanDaysLate, d.P50, d.P95,
+               d.OnTime, COALESCE(o.Outstanding, 0), COALESCE(o.Overdue, 0)
+        FROM report_keys k
+        CROSS JOIN windows w
+        {joins}
+        LEFT JOIN delivered d ON d.WindowDays = w.WindowDays AND {match("d", "k")}
+        LEFT JOIN outstanding o ON {match("o", "k")}
+        ORDER BY {names}, w.WindowDays;
+    """
+
+def no_deliveries(value):
+    # Delivery statistics are NULL for a window without deliveries
+    return "-" if value is None else value
+
+SUPPLIER_COLUMNS = [("Window", lambda days: f"{days} days"),
+                    ("Delivered", None), ("Mean Days Late", no_deliveries),
+                    ("P50", no_deliveries), ("P95", no_deliveries),
+                    ("On Time", lambda rate: "-" if rate is None else f"{rate}%"),
+                    ("Outstanding", None), ("Overdue", None)]
+
+register_report(
+    "supplier_performance",
+    "Supplier Delivery Performance",
+    supplier_performance_query(["SupplierID", "SupplyTypeID"]),
+    [("Supplier", None), ("Supply", None)] + SUPPLIER_COLUMNS,
+    "bacchus_supplier_performance_report.txt",
+    params=supplier_windows(),
+    tables=["SupplierLateness", "SupplierOutstanding", "Supplier", "SupplyType"],
+    requires=SUPPLIER_SUMMARIES,
+)
+
+register_report(
+    "supplier_performance_by_supplier",
+    "Supplier Delivery Performance by Supplier",
+    supplier_performance_query(["SupplierID"]),
+    [("Supplier", None)] + SUPPLIER_COLUMNS,
+    "bacchus_supplier_performance_by_supplier_report.txt",
+    params=supplier_windows(),
+    tables=["SupplierLateness", "SupplierOutstanding", "Supplier"],
+    requires=SUPPLIER_SUMMARIES,
+)
+
+register_report(
+    "supplier_performance_by_supply",
+    "Supplier Delivery Performance by Supply Type",
+    supplier_performance_query(["SupplyTypeID"]),
+    [("Supply", None)] + SUPPLIER_COLUMNS,
+    "bacchus_supplier_performance_by_supply_report.txt",
+    params=supplier_windows(),
+    tables=["SupplierLateness", "SupplierOutstanding", "SupplyType"],
+    requires=SUPPLIER_SUMMARIES,
+)
@@ -6,25 +6,18 @@ init()
 import mysql.connector # to connect
 from mysql.connector import errorcode
 
-import dotenv # to use .env file
-from dotenv import dotenv_values
-
-#using our .env file
-secrets = dotenv_values(".env")
+import sys # to find the shared database module
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.db import connection_settings, get_connection # reads our .env file once
 
 """ database config object """
-config = {
-    "user": secrets["USER"],
-    "password": secrets["PASSWORD"],
-    "host": secrets["HOST"],
-    "database": secrets["DATABASE"],
-    "raise_on_warnings": True #not in .env file
-}
+config = connection_settings(raise_on_warnings=True) #raise_on_warnings not in .env file
 
 try:
     """ try/catch block for handling potential MySQL database errors """ 
 
-    db = mysql.connector.connect(**config) # connect to the movies database 
+    db = get_connection(raise_on_warnings=True) # connect to the movies database 
     
     # output the connection status 
     # print("\n  Database user {} connected to MySQL on host {} with database {}.".format(config["user"], config["host"], config["database"]))
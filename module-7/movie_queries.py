@@ -5,19 +5,22 @@ CSD310 Module 7.2 Assignment: Movies: Table Queries
 '''
 
 import mysql.connector
-from dotenv import dotenv_values
-from colorama import Fore, Style, init
-import os
+from colorama import init
+from pathlib import Path
+import argparse
+import sys
+
+# Shared database access (reads .env once and pools connections)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.async_runner import QUERY_ERRORS, run_queries_concurrently
+from common.backends import EMBEDDED_ERRORS, connect
+from common.cache import get_default_cache
+from common.db import get_connection
+from common.render import STYLES, Renderer
 
 # Initialize colorama for color support in terminal
 init()
 
-# Constants for environment variable keys
-USER_KEY = "USER"
-PASSWORD_KEY = "PASSWORD"
-HOST_KEY = "HOST"
-DATABASE_KEY = "DATABASE"
-
 # Constants for database queries
 STUDIO_QUERY = "SELECT studio_id, studio_name FROM studio"
 GENRE_QUERY = "SELECT genre_id, genre_name FROM genre"
@@ -26,154 +29,189 @@ DIRECTOR_QUERY = """
     SELECT film_name, film_director
     FROM film
     WHERE film_name IN ('Get Out', 'Gladiator', 'Alien')
-    ORDER BY FIELD(film_name, 'Get Out', 'Gladiator', 'Alien')
+    ORDER BY CASE film_name WHEN 'Get Out' THEN 1 WHEN 'Gladiator' THEN 2 ELSE 3 END
 """
 
-def load_secrets():
-    """
-    Load database credentials from a .env file.
-
-    Returns:
-        dict: A dictionary containing the database credentials (user, password, host, database).
-              Exits the program if any required variable is missing.
-    """
-    secrets = dotenv_values(".env")
-
-    # Check if all required environment variables are present
-    required_vars = [USER_KEY, PASSWORD_KEY, HOST_KEY, DATABASE_KEY]
-    for var in required_vars:
-        if var not in secrets:
-            print(f"Error: Missing {var} in .env file")
-            exit(1)
-
-    return secrets
-
-def connect_to_database(db_config):
+def connect_to_database(backend=None):
     """
-    Establish a connection to the MySQL database.
+    Get a pooled connection to the MySQL database configured in the .env file,
+    or a connection to a local snapshot.
 
     Args:
-        db_config (dict): A dictionary containing the database connection parameters.
+        backend (str): Optional common/backends.py spec such as sqlite:movies.db.
 
     Returns:
         tuple: A tuple containing the database connection object and the cursor object.
-               Exits the program if a connection error occurs.
+               Exits the program if the .env file is missing or incomplete, or a
+               connection error occurs.
     """
     try:
-        # Connect to the MySQL database using the provided configuration
-        db = mysql.connector.connect(**db_config)
+        db = connect(backend) if backend else get_connection()
         cursor = db.cursor()
         return db, cursor
-    except mysql.connector.Error as err:
+    except (FileNotFoundError, KeyError, ValueError, RuntimeError, mysql.connector.Error,
+            *EMBEDDED_ERRORS) as err:
         print(f"Error: {err}")
         exit(1)
 
-def print_header(title):
+def print_header(title, renderer=None):
     """
     Prints a formatted header for each section of the output.
 
     Args:
         title (str): The title of the section to be displayed.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
     """
-    print(f"\n{Fore.CYAN}-- DISPLAYING {title.upper()} RECORDS --{Style.RESET_ALL}\n")
+    (renderer or Renderer()).header(f"-- DISPLAYING {title.upper()} RECORDS --")
 
-def fetch_and_display_studios(cursor, query):
+def display_studios(studio_records, renderer=None):
+    """
+    Displays studio records in the specified format.
+
+    Args:
+        studio_records (list): Rows returned by the studio query.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
+    """
+    renderer = renderer or Renderer()
+    print_header("Studio", renderer)
+    renderer.rows(("Studio ID", "Studio Name"), studio_records)
+
+def fetch_and_display_studios(cursor, query, renderer=None):
     """
     Fetches and displays studio records in the specified format.
 
     Args:
         cursor (mysql.connector.cursor.MySQLCursor): The database cursor object.
         query (str): The SQL query to execute.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
     """
-    print_header("Studio")
-    cursor.execute(query)
-    studio_records = cursor.fetchall()
-    for record in studio_records:
-        print(f"Studio ID: {Fore.GREEN}{record[0]}{Style.RESET_ALL}")
-        print(f"Studio Name: {Fore.YELLOW}{record[1]}{Style.RESET_ALL}")
-        print()
+    display_studios(get_default_cache().fetchall(cursor, query), renderer)
 
-def fetch_and_display_genres(cursor, query):
+def display_genres(genre_records, renderer=None):
+    """
+    Displays genre records in the specified format.
+
+    Args:
+        genre_records (list): Rows returned by the genre query.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
+    """
+    renderer = renderer or Renderer()
+    print_header("Genre", renderer)
+    renderer.rows(("Genre ID", "Genre Name"), genre_records)
+
+def fetch_and_display_genres(cursor, query, renderer=None):
     """
     Fetches and displays genre records in the specified format.
 
     Args:
         cursor (mysql.connector.cursor.MySQLCursor): The database cursor object.
         query (str): The SQL query to execute.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
     """
-    print_header("Genre")
-    cursor.execute(query)
-    genre_records = cursor.fetchall()
-    for record in genre_records:
-        print(f"Genre ID: {Fore.GREEN}{record[0]}{Style.RESET_ALL}")
-        print(f"Genre Name: {Fore.YELLOW}{record[1]}{Style.RESET_ALL}")
-        print()
+    display_genres(get_default_cache().fetchall(cursor, query), renderer)
 
-def fetch_and_display_short_films(cursor, query):
+def display_short_films(short_film_records, renderer=None):
+    """
+    Displays short film records in the specified format.
+
+    Args:
+        short_film_records (list): Rows returned by the short film query.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
+    """
+    renderer = renderer or Renderer()
+    print_header("Short Film", renderer)
+    renderer.rows(("Film Name", "Runtime"), short_film_records)
+
+def fetch_and_display_short_films(cursor, query, renderer=None):
     """
     Fetches and displays short film records in the specified format.
 
     Args:
         cursor (mysql.connector.cursor.MySQLCursor): The database cursor object.
         query (str): The SQL query to execute.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
+    """
+    display_short_films(get_default_cache().fetchall(cursor, query), renderer)
+
+def display_directors(director_records, renderer=None):
+    """
+    Displays director records in the specified format and order.
+
+    Args:
+        director_records (list): Rows returned by the director query.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
     """
-    print_header("Short Film")
-    cursor.execute(query)
-    short_film_records = cursor.fetchall()
-    for record in short_film_records:
-        print(f"Film Name: {Fore.GREEN}{record[0]}{Style.RESET_ALL}")
-        print(f"Runtime: {Fore.YELLOW}{record[1]}{Style.RESET_ALL}")
-        print()
+    renderer = renderer or Renderer()
+    renderer.header("-- DISPLAYING DIRECTOR RECORDS IN ORDER --")
+    renderer.rows(("Film Name", "Director"), director_records)
 
-def fetch_and_display_directors(cursor, query):
+def fetch_and_display_directors(cursor, query, renderer=None):
     """
     Fetches and displays director records in the specified format and order.
 
     Args:
         cursor (mysql.connector.cursor.MySQLCursor): The database cursor object.
         query (str): The SQL query to execute.
+        renderer (Renderer): Output style; chosen from stdout when omitted.
     """
-    print(f"\n{Fore.CYAN}-- DISPLAYING DIRECTOR RECORDS IN ORDER --{Style.RESET_ALL}\n")
-    cursor.execute(query)
-    director_records = cursor.fetchall()
-    for record in director_records:
-        print(f"Film Name: {Fore.GREEN}{record[0]}{Style.RESET_ALL}")
-        print(f"Director: {Fore.YELLOW}{record[1]}{Style.RESET_ALL}")
-        print()
+    display_directors(get_default_cache().fetchall(cursor, query), renderer)
+
+def main_concurrent(renderer=None):
+    """
+    Runs the four queries concurrently, then displays the results in the usual order.
+
+    Args:
+        renderer (Renderer): Output style; chosen from stdout when omitted.
+    """
+    try:
+        studios, genres, short_films, directors = run_queries_concurrently(
+            [STUDIO_QUERY, GENRE_QUERY, SHORT_FILM_QUERY, DIRECTOR_QUERY])
+    except (FileNotFoundError, KeyError, *QUERY_ERRORS) as err:
+        print(f"Error while fetching records: {err}")
+        return
+
+    display_studios(studios, renderer)
+    display_genres(genres, renderer)
+    display_short_films(short_films, renderer)
+    display_directors(directors, renderer)
 
 def main():
     """
-    Main function to load secrets, connect to the database, and display the results of the four queries
+    Main function to connect to the database and display the results of the four queries
     in a format that matches the provided image.
     """
-    # Load database credentials
-    secrets = load_secrets()
-
-    # Prepare database configuration
-    db_config = {
-        "user": secrets[USER_KEY],
-        "password": secrets[PASSWORD_KEY],
-        "host": secrets[HOST_KEY],
-        "database": secrets[DATABASE_KEY],
-    }
+    parser = argparse.ArgumentParser(description="Display the movies table queries.")
+    parser.add_argument("--async", dest="concurrent", action="store_true",
+                        help="send the four queries concurrently (MySQL only)")
+    parser.add_argument("--backend", default=None, metavar="SPEC",
+                        help="mysql (default), sqlite:PATH or duckdb:PATH snapshot")
+    parser.add_argument("--format", choices=STYLES, default=None,
+                        help="output style (default: records on a terminal, plain otherwise)")
+    args = parser.parse_args()
+    if args.concurrent and args.backend not in (None, "mysql"):
+        parser.error("--async only runs against MySQL; drop --backend or --async")
+    renderer = Renderer(args.format)
+    if args.concurrent:
+        main_concurrent(renderer)
+        return
 
     # Connect to the database
-    db, cursor = connect_to_database(db_config)
+    db, cursor = connect_to_database(args.backend)
 
     try:
         # First Query: Select all fields from the studio table
-        fetch_and_display_studios(cursor, STUDIO_QUERY)
+        fetch_and_display_studios(cursor, STUDIO_QUERY, renderer)
 
         # Second Query: Select all fields from the genre table
-        fetch_and_display_genres(cursor, GENRE_QUERY)
+        fetch_and_display_genres(cursor, GENRE_QUERY, renderer)
 
         # Third Query: Select movie names and runtime for short films
-        fetch_and_display_short_films(cursor, SHORT_FILM_QUERY)
+        fetch_and_display_short_films(cursor, SHORT_FILM_QUERY, renderer)
 
         # Fourth Query: Get film names and directors in the specified order
-        fetch_and_display_directors(cursor, DIRECTOR_QUERY)
+        fetch_and_display_directors(cursor, DIRECTOR_QUERY, renderer)
 
-    except mysql.connector.Error as err:
+    except (mysql.connector.Error, *EMBEDDED_ERRORS) as err:
         print(f"Error while fetching records: {err}")
 
     finally:
@@ -5,23 +5,45 @@ CSD310 Module 8.2 Assignment: Movies: Updates & Deletes
 '''
 
 import mysql.connector
-from dotenv import dotenv_values
 from colorama import Fore, Style, init
+from pathlib import Path
+import argparse
+import sys
+
+# Shared database access (reads .env once and pools connections)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.cache import get_default_cache
+from common.db import get_connection
+from common.pager import KeysetPager, parse_filters
+from common.render import STYLES, Renderer
+from common.writes import BatchWriter
 
 init()
 
-# Load database credentials from .env file
-secrets = dotenv_values(".env")
-
-# Database connection configuration
-db_config = {
-    "user": secrets["USER"],
-    "password": secrets["PASSWORD"],
-    "host": secrets["HOST"],
-    "database": secrets["DATABASE"],
+# Statements per transaction when applying catalog edits
+COMMIT_EVERY = 1000
+
+# Film listing results are cached; the writes below go through the cache so
+# only the tables they touch are fetched again
+query_cache = get_default_cache()
+
+# The film listing as a common/pager.py view, paged by film_id
+FILM_VIEW = {
+    "title": "Films",
+    "key": "f.film_id",
+    "select": "f.film_name AS Name, f.film_director AS Director, g.genre_name AS Genre, "
+              "s.studio_name AS 'Studio Name'",
+    "from": """film f
+               INNER JOIN genre g ON f.genre_id = g.genre_id
+               INNER JOIN studio s ON f.studio_id = s.studio_id""",
+    "filters": {"Name": "f.film_name", "Director": "f.film_director",
+                "Genre": "g.genre_name", "Studio": "s.studio_name"},
 }
 
-def show_films(cursor, title):
+# Labels of the four film columns, in the order show_films() lists them
+FILM_LABELS = ("Film Name", "Director", "Genre Name ID", "Studio Name")
+
+def show_films(cursor, title, page_size=None, filters=None, renderer=None):
     """
     Retrieve and display film data, including Name, Director, Genre, and Studio Name,
     by joining the film, genre, and studio tables.
@@ -29,8 +51,20 @@ def show_films(cursor, title):
     Args:
         cursor: Active MySQL cursor used to execute database queries.
         title: A string title displayed above the list of films.
+        page_size: Optional rows per page. Films are then read a page at a time
+            by film_id, so the whole table is never held in memory.
+        filters: Optional {column: value} filters for paged mode (Name, Director,
+            Genre, Studio); * in a value matches anything.
+        renderer: Output style (common/render.py); chosen from stdout when omitted.
     """
-    print(f"\n {Fore.CYAN}-- {title.upper()} --{Style.RESET_ALL}")
+    renderer = renderer or Renderer()
+    renderer.header(f" -- {title.upper()} --", blank_line=False)
+    if page_size:
+        pager = KeysetPager(cursor, FILM_VIEW, page_size, filters, cache=query_cache)
+        for number, films in pager.pages():
+            renderer.header(f"Page {number}")
+            renderer.rows(FILM_LABELS, films)
+        return
     query = """
     SELECT
         f.film_name AS Name,
@@ -41,67 +75,73 @@ def show_films(cursor, title):
     INNER JOIN genre g ON f.genre_id = g.genre_id
     INNER JOIN studio s ON f.studio_id = s.studio_id
     """
-    cursor.execute(query)
-    films = cursor.fetchall()
-    for film in films:
-        print(f"Film Name: {Fore.GREEN}{film[0]}{Style.RESET_ALL}")
-        print(f"Director: {Fore.YELLOW}{film[1]}{Style.RESET_ALL}")
-        print(f"Genre Name ID: {Fore.BLUE}{film[2]}{Style.RESET_ALL}")
-        print(f"Studio Name: {Fore.MAGENTA}{film[3]}{Style.RESET_ALL}\n")
+    renderer.rows(FILM_LABELS, query_cache.fetchall(cursor, query))
+
+parser = argparse.ArgumentParser(description="Apply the catalog edits and list the films.")
+parser.add_argument("--page-size", type=int, default=None,
+                    help="list films a page at a time, read by film_id")
+parser.add_argument("--where", nargs="*", default=[], metavar="COLUMN=VALUE",
+                    help="with --page-size, filter the listings (* matches anything)")
+parser.add_argument("--format", choices=STYLES, default=None,
+                    help="listing style (default: records on a terminal, plain otherwise)")
+args = parser.parse_args()
+renderer = Renderer(args.format)
+try:
+    film_filters = parse_filters(args.where)
+except ValueError as err:
+    parser.error(str(err))
 
 try:
-    # Establish connection to the MySQL database
-    db = mysql.connector.connect(**db_config)
+    # Get a connection to the MySQL database from the shared pool
+    db = get_connection()
     cursor = db.cursor()
 
     # Display initial list of films
-    show_films(cursor, "DISPLAYING FILMS")
-
-    # Insert a new studio record for Warner Bros. Pictures
-    insert_studio_query = "INSERT INTO studio (studio_name) VALUES ('Warner Bros. Pictures')"
-    cursor.execute(insert_studio_query)
-    db.commit()
-    warner_bros_studio_id = cursor.lastrowid  # Capture the newly inserted studio's ID
-    print(f"{Fore.GREEN}Inserted studio: Warner Bros. Pictures with ID {warner_bros_studio_id}{Style.RESET_ALL}")
-
-    # Insert a new film record for 'Inception' associated with Warner Bros. Pictures and SciFi genre (genre_id=2)
-    insert_query = f"""
-    INSERT INTO film (film_name, film_releaseDate, film_runtime, film_director, genre_id, studio_id)
-    VALUES ('Inception', '2010', 148, 'Christopher Nolan', 2, {warner_bros_studio_id})
-    """
-    cursor.execute(insert_query)
-    db.commit()
-    print(f"{Fore.GREEN}Inserted new film: Inception{Style.RESET_ALL}")
-
-    # Display updated list of films after insertion
-    show_films(cursor, "FILMS AFTER INSERTION")
-
-    # Update the genre of 'Alien' to Horror (assuming genre_id=1 corresponds to Horror)
-    update_query = """
-    UPDATE film
-    SET genre_id = 1
-    WHERE film_name = 'Alien'
-    """
-    cursor.execute(update_query)
-    db.commit()
-    print(f"{Fore.GREEN}Updated Alien to Horror genre.{Style.RESET_ALL}")
-
-    # Display updated list of films after genre change
-    show_films(cursor, "DISPLAYING FILMS AFTER UPDATE")
-
-    # Delete the film 'Gladiator' from the database
-    delete_query = """
-    DELETE FROM film
-    WHERE film_name = 'Gladiator'
-    """
-    cursor.execute(delete_query)
-    db.commit()
-    print(f"{Fore.GREEN}Deleted film: Gladiator{Style.RESET_ALL}")
+    show_films(cursor, "DISPLAYING FILMS", args.page_size, film_filters, renderer)
+
+    # All edits run through prepared statements in one transaction, committed
+    # when the block ends (or every COMMIT_EVERY statements for large batches)
+    with BatchWriter(db, commit_every=COMMIT_EVERY, cache=query_cache) as writer:
+        # Insert a new studio record for Warner Bros. Pictures
+        writer.execute("INSERT INTO studio (studio_name) VALUES (%s)", ("Warner Bros. Pictures",))
+        warner_bros_studio_id = writer.lastrowid  # Capture the newly inserted studio's ID
+        print(f"{Fore.GREEN}Inserted studio: Warner Bros. Pictures with ID {warner_bros_studio_id}{Style.RESET_ALL}")
+
+        # Insert a new film record for 'Inception' associated with Warner Bros. Pictures and SciFi genre (genre_id=2)
+        insert_query = """
+        INSERT INTO film (film_name, film_releaseDate, film_runtime, film_director, genre_id, studio_id)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        writer.execute(insert_query, ("Inception", "2010", 148, "Christopher Nolan", 2, warner_bros_studio_id))
+        print(f"{Fore.GREEN}Inserted new film: Inception{Style.RESET_ALL}")
+
+        # Display updated list of films after insertion
+        show_films(cursor, "FILMS AFTER INSERTION", args.page_size, film_filters, renderer)
+
+        # Update the genre of 'Alien' to Horror (assuming genre_id=1 corresponds to Horror)
+        update_query = """
+        UPDATE film
+        SET genre_id = %s
+        WHERE film_name = %s
+        """
+        updated = writer.execute(update_query, (1, "Alien"))
+        print(f"{Fore.GREEN}Updated Alien to Horror genre ({updated} row(s)).{Style.RESET_ALL}")
+
+        # Display updated list of films after genre change
+        show_films(cursor, "DISPLAYING FILMS AFTER UPDATE", args.page_size, film_filters, renderer)
+
+        # Delete the film 'Gladiator' from the database
+        delete_query = """
+        DELETE FROM film
+        WHERE film_name = %s
+        """
+        deleted = writer.execute(delete_query, ("Gladiator",))
+        print(f"{Fore.GREEN}Deleted film: Gladiator ({deleted} row(s)){Style.RESET_ALL}")
 
     # Display final list of films after deletion
-    show_films(cursor, "DISPLAYING FILMS AFTER DELETION")
+    show_films(cursor, "DISPLAYING FILMS AFTER DELETION", args.page_size, film_filters, renderer)
 
-except mysql.connector.Error as err:
+except (mysql.connector.Error, ValueError) as err:
     # Handle database connection or execution errors
     print(f"Error: {err}")
 
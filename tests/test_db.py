@@ -0,0 +1,133 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Shared Database Access - Pool Tests
+
+Checks the connection pool's release and reconnect paths with fake connections,
+so no database server is needed.
+
+Usage:
+    python -m unittest discover tests
+"""
+
+from pathlib import Path
+from unittest import mock
+import sys
+import unittest
+
+import mysql.connector
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common import db
+
+class FakeConnection:
+    """
+    Stands in for a mysql.connector connection. alive=False makes ping() fail;
+    can_reconnect=False makes reconnect() fail as well.
+    """
+
+    def __init__(self, alive=True, can_reconnect=True):
+        self.alive = alive
+        self.can_reconnect = can_reconnect
+        self.in_transaction = False
+        self.reconnects = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if not self.alive:
+            raise mysql.connector.Error("Lost connection")
+
+    def reconnect(self, attempts=1, delay=0):
+        if not self.can_reconnect:
+            raise mysql.connector.Error("Server unavailable")
+        self.alive = True
+        self.reconnects += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def cursor(self, *args, **kwargs):
+        return object()
+
+    def close(self):
+        self.closed = True
+
+class PoolTests(unittest.TestCase):
+
+    def setUp(self):
+        self.opened = []
+        patcher = mock.patch.object(db.mysql.connector, "connect", side_effect=self.connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = db.ConnectionPool({}, size=2)
+
+    def connect(self, **settings):
+        raw = FakeConnection()
+        self.opened.append(raw)
+        return raw
+
+    def idle_for_a_while(self, conn):
+        conn.last_used -= db.HEALTH_CHECK_AFTER + 1
+
+    def test_close_returns_connection_for_reuse(self):
+        conn = self.pool.get_connection()
+        conn.close()
+        self.assertIs(self.pool.get_connection(), conn)
+        self.assertEqual(self.pool.stats["opened"], 1)
+        self.assertEqual(self.pool.stats["reused"], 1)
+
+    def test_close_rolls_back_open_transaction(self):
+        conn = self.pool.get_connection()
+        conn.raw.in_transaction = True
+        conn.close()
+        self.assertEqual(conn.raw.rollbacks, 1)
+
+    def test_double_close_releases_once(self):
+        conn = self.pool.get_connection()
+        conn.close()
+        conn.close()
+        self.assertEqual(self.pool._in_use, 0)
+        self.assertEqual(self.pool._idle, [conn])
+
+    def test_reused_connection_can_be_closed_again(self):
+        conn = self.pool.get_connection()
+        conn.close()
+        self.pool.get_connection().close()
+        self.assertEqual(self.pool._in_use, 0)
+        self.assertEqual(self.pool._idle, [conn])
+
+    def test_healthy_ping_is_not_a_reconnect(self):
+        conn = self.pool.get_connection()
+        conn.prepared("SELECT 1")
+        conn.close()
+        self.idle_for_a_while(conn)
+        self.assertIs(self.pool.get_connection(), conn)
+        self.assertEqual(self.pool.stats["reconnected"], 0)
+        self.assertEqual(len(conn._prepared), 1)
+
+    def test_reconnect_clears_prepared_statements(self):
+        conn = self.pool.get_connection()
+        conn.prepared("SELECT 1")
+        conn.close()
+        self.idle_for_a_while(conn)
+        conn.raw.alive = False
+        self.assertIs(self.pool.get_connection(), conn)
+        self.assertEqual(conn.raw.reconnects, 1)
+        self.assertEqual(self.pool.stats["reconnected"], 1)
+        self.assertEqual(conn._prepared, {})
+
+    def test_dead_connection_is_replaced(self):
+        conn = self.pool.get_connection()
+        conn.close()
+        self.idle_for_a_while(conn)
+        conn.raw.alive = conn.raw.can_reconnect = False
+        replacement = self.pool.get_connection()
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.raw.closed)
+        self.assertEqual(self.pool.stats["opened"], 2)
+        self.assertEqual(self.pool.stats["reconnected"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Author: Jelani Jenkins & Clint Scott
+Date: 10/18/2026
+Assignment: Module 11.1 - Report Registry Tests
+
+Checks how --since and --until replace the date window of the windowed reports.
+
+Usage:
+    python -m unittest discover tests
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "module-11"))
+from report_registry import REPORTS, WINDOW_DAYS, with_window
+
+class WithWindowTests(unittest.TestCase):
+
+    def window(self, since=None, until=None):
+        report, = with_window([REPORTS["recent_wine_orders"]], since, until)
+        return report["params"]["start"], report["params"]["end"]
+
+    def test_since_and_until(self):
+        self.assertEqual(self.window(date(2025, 2, 1), date(2025, 4, 30)),
+                         (date(2025, 2, 1), date(2025, 5, 1)))
+
+    def test_until_only_ends_the_default_window_at_until(self):
+        start, end = self.window(until=date(2025, 4, 30))
+        self.assertEqual(end, date(2025, 5, 1))
+        self.assertEqual(start, date(2025, 4, 30) - timedelta(days=WINDOW_DAYS - 1))
+
+    def test_since_only_keeps_the_default_end(self):
+        default_end = REPORTS["recent_wine_orders"]["params"]["end"]
+        self.assertEqual(self.window(since=date(2025, 2, 1)), (date(2025, 2, 1), default_end))
+
+    def test_no_window_returns_reports_unchanged(self):
+        reports = [REPORTS["recent_wine_orders"]]
+        self.assertIs(with_window(reports), reports)
+
+    def test_unwindowed_reports_are_unchanged(self):
+        report = REPORTS["pending_wine_orders"]
+        self.assertIs(with_window([report], until=date(2025, 4, 30))[0], report)
+
+if __name__ == "__main__":
+    unittest.main()